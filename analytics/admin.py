@@ -0,0 +1,45 @@
+from django.contrib import admin
+from django.db.models import Sum
+from .models import ProjectDailyStat
+
+CHART_DAYS = 30
+
+
+@admin.register(ProjectDailyStat)
+class ProjectDailyStatAdmin(admin.ModelAdmin):
+    list_display = ['project', 'date', 'views', 'likes', 'dislikes', 'comments', 'get_top_referrer']
+    list_filter = ['date', 'project']
+    search_fields = ['project__title']
+    date_hierarchy = 'date'
+    readonly_fields = ['project', 'date', 'views', 'likes', 'dislikes', 'comments', 'referrers']
+    list_select_related = ['project']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def get_top_referrer(self, obj):
+        if not obj.referrers:
+            return '-'
+        return max(obj.referrers.items(), key=lambda item: item[1])[0]
+    get_top_referrer.short_description = 'Principal referente'
+    
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        try:
+            queryset = response.context_data['cl'].queryset
+        except (AttributeError, KeyError):
+            return response
+        
+        # Totales por día de la selección actual (respeta filtros y búsqueda)
+        rows = list(
+            queryset.order_by()
+            .values('date')
+            .annotate(total_views=Sum('views'), total_likes=Sum('likes'), total_dislikes=Sum('dislikes'))
+            .order_by('-date')[:CHART_DAYS]
+        )
+        rows.reverse()
+        peak = max([row['total_views'] for row in rows] + [1])
+        for row in rows:
+            row['height'] = round(row['total_views'] * 100 / peak)
+        response.context_data['chart_rows'] = rows
+        return response
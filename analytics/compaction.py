@@ -0,0 +1,124 @@
+"""
+Compactación del log de eventos en agregados diarios por proyecto.
+
+Cada lote se procesa en una sola transacción: se leen los eventos más
+antiguos de ``PendingEvent``, se borran, se suman a ``ProjectDailyStat`` y
+``Project.views`` y se confirma todo junto. Un fallo deshace el lote entero
+y dos compactaciones a la vez (la tarea periódica y un ``compact_analytics``
+manual) nunca cuentan el mismo evento: en PostgreSQL se reparten las filas
+con ``SKIP LOCKED`` y, en cualquier motor, un lote cuyas filas ya borró otra
+pasada se descarta.
+"""
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from portfolio_projects import trending
+from portfolio_projects.models import Project
+from .models import PendingEvent, ProjectDailyStat
+
+COMPACT_BATCH_SIZE = 5000
+
+
+class _AlreadyCompacted(Exception):
+    pass
+
+
+def _event_date(timestamp):
+    moment = datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+    return timezone.localdate(moment)
+
+
+def aggregate(events, now=None):
+    """
+    Agrupa los eventos por (proyecto, día) y acumula los puntos de tendencia
+    de cada proyecto decaídos al instante ``now``.
+    """
+    now = time.time() if now is None else now
+    totals = defaultdict(lambda: {'views': 0, 'likes': 0, 'dislikes': 0, 'comments': 0, 'referrers': Counter()})
+    points = Counter()
+    for event in events:
+        row = totals[(event['project'], _event_date(event['ts']))]
+        if event['type'] == 'view':
+            row['views'] += 1
+            row['referrers'][event.get('referrer', 'direct')] += 1
+        elif event['type'] == 'vote':
+            row['likes'] += event.get('likes', 0)
+            row['dislikes'] += event.get('dislikes', 0)
+        elif event['type'] == 'comment':
+            row['comments'] += 1
+        points[event['project']] += trending.decayed_points(event, now)
+    return totals, points
+
+
+@transaction.atomic
+def apply_totals(totals, points=None, now=None):
+    existing_projects = set(
+        Project.objects.filter(pk__in={project_id for project_id, _ in totals}).values_list('pk', flat=True)
+    )
+    views_per_project = Counter()
+
+    for (project_id, date), row in totals.items():
+        if project_id not in existing_projects:
+            continue
+        stat, _ = ProjectDailyStat.objects.select_for_update().get_or_create(project_id=project_id, date=date)
+        stat.views += row['views']
+        stat.likes += row['likes']
+        stat.dislikes += row['dislikes']
+        stat.comments += row['comments']
+        referrers = Counter(stat.referrers)
+        referrers.update(row['referrers'])
+        stat.referrers = dict(referrers)
+        stat.save()
+        views_per_project[project_id] += row['views']
+
+    # El contador histórico de vistas se actualiza aquí y no en la petición
+    for project_id, views in views_per_project.items():
+        if views:
+            Project.objects.filter(pk=project_id).update(views=F('views') + views)
+
+    if points:
+        moment = datetime.fromtimestamp(now, tz=dt_timezone.utc) if now else timezone.now()
+        trending.add_points(
+            {project_id: value for project_id, value in points.items() if project_id in existing_projects},
+            now=moment,
+        )
+
+    return len(totals)
+
+
+def compact_batch(now=None, batch_size=COMPACT_BATCH_SIZE):
+    """Compacta un lote de eventos pendientes. Devuelve (eventos, filas)."""
+    now = time.time() if now is None else now
+    try:
+        with transaction.atomic():
+            pending = PendingEvent.objects.order_by('pk')
+            if connection.features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            pending = list(pending[:batch_size])
+            if not pending:
+                return 0, 0
+            deleted, _ = PendingEvent.objects.filter(pk__in=[event.pk for event in pending]).delete()
+            if deleted != len(pending):
+                # Otra compactación ya aplicó parte de este lote
+                raise _AlreadyCompacted
+            totals, points = aggregate([event.as_event() for event in pending], now)
+            rows = apply_totals(totals, points, now)
+    except _AlreadyCompacted:
+        return 0, 0
+    return len(pending), rows
+
+
+def compact(now=None):
+    """Compacta todos los eventos pendientes. Devuelve (eventos, filas)."""
+    events = rows = 0
+    while True:
+        batch_events, batch_rows = compact_batch(now)
+        if not batch_events:
+            return events, rows
+        events += batch_events
+        rows += batch_rows
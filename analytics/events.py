@@ -0,0 +1,92 @@
+"""
+Log de eventos append-only con escritura por lotes.
+
+``record_event`` solo agrega el evento a un buffer en memoria; un hilo en
+segundo plano lo vuelca cada ``ANALYTICS_FLUSH_INTERVAL`` segundos (o al
+llegar a ``ANALYTICS_BATCH_SIZE`` eventos) con un único ``bulk_create`` en la
+tabla de staging ``PendingEvent``. Al estar en la base de datos, la
+compactación puede correr en el worker aunque viva en otro contenedor que
+los procesos web.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.events = []
+        self.pid = None
+        self.thread = None
+
+    def _ensure_worker(self):
+        # Tras un fork (gunicorn) el hilo y el buffer del padre no sirven
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.events = []
+            self.thread = threading.Thread(target=self._run, name='analytics-flusher', daemon=True)
+            self.thread.start()
+
+    def append(self, event):
+        with self.lock:
+            self._ensure_worker()
+            self.events.append(event)
+            if len(self.events) >= getattr(settings, 'ANALYTICS_BATCH_SIZE', 100):
+                self.wakeup.set()
+
+    def _run(self):
+        interval = getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 5)
+        while True:
+            self.wakeup.wait(interval)
+            self.wakeup.clear()
+            # El hilo tiene su propia conexión: se renueva si caducó o falló
+            close_old_connections()
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            events, self.events = self.events, []
+        if not events:
+            return 0
+
+        from .models import PendingEvent
+        rows = [
+            PendingEvent(
+                type=event['type'], project_id=event['project'], ts=event['ts'],
+                data={key: value for key, value in event.items() if key not in ('type', 'project', 'ts')},
+            )
+            for event in events
+        ]
+        try:
+            PendingEvent.objects.bulk_create(rows)
+        except DatabaseError:
+            # La analítica nunca debe tumbar el proceso; el lote se pierde
+            logger.exception('No se pudieron guardar %d evento(s) de analítica', len(rows))
+            return 0
+        return len(rows)
+
+
+buffer = EventBuffer()
+atexit.register(buffer.flush)
+
+
+def referrer_host(request):
+    referrer = request.META.get('HTTP_REFERER', '')
+    return urlsplit(referrer).hostname or 'direct'
+
+
+def record_event(event_type, project_id, **data):
+    """Registra un evento sin hacer I/O en la petición."""
+    if not getattr(settings, 'ANALYTICS_ENABLED', True):
+        return
+    buffer.append({'type': event_type, 'project': project_id, 'ts': time.time(), **data})
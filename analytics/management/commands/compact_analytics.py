@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from analytics.compaction import compact
+
+
+class Command(BaseCommand):
+    help = 'Compacta el log de eventos de analítica en agregados diarios por proyecto'
+
+    def handle(self, *args, **options):
+        events, rows = compact()
+        self.stdout.write(self.style.SUCCESS(f'{events} evento(s) procesados, {rows} fila(s) diarias actualizadas.'))
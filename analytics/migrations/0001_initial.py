@@ -0,0 +1,34 @@
+# Generated by Django 4.2.23 on 2026-10-19 11:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('portfolio_projects', '0004_technology_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('likes', models.IntegerField(default=0)),
+                ('dislikes', models.IntegerField(default=0)),
+                ('referrers', models.JSONField(blank=True, default=dict)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='portfolio_projects.project')),
+            ],
+            options={
+                'verbose_name': 'Estadística diaria',
+                'verbose_name_plural': 'Estadísticas diarias',
+                'ordering': ['-date'],
+                'unique_together': {('project', 'date')},
+            },
+        ),
+    ]
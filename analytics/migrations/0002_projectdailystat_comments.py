@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectdailystat',
+            name='comments',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+
+def set_unlogged(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('ALTER TABLE analytics_pendingevent SET UNLOGGED')
+
+
+def set_logged(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('ALTER TABLE analytics_pendingevent SET LOGGED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_projectdailystat_comments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(max_length=20)),
+                ('project_id', models.BigIntegerField()),
+                ('ts', models.FloatField()),
+                ('data', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'verbose_name': 'Evento pendiente',
+                'verbose_name_plural': 'Eventos pendientes',
+            },
+        ),
+        migrations.RunPython(set_unlogged, set_logged),
+    ]
@@ -0,0 +1,44 @@
+from django.db import models
+from portfolio_projects.models import Project
+
+
+class ProjectDailyStat(models.Model):
+    """Agregado diario por proyecto generado por la compactación del log de eventos"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    likes = models.IntegerField(default=0)
+    dislikes = models.IntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    referrers = models.JSONField(default=dict, blank=True)
+    
+    class Meta:
+        ordering = ['-date']
+        unique_together = ['project', 'date']
+        verbose_name = 'Estadística diaria'
+        verbose_name_plural = 'Estadísticas diarias'
+    
+    def __str__(self):
+        return f'{self.project.title} - {self.date}'
+
+
+class PendingEvent(models.Model):
+    """
+    Evento aún sin compactar. Tabla de staging append-only: los procesos web
+    la llenan por lotes desde un hilo y la compactación la vacía. En
+    PostgreSQL es UNLOGGED (sin WAL); tras una caída se pierden los eventos
+    pendientes, no los agregados.
+    """
+    type = models.CharField(max_length=20)
+    # Sin clave foránea: insertar no comprueba ni bloquea la fila del proyecto
+    project_id = models.BigIntegerField()
+    ts = models.FloatField()
+    data = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        verbose_name = 'Evento pendiente'
+        verbose_name_plural = 'Eventos pendientes'
+
+    def as_event(self):
+        return {'type': self.type, 'project': self.project_id, 'ts': self.ts, **self.data}
+
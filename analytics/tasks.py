@@ -0,0 +1,8 @@
+from task_queue.queue import task
+
+from .compaction import compact
+
+
+@task(name='analytics.compact')
+def compact_analytics():
+    compact()
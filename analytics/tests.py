@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from portfolio_projects.models import Project
+from . import compaction
+from .events import EventBuffer
+from .models import PendingEvent, ProjectDailyStat
+
+
+@override_settings(ANALYTICS_ENABLED=True)
+class CompactionTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(title='Ventas', slug='ventas', description='d', content='c')
+        # Sin append(): no arranca el hilo de volcado y flush() se llama aquí
+        self.buffer = EventBuffer()
+
+    def record(self, event_type, project_id, ts, **data):
+        self.buffer.events.append({'type': event_type, 'project': project_id, 'ts': ts, **data})
+
+    def test_flush_writes_one_row_per_event(self):
+        self.record('view', self.project.pk, 1_700_000_000, referrer='google.com')
+        self.record('vote', self.project.pk, 1_700_000_001, likes=1, dislikes=0)
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(PendingEvent.objects.count(), 2)
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_compact_applies_totals_and_empties_the_staging_table(self):
+        for _ in range(3):
+            self.record('view', self.project.pk, 1_700_000_000, referrer='google.com')
+        self.record('view', 999_999, 1_700_000_000)
+        self.buffer.flush()
+
+        self.assertEqual(compaction.compact(now=1_700_000_100), (4, 2))
+        self.assertFalse(PendingEvent.objects.exists())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 3)
+        stat = ProjectDailyStat.objects.get(project=self.project)
+        self.assertEqual((stat.views, stat.referrers), (3, {'google.com': 3}))
+
+        # Una segunda pasada no vuelve a contar nada
+        self.assertEqual(compaction.compact(now=1_700_000_100), (0, 0))
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 3)
+
+    def test_failed_batch_keeps_its_events(self):
+        self.record('view', self.project.pk, 1_700_000_000)
+        self.buffer.flush()
+        with mock.patch.object(compaction.trending, 'add_points', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                compaction.compact(now=1_700_000_100)
+        self.assertEqual(PendingEvent.objects.count(), 1)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 0)
+        self.assertEqual(compaction.compact(now=1_700_000_100), (1, 1))
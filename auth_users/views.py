@@ -11,7 +11,8 @@ def register(request):
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
             user = form.save()
-            # Crear perfil automáticamente
+            # Crear perfil automáticamente: un solo INSERT, y las vistas
+            # acceden a user.profile desde la primera petición
             Profile.objects.create(user=user)
             login(request, user)
             messages.success(request, 'Cuenta creada exitosamente.')
@@ -0,0 +1,54 @@
+"""Utilidades compartidas por los comandos de benchmark."""
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Crea una base de datos de prueba desechable para no tocar los datos reales.
+
+    Igual que el runner de tests: en SQLite queda en memoria y en PostgreSQL
+    se crea ``test_<nombre>``, que se destruye al terminar. Las cachés se
+    reemplazan por memoria local para no vaciar la caché compartida real.
+    """
+    isolated_caches = {
+        alias: {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'benchmark-{alias}',
+        }
+        for alias in settings.CACHES
+    }
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with override_settings(CACHES=isolated_caches):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def measure(func, repeat):
+    """Ejecuta ``func`` ``repeat`` veces; devuelve (ms por iteración, consultas por iteración)."""
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000 / repeat, len(queries) / repeat
@@ -0,0 +1,182 @@
+"""
+Caché en dos niveles con protección contra estampidas.
+
+``TieredCache`` combina un L1 en memoria del proceso con TTL corto y un L2
+compartido entre workers (Redis o caché en archivos). Las lecturas buscan
+primero en L1; las escrituras van a L2 y se copian en L1.
+
+``get_or_compute`` añade sobre cualquier backend:
+
+* expiración temprana probabilística (XFetch): cuanto más cerca está un
+  valor de expirar y más caro fue calcularlo, más probable es que una
+  petición lo recalcule antes de tiempo, de modo que normalmente un solo
+  worker lo refresca mientras el resto sigue sirviendo el valor vigente;
+* single-flight: si el valor no existe, solo el worker que consigue el
+  candado lo calcula y los demás esperan a que aparezca en caché.
+
+Los valores siempre se calculan leyendo del primario: un valor calculado en
+una réplica atrasada quedaría en caché después de que la señal de la
+escritura ya la invalidó.
+
+``add`` e ``incr`` solo son atómicos entre procesos con Redis o memcached
+(:func:`has_atomic_ops`). Con la caché en archivos ``add`` comprueba y luego
+escribe, así que el single-flight pasa a ser de mejor esfuerzo: en el peor
+caso dos workers calculan el mismo valor. El código que necesita exclusión
+real (votos agrupados, candados) debe consultar :func:`has_atomic_ops`.
+"""
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from .routers import replica_reads
+
+MISSING = object()
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+# Backends cuyos add/incr son atómicos entre procesos y conservan el TTL
+ATOMIC_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+)
+
+
+def shared_cache():
+    """Nivel compartido sin L1, para datos que deben ser coherentes entre workers."""
+    return caches['shared']
+
+
+def has_atomic_ops(alias='shared'):
+    """Si ``add``/``incr`` del alias son atómicos entre procesos."""
+    return settings.CACHES[alias]['BACKEND'] in ATOMIC_BACKENDS
+
+
+def _should_recompute(envelope, beta):
+    _, delta, expiry = envelope
+    # random() puede devolver 0.0; log(0) no está definido
+    return time.time() - delta * beta * math.log(random.random() or 1e-12) >= expiry
+
+
+def get_or_compute(cache, key, compute, timeout=300, beta=1.0, lock_timeout=LOCK_TIMEOUT):
+    """Devuelve el valor cacheado de ``key`` o lo calcula con ``compute()``."""
+    envelope = cache.get(key)
+    if envelope is not None and not _should_recompute(envelope, beta):
+        return envelope[0]
+
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, True, lock_timeout):
+        if envelope is not None:
+            # Otro worker ya está refrescando: se sirve el valor vigente
+            return envelope[0]
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            envelope = cache.get(key)
+            if envelope is not None:
+                return envelope[0]
+        # El worker con el candado no terminó a tiempo: se calcula aquí
+
+    try:
+        started = time.time()
+        with replica_reads(False):
+            value = compute()
+        delta = time.time() - started
+        cache.set(key, (value, delta, time.time() + timeout), timeout)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+class TieredCache(BaseCache):
+    """
+    Backend que encadena dos alias de ``CACHES``.
+
+    OPTIONS:
+        L1: alias del nivel local (por defecto ``"local"``)
+        L2: alias del nivel compartido (por defecto ``"shared"``)
+        L1_TIMEOUT: segundos máximos que un valor vive en L1
+
+    ``delete`` e ``incr`` solo vacían el L1 de este proceso: los demás
+    workers pueden servir el valor anterior hasta ``L1_TIMEOUT`` segundos.
+    Lo que no tolere ese retraso debe leerse directamente de
+    ``shared_cache()``.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.l1_alias = options.get('L1', 'local')
+        self.l2_alias = options.get('L2', 'shared')
+        self.l1_timeout = options.get('L1_TIMEOUT', 5)
+
+    @property
+    def l1(self):
+        return caches[self.l1_alias]
+
+    @property
+    def l2(self):
+        return caches[self.l2_alias]
+
+    def _l1_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.l1_timeout
+        return min(timeout, self.l1_timeout)
+
+    def get(self, key, default=None, version=None):
+        value = self.l1.get(key, MISSING, version=version)
+        if value is not MISSING:
+            return value
+        value = self.l2.get(key, MISSING, version=version)
+        if value is MISSING:
+            return default
+        self.l1.set(key, value, self.l1_timeout, version=version)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        self.l1.set(key, value, self._l1_timeout(timeout), version=version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self.l1.set(key, value, self._l1_timeout(timeout), version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return self.l1.has_key(key, version=version) or self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.l1.delete(key, version=version)
+        if has_atomic_ops(self.l2_alias):
+            return self.l2.incr(key, delta, version=version)
+        # BaseCache.incr reescribe la clave con el TTL por defecto (300 s):
+        # sin Redis se conserva sin expiración, como los contadores que la usan
+        value = self.l2.get(key, version=version)
+        if value is None:
+            raise ValueError(f"Key '{key}' not found")
+        value += delta
+        self.l2.set(key, value, None, version=version)
+        return value
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l1.close(**kwargs)
+        self.l2.close(**kwargs)
+
+    def get_or_compute(self, key, compute, timeout=300, beta=1.0, lock_timeout=LOCK_TIMEOUT):
+        return get_or_compute(self, key, compute, timeout, beta, lock_timeout)
@@ -0,0 +1,39 @@
+from django.db import models
+from django.db.models.fields.files import ImageFieldFile
+
+
+class StoredDimensionsFieldFile(ImageFieldFile):
+    """Devuelve el ancho/alto guardados en el modelo sin abrir el archivo."""
+
+    @property
+    def width(self):
+        stored = getattr(self.instance, self.field.width_field, None) if self.field.width_field else None
+        return stored if stored else super().width
+
+    @property
+    def height(self):
+        stored = getattr(self.instance, self.field.height_field, None) if self.field.height_field else None
+        return stored if stored else super().height
+
+
+class StoredDimensionsImageField(models.ImageField):
+    """
+    ImageField cuyas dimensiones solo se calculan al asignar un archivo nuevo.
+
+    El ImageField de Django abre la imagen al instanciar un modelo cuyas
+    columnas de ancho/alto están vacías; con S3 eso es una petición de red por
+    fila. Aquí las filas antiguas quedan sin dimensiones hasta ejecutar
+    ``manage.py backfill_image_dimensions``.
+    """
+    attr_class = StoredDimensionsFieldFile
+
+    def update_dimension_fields(self, instance, force=False, *args, **kwargs):
+        if not force:
+            return
+        # Se asignó un archivo nuevo: las dimensiones guardadas son las del
+        # anterior y width/height del FieldFile las devolverían tal cual
+        if self.width_field:
+            setattr(instance, self.width_field, None)
+        if self.height_field:
+            setattr(instance, self.height_field, None)
+        super().update_dimension_fields(instance, force=force, *args, **kwargs)
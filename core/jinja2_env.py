@@ -0,0 +1,79 @@
+"""
+Entorno Jinja2 para las plantillas públicas de ``jinja2/``.
+
+Se activa con ``USE_JINJA2_TEMPLATES`` (ver settings). Las plantillas son
+traducciones directas de las de ``templates/`` y deben producir el mismo
+HTML; ``manage.py bench_templates`` compara la salida y el tiempo de
+renderizado de ambos motores. Para conseguirlo:
+
+* los filtros ``date``, ``default``, ``linebreaks``, ``truncatewords``...
+  son los de Django (misma semántica que ``|filtro:arg``, escritos
+  ``|filtro(arg)``), con la conversión a hora local y el autoescape que
+  aplica Django;
+* ``static()`` y ``url()`` sustituyen a ``{% static %}`` y ``{% url %}``, y
+  ``{{ csrf_input }}`` a ``{% csrf_token %}`` (lo añade el backend);
+* las variables indefinidas se renderizan vacías aunque se encadenen
+  atributos; fechas y números se localizan al imprimirse y el escapado es
+  el de Django (``&quot;``/``&#x27;`` en vez de ``&#34;``/``&#39;``).
+"""
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.template.defaultfilters import register as django_filters
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.formats import localize
+from django.utils.timezone import template_localtime
+from jinja2 import ChainableUndefined, Environment
+from markupsafe import Markup, escape
+
+DJANGO_FILTERS = (
+    'date', 'default', 'floatformat', 'linebreaks', 'linebreaksbr', 'pluralize',
+    'time', 'timesince', 'truncatechars', 'truncatewords', 'urlencode', 'yesno',
+)
+LOCALIZED_TYPES = (datetime.date, datetime.time, Decimal, float, int)
+
+
+def url(name, *args, **kwargs):
+    return reverse(name, args=args or None, kwargs=kwargs or None)
+
+
+def django_filter(func):
+    """Adapta un filtro de Django a la convención de llamada de Jinja2."""
+    expects_localtime = getattr(func, 'expects_localtime', False)
+    needs_autoescape = getattr(func, 'needs_autoescape', False)
+
+    def wrapper(value, *args):
+        if expects_localtime:
+            value = template_localtime(value)
+        if needs_autoescape:
+            return func(value, *args, autoescape=True)
+        return func(value, *args)
+
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+def finalize(value):
+    # Lo que devuelve ya está marcado como seguro: Jinja2 no lo vuelve a escapar
+    if type(value) is int and not settings.USE_THOUSAND_SEPARATOR:
+        # Sin separador de miles localize() deja los enteros como str(value)
+        return Markup(value)
+    if isinstance(value, LOCALIZED_TYPES) and not isinstance(value, bool):
+        value = localize(template_localtime(value))
+    # markupsafe (en C) y luego las entidades de comillas que usa Django
+    escaped = escape(value)
+    if '&#3' in escaped:
+        escaped = Markup(str(escaped).replace('&#34;', '&quot;').replace('&#39;', '&#x27;'))
+    return escaped
+
+
+def environment(**options):
+    options['undefined'] = ChainableUndefined
+    options.setdefault('keep_trailing_newline', True)
+    options.setdefault('finalize', finalize)
+    env = Environment(**options)
+    env.globals.update({'static': static, 'url': url})
+    env.filters.update({name: django_filter(django_filters.filters[name]) for name in DJANGO_FILTERS})
+    return env
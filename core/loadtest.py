@@ -0,0 +1,319 @@
+"""
+Generador de carga HTTP basado en escenarios, escrito solo con asyncio.
+
+Cada usuario virtual mantiene una conexión keep-alive propia, sus cookies
+(sesión y ``csrftoken``) y un diccionario de variables. Un escenario es un
+archivo JSON con una lista de pasos que el usuario repite hasta que termina
+la prueba::
+
+    {
+        "name": "navegar y votar",
+        "login": true,
+        "think_time": [0.5, 2.0],
+        "steps": [
+            {"name": "home", "path": "/",
+             "extract": {"project_slug": "href=\\"/projects/([\\\\w-]+)/\\""}},
+            {"name": "detail", "path": "/projects/{project_slug}/",
+             "extract": {"project_id": "/projects/(\\\\d+)/comment/"}},
+            {"name": "vote", "method": "POST", "path": "/projects/{project_id}/vote/",
+             "data": {"vote_type": "like"}, "ajax": true}
+        ]
+    }
+
+Los ``{nombre}`` de ``path`` y ``data`` se sustituyen con variables extraídas
+de respuestas anteriores; si una expresión tiene varias coincidencias se
+elige una al azar. Los POST envían el token CSRF como campo y cabecera.
+"""
+import asyncio
+import json
+import random
+import re
+import ssl
+import time
+from collections import Counter, defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+PERCENTILES = (50, 90, 95, 99)
+MAX_BODY = 5 * 1024 * 1024
+
+
+class StepFailed(Exception):
+    pass
+
+
+def load_scenario(path):
+    with open(path, encoding='utf-8') as handle:
+        scenario = json.load(handle)
+    if not scenario.get('steps'):
+        raise ValueError(f'El escenario {path} no tiene pasos')
+    return scenario
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class HttpConnection:
+    """Conexión HTTP/1.1 keep-alive mínima que se reabre si el servidor la cierra."""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'http'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.scheme == 'https' else 80)
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def _connect(self):
+        context = ssl.create_default_context() if self.scheme == 'https' else None
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=context), self.timeout
+        )
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+            self.reader = self.writer = None
+
+    async def request(self, method, path, headers, body=b''):
+        for attempt in (1, 2):
+            if self.writer is None:
+                await self._connect()
+            try:
+                return await asyncio.wait_for(self._exchange(method, path, headers, body), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # El servidor cerró una conexión reutilizada: un reintento con una nueva
+                await self.close()
+                if attempt == 2:
+                    raise
+
+    async def _exchange(self, method, path, headers, body):
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host_header}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        lines.append(f'Content-Length: {len(body)}')
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readuntil(b'\r\n')
+        if not status_line.strip():
+            raise ConnectionError('Respuesta vacía')
+        status = int(status_line.split()[1])
+
+        response_headers = []
+        while True:
+            line = await self.reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers.append((name.strip().lower(), value.strip()))
+        header_map = dict(response_headers)
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            content = b''
+        elif header_map.get('transfer-encoding', '').lower() == 'chunked':
+            content = await self._read_chunked()
+        elif 'content-length' in header_map:
+            content = await self.reader.readexactly(int(header_map['content-length']))
+        else:
+            content = await self.reader.read(MAX_BODY)
+            await self.close()
+
+        if header_map.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, content
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            if size == 0:
+                # Trailers opcionales hasta la línea vacía
+                while await self.reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+        self.started = self.finished = None
+
+    def record(self, step, elapsed, status):
+        self.latencies[step].append(elapsed)
+        self.statuses[step][status] += 1
+
+    def summary(self):
+        duration = max((self.finished or time.monotonic()) - (self.started or 0), 1e-9)
+        rows = []
+        all_latencies = []
+        for step, values in self.latencies.items():
+            values = sorted(values)
+            all_latencies.extend(values)
+            failed = sum(count for status, count in self.statuses[step].items() if status >= 400)
+            rows.append({
+                'step': step,
+                'requests': len(values),
+                'failed': failed,
+                'rps': len(values) / duration,
+                'statuses': dict(self.statuses[step]),
+                **{f'p{pct}': percentile(values, pct) * 1000 for pct in PERCENTILES},
+                'max': values[-1] * 1000,
+            })
+        all_latencies.sort()
+        total = {
+            'step': 'TOTAL',
+            'requests': len(all_latencies),
+            'failed': sum(row['failed'] for row in rows),
+            'rps': len(all_latencies) / duration,
+            **{f'p{pct}': percentile(all_latencies, pct) * 1000 for pct in PERCENTILES},
+            'max': all_latencies[-1] * 1000 if all_latencies else 0.0,
+        }
+        return {'duration': duration, 'steps': rows, 'total': total, 'errors': dict(self.errors)}
+
+
+class VirtualUser:
+    def __init__(self, number, base_url, scenario, stats, credentials=None, timeout=30):
+        self.number = number
+        self.base_url = base_url.rstrip('/')
+        self.scenario = scenario
+        self.stats = stats
+        self.credentials = credentials
+        self.connection = HttpConnection(base_url, timeout)
+        self.cookies = {}
+        self.variables = dict(scenario.get('variables', {}))
+
+    def _headers(self, extra=None):
+        headers = {
+            'User-Agent': 'portfolio-loadtest',
+            'Accept': 'text/html,application/json;q=0.9,*/*;q=0.8',
+            'Connection': 'keep-alive',
+        }
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        headers.update(extra or {})
+        return headers
+
+    def _store_cookies(self, response_headers):
+        for name, value in response_headers:
+            if name != 'set-cookie':
+                continue
+            cookie = SimpleCookie()
+            cookie.load(value)
+            for key, morsel in cookie.items():
+                if morsel['max-age'] == '0' or not morsel.value:
+                    self.cookies.pop(key, None)
+                else:
+                    self.cookies[key] = morsel.value
+
+    def _format(self, value):
+        try:
+            return value.format(**self.variables)
+        except KeyError as exc:
+            raise StepFailed(f'variable sin valor: {exc.args[0]}')
+
+    async def send(self, name, method, path, data=None, ajax=False):
+        extra = {}
+        body = b''
+        if method != 'GET':
+            token = self.cookies.get('csrftoken', '')
+            fields = dict(data or {})
+            fields['csrfmiddlewaretoken'] = token
+            body = urlencode(fields).encode('utf-8')
+            extra.update({
+                'Content-Type': 'application/x-www-form-urlencoded',
+                'X-CSRFToken': token,
+                # En HTTPS Django exige un Referer del mismo origen
+                'Referer': self.base_url + '/',
+            })
+        if ajax:
+            extra['X-Requested-With'] = 'XMLHttpRequest'
+
+        started = time.monotonic()
+        try:
+            status, headers, content = await self.connection.request(method, path, self._headers(extra), body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+            self.stats.errors[f'{name}: {exc.__class__.__name__}'] += 1
+            await self.connection.close()
+            raise StepFailed(str(exc))
+        self.stats.record(name, time.monotonic() - started, status)
+        self._store_cookies(headers)
+        return status, content
+
+    async def login(self):
+        username, password = self.credentials
+        login_path = self.scenario.get('login_path', '/auth/login/')
+        await self.send('login (GET)', 'GET', login_path)
+        status, _ = await self.send('login (POST)', 'POST', login_path, {'username': username, 'password': password})
+        if status != 302 or 'sessionid' not in self.cookies:
+            raise StepFailed(f'no se pudo iniciar sesión como {username}')
+
+    async def run_step(self, step):
+        method = step.get('method', 'GET').upper()
+        path = self._format(step['path'])
+        data = {key: self._format(str(value)) for key, value in step.get('data', {}).items()}
+        status, content = await self.send(step.get('name', path), method, path, data, step.get('ajax', False))
+
+        text = content.decode('utf-8', errors='replace')
+        for variable, pattern in step.get('extract', {}).items():
+            matches = re.findall(pattern, text)
+            if matches:
+                self.variables[variable] = random.choice(matches)
+        return status
+
+    async def run(self, deadline):
+        think_min, think_max = self.scenario.get('think_time', [0, 0])
+        try:
+            if self.scenario.get('login'):
+                if self.credentials is None:
+                    raise StepFailed('el escenario requiere credenciales (--user)')
+                await self.login()
+            while time.monotonic() < deadline:
+                for step in self.scenario['steps']:
+                    if time.monotonic() >= deadline:
+                        break
+                    try:
+                        await self.run_step(step)
+                    except StepFailed as exc:
+                        self.stats.errors[str(exc)] += 1
+                        break
+                    if think_max:
+                        await asyncio.sleep(random.uniform(think_min, think_max))
+        except StepFailed as exc:
+            self.stats.errors[str(exc)] += 1
+        finally:
+            await self.connection.close()
+
+
+async def run_load(base_url, scenario, users, duration, ramp_up=0, credentials=(), timeout=30):
+    """
+    Lanza ``users`` usuarios virtuales repartidos linealmente durante
+    ``ramp_up`` segundos y los mantiene activos hasta completar ``duration``.
+    """
+    stats = Stats()
+    stats.started = time.monotonic()
+    deadline = stats.started + duration
+    tasks = []
+    for number in range(users):
+        if ramp_up and users > 1:
+            delay = stats.started + ramp_up * number / (users - 1) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        user_credentials = credentials[number % len(credentials)] if credentials else None
+        user = VirtualUser(number, base_url, scenario, stats, user_credentials, timeout)
+        tasks.append(asyncio.create_task(user.run(deadline)))
+    await asyncio.gather(*tasks)
+    stats.finished = time.monotonic()
+    return stats.summary()
@@ -0,0 +1,275 @@
+import json
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+DUMMY_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    for alias in ('default', 'shared', 'local')
+}
+
+CLAUSE_END = r'(?= GROUP BY | ORDER BY | LIMIT | HAVING |$)'
+COLUMN = r'"(?P<table>\w+)"\."(?P<column>\w+)"'
+EQUALITY_RE = re.compile(COLUMN + r'(?:\s*=|\s+IN\s*\(|\s+IS\s|(?=\s+AND|\s+OR|\)|\s+ORDER|\s+LIMIT|$))')
+# LIKE '%texto%' no puede usar un índice B-tree, así que no cuenta como rango
+RANGE_RE = re.compile(COLUMN + r'\s*(?:<|>|<=|>=|BETWEEN\b)')
+JOIN_ON_RE = re.compile(r' ON \((.*?)\)')
+ORDER_RE = re.compile(COLUMN + r'(?:\s+(?P<direction>ASC|DESC))?')
+SQLITE_SEARCH_RE = re.compile(r'SEARCH (?P<table>\w+) USING (?:COVERING )?INDEX \w+ \((?P<columns>[^)]*)\)')
+
+
+def public_urls():
+    """URLs públicas a reproducir, construidas con datos reales cuando existen."""
+    from portfolio_projects.models import Project, Category, Technology
+
+    urls = [reverse('home'), reverse('about'), reverse('project_list')]
+    category = Category.objects.values_list('slug', flat=True).first()
+    technology = Technology.objects.values_list('slug', flat=True).first()
+    project = Project.objects.values_list('slug', flat=True).first()
+    if category:
+        urls.append(f"{reverse('project_list')}?category={category}")
+        urls.append(reverse('category_projects', kwargs={'slug': category}))
+    if technology:
+        urls.append(f"{reverse('project_list')}?technology={technology}")
+    urls.append(f"{reverse('project_list')}?search=data")
+    if project:
+        urls.append(reverse('project_detail', kwargs={'slug': project}))
+    return urls
+
+
+@contextmanager
+def capture_sql(statements):
+    def wrapper(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            statements.append((sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield
+
+
+def split_clauses(sql):
+    where = re.search(r' WHERE (.*?)' + CLAUSE_END, sql)
+    order = re.search(r' ORDER BY (.*?)(?= LIMIT |$)', sql)
+    return (where.group(1) if where else ''), (order.group(1) if order else '')
+
+
+def table_columns(sql, table, pk_column='id'):
+    """Columnas de ``table`` usadas en igualdades, rangos y ORDER BY."""
+    where, order = split_clauses(sql)
+    equality = [m['column'] for m in EQUALITY_RE.finditer(where) if m['table'] == table]
+    if not equality and where:
+        # Filtro sobre otra tabla (p. ej. user__is_superuser): la columna de
+        # unión es la que recorre el planificador en ``table``
+        joins = ' AND '.join(JOIN_ON_RE.findall(sql))
+        equality = [
+            m['column'] for m in EQUALITY_RE.finditer(joins)
+            if m['table'] == table and m['column'] != pk_column
+        ]
+    ranges = [m['column'] for m in RANGE_RE.finditer(where) if m['table'] == table]
+    ordering = [
+        ('-' if m['direction'] == 'DESC' else '') + m['column']
+        for m in ORDER_RE.finditer(order) if m['table'] == table
+    ]
+    return list(dict.fromkeys(equality)), list(dict.fromkeys(ranges)), ordering
+
+
+def where_columns(sql, table):
+    where, _ = split_clauses(sql)
+    return {m['column'] for m in EQUALITY_RE.finditer(where) if m['table'] == table}
+
+
+def explain_sqlite(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        rows = [row[-1] for row in cursor.fetchall()]
+
+    main_table = re.search(r' FROM "(\w+)"', sql)
+    findings = []
+    for detail in rows:
+        if detail.startswith('SCAN ') and ' INDEX ' not in detail:
+            findings.append(('seq_scan', detail.split()[1]))
+        elif 'TEMP B-TREE FOR ORDER BY' in detail and main_table:
+            findings.append(('sort', main_table.group(1)))
+        else:
+            search = SQLITE_SEARCH_RE.search(detail)
+            if search:
+                used = {part.split('=')[0].split('>')[0].split('<')[0].strip() for part in search['columns'].split(' AND ')}
+                equality = where_columns(sql, search['table'])
+                if set(equality) - used:
+                    findings.append(('partial_index', search['table']))
+    return rows, findings
+
+
+def _walk_plan(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _walk_plan(child)
+
+
+def explain_postgresql(sql, params):
+    with connection.cursor() as cursor:
+        # Con tablas pequeñas el planificador siempre prefiere Seq Scan; al
+        # desactivarlo, un Seq Scan restante indica que no hay índice utilizable.
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('SET LOCAL enable_sort = off')
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    findings = []
+    rows = []
+    for node in _walk_plan(plan[0]['Plan']):
+        rows.append(f"{node['Node Type']} {node.get('Relation Name', '')}".strip())
+        relation = node.get('Relation Name')
+        if node['Node Type'] == 'Seq Scan' and relation:
+            findings.append(('seq_scan', relation))
+        elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+            for key in node.get('Sort Key', []):
+                table = key.split('.')[0].strip('"')
+                findings.append(('sort', table))
+                break
+        elif relation and node.get('Filter') and 'Index' in node['Node Type']:
+            findings.append(('partial_index', relation))
+    return rows, findings
+
+
+def model_for_table():
+    return {model._meta.db_table: model for model in apps.get_models()}
+
+
+def existing_indexes(model):
+    """Listas de columnas de los índices del modelo y cuáles de ellos son únicos."""
+    indexes, unique = [], []
+    for field in model._meta.fields:
+        if field.db_index or field.unique or field.primary_key:
+            indexes.append([field.column])
+            if field.unique or field.primary_key:
+                unique.append({field.column})
+    for index in model._meta.indexes:
+        indexes.append([model._meta.get_field(name.lstrip('-')).column for name in index.fields])
+    for group in model._meta.unique_together:
+        columns = [model._meta.get_field(name).column for name in group]
+        indexes.append(columns)
+        unique.append(set(columns))
+    return indexes, unique
+
+
+def suggest(model, equality, ranges, ordering):
+    if not (equality or ranges or ordering):
+        return None
+    indexes, unique = existing_indexes(model)
+    # Una igualdad sobre una clave única devuelve como mucho una fila
+    if any(columns <= set(equality) for columns in unique):
+        return None
+    columns = equality + (ranges[:1] if ranges else [c.lstrip('-') for c in ordering])
+    plain = [c.lstrip('-') for c in columns]
+    for index in indexes:
+        if index[:len(plain)] == plain:
+            return None
+
+    by_column = {field.column: field.name for field in model._meta.fields}
+    fields = []
+    for column in equality + (ranges[:1] if ranges else ordering):
+        name = by_column.get(column.lstrip('-'), column.lstrip('-'))
+        fields.append(('-' if column.startswith('-') else '') + name)
+    return tuple(fields)
+
+
+class Command(BaseCommand):
+    help = (
+        'Reproduce las vistas públicas, captura su SQL, ejecuta EXPLAIN y '
+        'sugiere índices para los scans secuenciales y ordenamientos detectados'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Muestra el plan de cada consulta')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in ('sqlite', 'postgresql'):
+            self.stderr.write(f'Motor no soportado: {vendor}')
+            return
+        explain = explain_sqlite if vendor == 'sqlite' else explain_postgresql
+
+        statements = []
+        errors = []
+        setup_test_environment()
+        try:
+            # Sin caché para que cada vista ejecute todas sus consultas
+            with override_settings(CACHES=DUMMY_CACHES, ANALYTICS_ENABLED=False):
+                client = Client()
+                for url in public_urls():
+                    with capture_sql(statements):
+                        try:
+                            response = client.get(url)
+                            if response.status_code >= 400:
+                                errors.append((url, response.status_code))
+                        except Exception as exc:
+                            errors.append((url, exc.__class__.__name__))
+        finally:
+            teardown_test_environment()
+
+        tables = model_for_table()
+        suggestions = defaultdict(lambda: {'reasons': set(), 'count': 0})
+        seen = set()
+        for sql, params in statements:
+            if (sql, params) in seen:
+                continue
+            seen.add((sql, params))
+            try:
+                with _atomic_if_postgres(vendor):
+                    plan, findings = explain(sql, params)
+            except Exception as exc:
+                self.stderr.write(f'No se pudo analizar: {exc}')
+                continue
+
+            if options['verbose_plans']:
+                self.stdout.write(sql)
+                for line in plan:
+                    self.stdout.write(f'    {line}')
+
+            for reason, table in findings:
+                model = tables.get(table)
+                if model is None:
+                    continue
+                fields = suggest(model, *table_columns(sql, table, model._meta.pk.column))
+                if fields:
+                    entry = suggestions[(model._meta.label, fields)]
+                    entry['reasons'].add(reason)
+                    entry['count'] += 1
+
+        self.stdout.write(f'{len(seen)} consulta(s) distintas analizadas con {vendor}.')
+        for url, error in errors:
+            self.stdout.write(self.style.WARNING(f'  {url}: {error}'))
+
+        if not suggestions:
+            self.stdout.write(self.style.SUCCESS('No se detectaron índices faltantes.'))
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Índices sugeridos:'))
+        for (label, fields), entry in sorted(suggestions.items()):
+            reasons = ', '.join(sorted(entry['reasons']))
+            self.stdout.write(
+                f"  {label}: models.Index(fields={list(fields)!r})  "
+                f"[{reasons}; {entry['count']} consulta(s)]"
+            )
+
+
+@contextmanager
+def _atomic_if_postgres(vendor):
+    # SET LOCAL solo dura dentro de una transacción
+    if vendor == 'postgresql':
+        from django.db import transaction
+        with transaction.atomic():
+            yield
+    else:
+        yield
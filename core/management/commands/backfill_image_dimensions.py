@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.core.files.images import get_image_dimensions
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.fields import StoredDimensionsImageField
+
+
+def image_fields():
+    for model in apps.get_models():
+        for field in model._meta.fields:
+            if isinstance(field, StoredDimensionsImageField):
+                yield model, field
+
+
+class Command(BaseCommand):
+    help = 'Guarda ancho y alto de las imágenes ya subidas que aún no tienen dimensiones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Recalcula también las que ya tienen dimensiones')
+
+    def handle(self, *args, **options):
+        for model, field in image_fields():
+            queryset = model._default_manager.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+            if not options['force']:
+                queryset = queryset.filter(
+                    Q(**{f'{field.width_field}__isnull': True}) | Q(**{f'{field.height_field}__isnull': True})
+                )
+
+            updated = failed = 0
+            for pk, name in queryset.values_list('pk', field.name).iterator():
+                try:
+                    with field.storage.open(name, 'rb') as fh:
+                        width, height = get_image_dimensions(fh)
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'{model.__name__} #{pk} ({name}): {exc}')
+                    continue
+                # update() evita save(): no cambia updated_at ni dispara señales
+                model._default_manager.filter(pk=pk).update(**{
+                    field.width_field: width,
+                    field.height_field: height,
+                })
+                updated += 1
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.label}.{field.name}: {updated} actualizadas, {failed} con error.'
+            ))
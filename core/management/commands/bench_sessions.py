@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from core.benchmarks import benchmark_database, clear_caches, measure
+
+PAGES = ['/', '/about/', '/projects/']
+
+DB_SESSION_SETUP = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTH_MIDDLEWARE': 'django.contrib.auth.middleware.AuthenticationMiddleware',
+}
+CACHED_SESSION_SETUP = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+    'AUTH_MIDDLEWARE': 'core.middleware.CachedAuthenticationMiddleware',
+}
+
+
+class Command(BaseCommand):
+    help = 'Compara consultas por petición entre sesiones en base de datos y sesiones en caché'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help='Peticiones por página')
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        with benchmark_database():
+            User.objects.create_user('bench', 'bench@example.com', 'bench-password')
+            results = {}
+
+            for label, setup in (('db', DB_SESSION_SETUP), ('cached_db', CACHED_SESSION_SETUP)):
+                middleware = [
+                    setup['AUTH_MIDDLEWARE'] if 'AuthenticationMiddleware' in m else m
+                    for m in settings.MIDDLEWARE
+                ]
+                with override_settings(SESSION_ENGINE=setup['SESSION_ENGINE'], MIDDLEWARE=middleware):
+                    clear_caches()
+                    client = Client()
+                    client.login(username='bench', password='bench-password')
+                    # Primera visita para calentar la caché
+                    for page in PAGES:
+                        client.get(page)
+                    results[label] = {
+                        page: measure(lambda: client.get(page), options['repeat'])
+                        for page in PAGES
+                    }
+
+        self.stdout.write(f'{"Página":<14}{"db ms":>10}{"db q":>8}{"cache ms":>12}{"cache q":>10}{"ahorro q":>10}')
+        for page in PAGES:
+            db_ms, db_q = results['db'][page]
+            cached_ms, cached_q = results['cached_db'][page]
+            self.stdout.write(
+                f'{page:<14}{db_ms:>10.2f}{db_q:>8.1f}{cached_ms:>12.2f}{cached_q:>10.1f}{db_q - cached_q:>10.1f}'
+            )
@@ -0,0 +1,128 @@
+import difflib
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.test import Client, override_settings
+from django.test.signals import template_rendered
+
+from core.benchmarks import benchmark_database, clear_caches, measure
+
+HOME_TEMPLATE = 'core/home.html'
+LIST_TEMPLATE = 'portfolio_projects/project_list.html'
+DETAIL_TEMPLATE = 'portfolio_projects/project_detail.html'
+# El token CSRF se enmascara distinto en cada render
+CSRF_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]+')
+
+
+def create_sample_data(count):
+    from portfolio_projects.models import Project, Category, Technology, Comment
+
+    categories = [
+        Category.objects.create(name=f'Categoría {n}', slug=f'categoria-{n}', description='' if n % 2 else 'Descripción')
+        for n in range(6)
+    ]
+    technologies = [Technology.objects.create(name=f'Tecnología {n}', slug=f'tecnologia-{n}') for n in range(15)]
+    description = 'Análisis de datos con <limpieza>, modelado & visualización de resultados. ' * 4
+    projects = []
+    for n in range(count):
+        project = Project.objects.create(
+            title=f'Proyecto {n}', slug=f'proyecto-{n}', description=description,
+            content='Primer párrafo del proyecto.\n\nSegundo párrafo con <html> escapado.\nOtra línea.',
+            github_url='https://github.com/example/repo', is_featured=n < 6,
+        )
+        project.categories.set(categories[n % 6:n % 6 + 2])
+        project.technologies.set(technologies[n % 15:n % 15 + 5])
+        projects.append(project)
+    Project.objects.update(trending_score=12.5)
+    commenter = User.objects.create_user('comentarista')
+    Comment.objects.bulk_create([
+        Comment(project=projects[0], user=commenter, content=f'Comentario {n} con "comillas" & <etiquetas>')
+        for n in range(20)
+    ])
+    return projects[0]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el tiempo de renderizado de las plantillas públicas entre '
+        'Django templates y Jinja2, y verifica que ambas generen el mismo HTML'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200, help='Renders por plantilla y motor')
+        parser.add_argument('--projects', type=int, default=24, help='Proyectos de ejemplo')
+
+    def handle(self, *args, **options):
+        try:
+            from django.template.backends.jinja2 import Jinja2
+        except ImportError:
+            raise CommandError('Falta el paquete Jinja2 (pip install -r requirements.txt)')
+
+        jinja_params = {key: value for key, value in settings.JINJA2_TEMPLATES.items() if key != 'BACKEND'}
+        django_only = [engine for engine in settings.TEMPLATES if engine['BACKEND'].endswith('DjangoTemplates')]
+        rows = []
+
+        with benchmark_database(), override_settings(TEMPLATES=django_only):
+            project = create_sample_data(options['projects'])
+            User.objects.create_superuser('bench-admin', 'admin@example.com', 'bench-password')
+            pages = (
+                ('inicio', '/', HOME_TEMPLATE),
+                ('listado', '/projects/', LIST_TEMPLATE),
+                ('detalle', project.get_absolute_url(), DETAIL_TEMPLATE),
+            )
+            django_engine = engines['django']
+            jinja_engine = Jinja2(jinja_params)
+
+            for role in ('anónimo', 'superusuario'):
+                clear_caches()
+                client = Client()
+                if role == 'superusuario':
+                    client.login(username='bench-admin', password='bench-password')
+                for label, path, template_name in pages:
+                    context = self.capture_context(client, path, template_name)
+                    request = context['request']
+                    django_template = django_engine.get_template(template_name)
+                    jinja_template = jinja_engine.get_template(template_name)
+
+                    django_html = django_template.render(context, request)
+                    jinja_html = jinja_template.render(context, request)
+                    django_ms, _ = measure(lambda: django_template.render(context, request), options['repeat'])
+                    jinja_ms, _ = measure(lambda: jinja_template.render(context, request), options['repeat'])
+                    rows.append((f'{label} ({role})', django_ms, jinja_ms, self.compare(django_html, jinja_html)))
+
+        self.stdout.write(f'{"Página":<26}{"django ms":>11}{"jinja2 ms":>11}{"x":>7}  Salida')
+        for label, django_ms, jinja_ms, difference in rows:
+            self.stdout.write(
+                f'{label:<26}{django_ms:>11.2f}{jinja_ms:>11.2f}{django_ms / jinja_ms:>7.1f}  '
+                + (self.style.SUCCESS('idéntica') if difference is None else self.style.ERROR('distinta'))
+            )
+            if difference:
+                self.stdout.write(difference)
+
+    def capture_context(self, client, path, template_name):
+        """Contexto completo (con context processors) con el que la vista renderizó la plantilla."""
+        captured = []
+
+        def receiver(sender, template, context, **kwargs):
+            if template.name == template_name and not captured:
+                captured.append(context.flatten())
+
+        template_rendered.connect(receiver)
+        try:
+            response = client.get(path)
+        finally:
+            template_rendered.disconnect(receiver)
+        if response.status_code != 200 or not captured:
+            raise CommandError(f'{path} respondió {response.status_code} sin renderizar {template_name}')
+        return captured[0]
+
+    def compare(self, django_html, jinja_html):
+        django_lines = CSRF_RE.sub(r'\1', django_html).splitlines()
+        jinja_lines = CSRF_RE.sub(r'\1', jinja_html).splitlines()
+        if django_lines == jinja_lines:
+            return None
+        diff = difflib.unified_diff(django_lines, jinja_lines, 'django', 'jinja2', n=1, lineterm='')
+        return '\n'.join(list(diff)[:20])
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+
+from core.models import StoredBlob
+
+
+def referenced_names():
+    """Nombres de archivo referenciados por cualquier FileField/ImageField."""
+    names = set()
+    for model in apps.get_models():
+        for field in model._meta.fields:
+            if isinstance(field, models.FileField):
+                names.update(
+                    model._default_manager.exclude(**{field.name: ''})
+                    .exclude(**{f'{field.name}__isnull': True})
+                    .values_list(field.name, flat=True)
+                    .iterator()
+                )
+    return names
+
+
+class Command(BaseCommand):
+    help = 'Elimina del almacenamiento los archivos media que ya no referencia ningún modelo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo lista lo que se eliminaría')
+        parser.add_argument(
+            '--grace-hours',
+            type=int,
+            default=24,
+            help='No toca objetos más recientes (la fila del modelo se guarda después del archivo)',
+        )
+
+    def handle(self, *args, **options):
+        referenced = referenced_names()
+        limit = timezone.now() - timedelta(hours=options['grace_hours'])
+        orphans = StoredBlob.objects.filter(created_at__lt=limit).exclude(name__in=referenced)
+
+        deleted = freed = 0
+        for blob in orphans.iterator():
+            self.stdout.write(f'{"[dry-run] " if options["dry_run"] else ""}{blob.name} ({blob.size} bytes)')
+            if options['dry_run']:
+                continue
+            default_storage.delete(blob.name)
+            blob.delete()
+            deleted += 1
+            freed += blob.size
+
+        self.stdout.write(self.style.SUCCESS(f'{deleted} objeto(s) eliminados, {freed} bytes liberados.'))
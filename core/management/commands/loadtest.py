@@ -0,0 +1,151 @@
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loadtest import PERCENTILES, load_scenario, run_load
+
+SCENARIO_DIR = Path(__file__).resolve().parents[2] / 'scenarios'
+LOADTEST_PASSWORD = 'loadtest-password'
+
+
+def wait_for_port(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera carga HTTP concurrente a partir de un escenario JSON y reporta '
+        'peticiones por segundo y percentiles de latencia por paso'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenario', nargs='?', default='browse',
+            help=f'Ruta a un escenario JSON o nombre de uno de {SCENARIO_DIR}',
+        )
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='URL base del servidor')
+        parser.add_argument('--users', type=int, default=10, help='Usuarios virtuales concurrentes')
+        parser.add_argument('--ramp-up', type=float, default=10, help='Segundos para arrancar todos los usuarios')
+        parser.add_argument('--duration', type=float, default=60, help='Duración total en segundos')
+        parser.add_argument('--timeout', type=float, default=30, help='Timeout por petición en segundos')
+        parser.add_argument(
+            '--user', action='append', default=[], metavar='USUARIO:CONTRASEÑA',
+            help='Credenciales para escenarios con login; se reparten entre los usuarios virtuales',
+        )
+        parser.add_argument(
+            '--create-users', type=int, default=0, metavar='N',
+            help=f'Crea (o reutiliza) N usuarios loadtest-<n> con contraseña "{LOADTEST_PASSWORD}"',
+        )
+        parser.add_argument(
+            '--start-server', action='store_true',
+            help='Arranca gunicorn en el host y puerto de --url durante la prueba',
+        )
+        parser.add_argument('--workers', type=int, default=2, help='Workers de gunicorn con --start-server')
+        parser.add_argument('--json', dest='json_path', help='Guarda el reporte en este archivo JSON')
+
+    def handle(self, *args, **options):
+        scenario_path = Path(options['scenario'])
+        if not scenario_path.exists():
+            scenario_path = SCENARIO_DIR / f"{options['scenario']}.json"
+        if not scenario_path.exists():
+            raise CommandError(f"No existe el escenario {options['scenario']}")
+        try:
+            scenario = load_scenario(scenario_path)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        credentials = [tuple(value.split(':', 1)) for value in options['user']]
+        if any(len(pair) != 2 for pair in credentials):
+            raise CommandError('Las credenciales deben tener el formato usuario:contraseña')
+        credentials += self.create_users(options['create_users'])
+        if scenario.get('login') and not credentials:
+            raise CommandError('El escenario requiere sesión: usa --user o --create-users')
+
+        server = self.start_server(options['url'], options['workers']) if options['start_server'] else None
+        try:
+            self.stdout.write(
+                f"Escenario «{scenario.get('name', scenario_path.stem)}»: {options['users']} usuario(s), "
+                f"rampa de {options['ramp_up']:g}s, {options['duration']:g}s contra {options['url']}"
+            )
+            report = asyncio.run(run_load(
+                options['url'], scenario, options['users'], options['duration'],
+                ramp_up=options['ramp_up'], credentials=credentials, timeout=options['timeout'],
+            ))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+        self.print_report(report)
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Reporte guardado en {options['json_path']}")
+
+    def create_users(self, count):
+        if not count:
+            return []
+        from django.contrib.auth.models import User
+
+        credentials = []
+        for number in range(count):
+            username = f'loadtest-{number}'
+            user, created = User.objects.get_or_create(username=username)
+            if created or not user.check_password(LOADTEST_PASSWORD):
+                user.set_password(LOADTEST_PASSWORD)
+                user.save()
+            credentials.append((username, LOADTEST_PASSWORD))
+        self.stdout.write(f'{count} usuario(s) de prueba listos.')
+        return credentials
+
+    def start_server(self, url, workers):
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+        if wait_for_port(host, port, 0):
+            raise CommandError(f'Ya hay un servidor escuchando en {host}:{port}')
+
+        server = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn', 'portfolio_project.wsgi',
+                '--bind', f'{host}:{port}', '--workers', str(workers),
+            ],
+            cwd=settings.BASE_DIR,
+        )
+        if not wait_for_port(host, port, 30):
+            server.terminate()
+            raise CommandError('gunicorn no arrancó en 30 segundos')
+        self.stdout.write(f'gunicorn escuchando en {host}:{port} con {workers} worker(s)')
+        return server
+
+    def print_report(self, report):
+        columns = ''.join(f'{f"p{pct} ms":>10}' for pct in PERCENTILES)
+        self.stdout.write(f'\n{"Paso":<22}{"pet.":>8}{"fallos":>8}{"pet/s":>9}{columns}{"máx ms":>10}')
+        for row in report['steps'] + [report['total']]:
+            percentiles = ''.join(f"{row[f'p{pct}']:>10.1f}" for pct in PERCENTILES)
+            line = (
+                f"{row['step'][:21]:<22}{row['requests']:>8}{row['failed']:>8}{row['rps']:>9.1f}"
+                f"{percentiles}{row['max']:>10.1f}"
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING(line) if row['step'] == 'TOTAL' else line)
+            if row.get('statuses'):
+                statuses = ', '.join(f'{status}×{count}' for status, count in sorted(row['statuses'].items()))
+                self.stdout.write(f'{"":<22}{statuses}')
+
+        for error, count in sorted(report['errors'].items()):
+            self.stdout.write(self.style.WARNING(f'  {count}× {error}'))
+        self.stdout.write(self.style.SUCCESS(f"Duración: {report['duration']:.1f}s"))
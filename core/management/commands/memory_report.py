@@ -0,0 +1,129 @@
+import math
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.memory import published_workers, send_command
+
+MB = 1024 * 1024
+# Margen sobre el pico observado para el umbral de reciclado sugerido
+RECYCLE_HEADROOM = 1.25
+
+
+class Command(BaseCommand):
+    help = (
+        'Muestra el RSS de cada worker web, las vistas con más crecimiento de '
+        'memoria y los sitios de asignación que crecen (tracemalloc), y sugiere '
+        'umbrales de reciclado'
+    )
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group()
+        action.add_argument('--start-tracing', action='store_const', const='start', dest='action',
+                            help='Activa tracemalloc en todos los workers y toma la instantánea base')
+        action.add_argument('--snapshot', action='store_const', const='snapshot', dest='action',
+                            help='Pide a los workers comparar una instantánea nueva con la anterior')
+        action.add_argument('--stop-tracing', action='store_const', const='stop', dest='action',
+                            help='Desactiva tracemalloc en todos los workers')
+        parser.add_argument('--wait', type=float, default=0,
+                            help='Segundos a esperar tras enviar la orden antes de mostrar el reporte')
+        parser.add_argument('--views', type=int, default=15, help='Vistas a mostrar')
+
+    def handle(self, *args, **options):
+        if options['action']:
+            command = send_command(options['action'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Orden '{command['action']}' enviada; los workers la aplican al publicar "
+                f"(cada {settings.MEMORY_PUBLISH_SECONDS} s, tras su siguiente petición)."
+            ))
+            if options['wait']:
+                time.sleep(options['wait'])
+            else:
+                return
+
+        workers = published_workers()
+        if not workers:
+            self.stdout.write(
+                'Ningún worker ha publicado cifras. ¿Está MEMORY_WATERMARKS_ENABLED=True '
+                'y comparten la caché (REDIS_URL)?'
+            )
+            return
+
+        self.write_workers(workers)
+        self.write_views(workers, options['views'])
+        self.write_growth(workers)
+        self.write_suggestion(workers)
+
+    def write_workers(self, workers):
+        self.stdout.write(f'\n{"Worker":<28}{"Peticiones":>11}{"Base MB":>9}{"RSS MB":>9}{"Pico MB":>9}{"KB/pet.":>9}  Rastreo')
+        for worker in workers:
+            self.stdout.write(
+                f"{worker['id']:<28}{worker['requests']:>11}{worker['baseline_rss'] / MB:>9.1f}"
+                f"{worker['rss'] / MB:>9.1f}{worker['peak_rss'] / MB:>9.1f}{growth_per_request(worker) / 1024:>9.1f}  "
+                + ('sí' if worker['tracing'] else 'no')
+            )
+
+    def write_views(self, workers, limit):
+        views = {}
+        for worker in workers:
+            for name, stats in worker['views'].items():
+                total = views.setdefault(name, {'requests': 0, 'max_rss': 0, 'growth': 0, 'max_growth': 0})
+                total['requests'] += stats['requests']
+                total['growth'] += stats['growth']
+                total['max_rss'] = max(total['max_rss'], stats['max_rss'])
+                total['max_growth'] = max(total['max_growth'], stats['max_growth'])
+
+        self.stdout.write(f'\n{"Vista":<30}{"Peticiones":>11}{"Pico MB":>9}{"Crec. MB":>10}{"KB/pet.":>9}{"Máx. KB":>9}')
+        ranked = sorted(views.items(), key=lambda item: item[1]['growth'], reverse=True)
+        for name, stats in ranked[:limit]:
+            self.stdout.write(
+                f"{name:<30}{stats['requests']:>11}{stats['max_rss'] / MB:>9.1f}{stats['growth'] / MB:>10.1f}"
+                f"{stats['growth'] / stats['requests'] / 1024:>9.1f}{stats['max_growth'] / 1024:>9.0f}"
+            )
+
+    def write_growth(self, workers):
+        sites = {}
+        for worker in workers:
+            for site in worker['growth']:
+                total = sites.setdefault(site['site'], {'size_diff': 0, 'count_diff': 0, 'workers': 0})
+                total['size_diff'] += site['size_diff']
+                total['count_diff'] += site['count_diff']
+                total['workers'] += 1
+        if not sites:
+            if any(worker['tracing'] for worker in workers):
+                self.stdout.write('\nRastreo activo; usa --snapshot para comparar instantáneas.')
+            return
+
+        self.stdout.write(f'\n{"Sitio de asignación que crece":<70}{"KB":>9}{"Bloques":>9}{"Workers":>9}')
+        ranked = sorted(sites.items(), key=lambda item: item[1]['size_diff'], reverse=True)
+        for site, total in ranked[:settings.MEMORY_TOP_SITES]:
+            self.stdout.write(
+                f"{site:<70}{total['size_diff'] / 1024:>9.1f}{total['count_diff']:>9}{total['workers']:>9}"
+            )
+
+    def write_suggestion(self, workers):
+        baseline = statistics.median(worker['baseline_rss'] for worker in workers)
+        peak = max(worker['peak_rss'] for worker in workers)
+        threshold_mb = math.ceil(peak * RECYCLE_HEADROOM / MB)
+        self.stdout.write(
+            f'\nUmbral sugerido: MEMORY_RECYCLE_RSS_MB={threshold_mb} '
+            f'(pico observado {peak / MB:.0f} MB + {RECYCLE_HEADROOM - 1:.0%})'
+        )
+        growth = statistics.median(growth_per_request(worker) for worker in workers)
+        if growth > 0:
+            max_requests = int((threshold_mb * MB - baseline) / growth)
+            self.stdout.write(
+                f'Con {growth / 1024:.1f} KB por petición un worker llega al umbral en ~{max_requests} '
+                f'peticiones: gunicorn --max-requests {max_requests} --max-requests-jitter {max(1, max_requests // 10)}'
+            )
+        else:
+            self.stdout.write('Los workers no crecen entre peticiones; no hace falta --max-requests.')
+
+
+def growth_per_request(worker):
+    """Crecimiento medio del RSS por petición desde la primera."""
+    if worker['requests'] < 2:
+        return 0
+    return max(0, worker['rss'] - worker['baseline_rss']) / (worker['requests'] - 1)
@@ -0,0 +1,162 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Se ejecuta en un proceso nuevo con ``-X importtime``: mide la carga de
+# settings, la importación y el ready() de cada app, y la carga del handler
+# WSGI y las URLs, como lo haría un worker de gunicorn al arrancar.
+PROBE = r'''
+import json, os, sys, time
+started = time.perf_counter()
+timings = {'apps': {}}
+
+from django.apps.config import AppConfig
+
+original_create = AppConfig.create.__func__
+original_import_models = AppConfig.import_models
+
+
+def create(cls, entry):
+    begin = time.perf_counter()
+    config = original_create(cls, entry)
+    app = timings['apps'].setdefault(config.label, {'import': 0.0, 'models': 0.0, 'ready': 0.0})
+    app['import'] = time.perf_counter() - begin
+    ready = config.ready
+
+    def timed_ready():
+        begin = time.perf_counter()
+        ready()
+        app['ready'] = time.perf_counter() - begin
+
+    config.ready = timed_ready
+    return config
+
+
+def import_models(self):
+    begin = time.perf_counter()
+    original_import_models(self)
+    timings['apps'][self.label]['models'] = time.perf_counter() - begin
+
+
+AppConfig.create = classmethod(create)
+AppConfig.import_models = import_models
+
+from django.conf import settings
+begin = time.perf_counter()
+settings.INSTALLED_APPS
+timings['settings'] = time.perf_counter() - begin
+
+import django
+begin = time.perf_counter()
+django.setup()
+timings['setup'] = time.perf_counter() - begin
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import get_resolver
+begin = time.perf_counter()
+WSGIHandler()
+timings['middleware'] = time.perf_counter() - begin
+begin = time.perf_counter()
+get_resolver().url_patterns
+timings['urls'] = time.perf_counter() - begin
+
+timings['total'] = time.perf_counter() - started
+timings['modules'] = sorted(sys.modules)
+print(json.dumps(timings))
+'''
+
+# Paquetes pesados que no deberían cargarse en el arranque local
+WATCHED_PACKAGES = ('boto3', 'botocore', 's3transfer', 'storages', 'dj_database_url', 'dotenv', 'PIL')
+
+
+def parse_importtime(stderr):
+    """Suma el tiempo acumulado (µs) de cada paquete importado en primer nivel."""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Los módulos anidados llevan sangría adicional tras el separador
+        if name[1:].startswith(' '):
+            continue
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0) + int(cumulative)
+    return totals
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el arranque en un proceso nuevo: carga de settings, importación, '
+        'modelos y ready() por app, middleware, URLs y los paquetes más lentos de importar'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Arranques a medir; se reporta la mediana')
+        parser.add_argument('--top', type=int, default=15, help='Paquetes más lentos a listar')
+        parser.add_argument('--json', dest='json_path', help='Guarda el reporte en este archivo JSON')
+
+    def handle(self, *args, **options):
+        runs = [self.probe() for _ in range(max(1, options['runs']))]
+        report = self.median_report(runs)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Arranque (mediana de {len(runs)} ejecución(es))"))
+        for phase in ('settings', 'setup', 'middleware', 'urls', 'total'):
+            self.stdout.write(f"  {phase:<24}{report[phase] * 1000:>10.1f} ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nApps'))
+        self.stdout.write(f"  {'app':<24}{'import ms':>10}{'models ms':>11}{'ready ms':>10}")
+        for label, app in sorted(report['apps'].items(), key=lambda item: -sum(item[1].values())):
+            self.stdout.write(
+                f"  {label:<24}{app['import'] * 1000:>10.1f}{app['models'] * 1000:>11.1f}{app['ready'] * 1000:>10.1f}"
+            )
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nPaquetes (importación acumulada)'))
+        for package, micros in report['packages'][:options['top']]:
+            self.stdout.write(f"  {package:<24}{micros / 1000:>10.1f} ms")
+
+        loaded = [name for name in WATCHED_PACKAGES if name in report['modules']]
+        if loaded:
+            self.stdout.write(self.style.WARNING(f"\nCargados durante el arranque: {', '.join(loaded)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('\nNingún paquete opcional pesado se cargó durante el arranque.'))
+
+        if options['json_path']:
+            report = {**report, 'modules': sorted(report['modules'])}
+            with open(options['json_path'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+
+    def probe(self):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE],
+            cwd=settings.BASE_DIR, env=os.environ.copy(), capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        timings['packages'] = parse_importtime(result.stderr)
+        return timings
+
+    def median_report(self, runs):
+        report = {
+            phase: statistics.median([run[phase] for run in runs])
+            for phase in ('settings', 'setup', 'middleware', 'urls', 'total')
+        }
+        report['apps'] = {
+            label: {
+                part: statistics.median([run['apps'].get(label, {}).get(part, 0.0) for run in runs])
+                for part in ('import', 'models', 'ready')
+            }
+            for label in runs[0]['apps']
+        }
+        packages = {
+            package: statistics.median([run['packages'].get(package, 0) for run in runs])
+            for package in runs[0]['packages']
+        }
+        report['packages'] = sorted(packages.items(), key=lambda item: -item[1])
+        report['modules'] = set(runs[0]['modules'])
+        return report
@@ -0,0 +1,269 @@
+"""
+Marcas de agua de memoria por worker y diferencias de ``tracemalloc``.
+
+``MemoryWatermarkMiddleware`` lee el RSS del proceso antes y después de cada
+petición y acumula, por nombre de URL, el máximo RSS alcanzado y cuánto
+creció el proceso durante esas peticiones. Cada ``MEMORY_PUBLISH_SECONDS``
+el worker publica sus cifras en la caché compartida, donde las lee
+``manage.py memory_report``.
+
+El rastreo con ``tracemalloc`` es opcional porque encarece cada asignación:
+``memory_report --start-tracing`` lo activa en todos los workers (que
+consultan la orden al publicar), ``--snapshot`` les pide comparar una
+instantánea con la anterior y ``--stop-tracing`` lo apaga. ``SIGUSR2`` hace
+lo mismo en un solo worker: la primera señal activa el rastreo y las
+siguientes toman instantáneas. Así se ven los sitios de asignación que
+siguen creciendo entre peticiones.
+
+Con ``MEMORY_RECYCLE_RSS_MB`` el worker de gunicorn que supera ese RSS se
+envía a sí mismo ``SIGTERM`` tras responder: gunicorn termina la petición en
+curso y levanta un worker nuevo.
+"""
+import logging
+import os
+import resource
+import signal
+import socket
+import sys
+import time
+import tracemalloc
+
+from django.conf import settings
+
+from .cache import shared_cache
+from .profiling import short_filename
+
+logger = logging.getLogger(__name__)
+
+WORKERS_KEY = 'memory:workers'
+COMMAND_KEY = 'memory:command'
+INDEX_TIMEOUT = 60 * 60 * 24
+# Las cifras de un worker que deja de publicar desaparecen pasado este tiempo
+WORKER_TIMEOUT = 60
+UNNAMED_VIEW = '(sin nombre)'
+PAGE_SIZE = resource.getpagesize()
+# ru_maxrss está en KB en Linux y en bytes en macOS
+MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def current_rss():
+    """RSS actual del proceso en bytes (el pico si no hay /proc)."""
+    try:
+        with open('/proc/self/statm', 'rb') as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT
+
+
+def worker_key(worker_id):
+    return f'memory:worker:{worker_id}'
+
+
+def send_command(action):
+    """Ordena a todos los workers ``start``, ``snapshot`` o ``stop`` del rastreo."""
+    cache = shared_cache()
+    command = cache.get(COMMAND_KEY) or {'generation': 0}
+    command = {'generation': command['generation'] + 1, 'action': action, 'sent': time.time()}
+    cache.set(COMMAND_KEY, command, INDEX_TIMEOUT)
+    return command
+
+
+def published_workers():
+    """Cifras publicadas por los workers vivos (las de workers caídos expiran)."""
+    cache = shared_cache()
+    index = cache.get(WORKERS_KEY) or []
+    workers = cache.get_many([worker_key(worker_id) for worker_id in index])
+    return sorted(workers.values(), key=lambda worker: worker['id'])
+
+
+class WorkerMemory:
+    """Estado de memoria del proceso actual; se recrea si el proceso se bifurca."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.id = f'{socket.gethostname()}:{self.pid}'
+        self.started = time.time()
+        self.requests = 0
+        self.baseline_rss = None
+        self.rss = 0
+        self.peak_rss = 0
+        self.views = {}
+        self.published_at = 0.0
+        self.generation = None
+        self.pending_action = None
+        self.snapshot = None
+        self.growth = []
+        self.snapshot_at = None
+        self.recycling = False
+
+    def record(self, view, before, after):
+        self.requests += 1
+        self.rss = after
+        self.peak_rss = max(self.peak_rss, after)
+        if self.baseline_rss is None:
+            # La primera petición carga URLs, plantillas, conexiones...
+            self.baseline_rss = after
+        stats = self.views.get(view)
+        if stats is None:
+            stats = self.views[view] = {'requests': 0, 'max_rss': 0, 'growth': 0, 'max_growth': 0}
+        stats['requests'] += 1
+        stats['max_rss'] = max(stats['max_rss'], after)
+        if after > before:
+            stats['growth'] += after - before
+            stats['max_growth'] = max(stats['max_growth'], after - before)
+
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'pid': self.pid,
+            'started': self.started,
+            'updated': time.time(),
+            'requests': self.requests,
+            'baseline_rss': self.baseline_rss or 0,
+            'rss': self.rss,
+            'peak_rss': self.peak_rss,
+            'views': self.views,
+            'tracing': tracemalloc.is_tracing(),
+            'growth': self.growth,
+            'snapshot_at': self.snapshot_at,
+        }
+
+    def publish(self):
+        cache = shared_cache()
+        self.published_at = time.monotonic()
+        cache.set(worker_key(self.id), self.as_dict(), max(WORKER_TIMEOUT, settings.MEMORY_PUBLISH_SECONDS * 6))
+        # Índice sin bloqueo: si dos workers lo pisan a la vez, el que se
+        # pierde se vuelve a añadir en su siguiente publicación
+        index = cache.get(WORKERS_KEY) or []
+        if self.id not in index:
+            alive = cache.get_many([worker_key(worker_id) for worker_id in index])
+            index = [worker_id for worker_id in index if worker_key(worker_id) in alive] + [self.id]
+            cache.set(WORKERS_KEY, index, INDEX_TIMEOUT)
+
+    def poll_command(self):
+        command = shared_cache().get(COMMAND_KEY)
+        if command is None:
+            return
+        if command['generation'] == self.generation:
+            return
+        action = command['action']
+        if self.generation is None:
+            # Un worker nuevo no repite órdenes viejas: solo se suma al
+            # rastreo si sigue activo
+            if action == 'stop':
+                self.generation = command['generation']
+                return
+            action = 'start'
+        self.generation = command['generation']
+        self.apply(action)
+
+    def apply(self, action):
+        if action == 'start':
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.snapshot = self.take_snapshot()
+            self.growth = []
+            self.snapshot_at = time.time()
+        elif action == 'snapshot':
+            if self.snapshot is None:
+                self.apply('start')
+                return
+            snapshot = self.take_snapshot()
+            stats = snapshot.compare_to(self.snapshot, 'lineno')
+            # Cada diferencia es contra la instantánea anterior: lo que crece
+            # en varias seguidas es lo que no se libera entre peticiones
+            self.growth = [
+                {
+                    'site': f'{short_filename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}',
+                    'size_diff': stat.size_diff,
+                    'size': stat.size,
+                    'count_diff': stat.count_diff,
+                }
+                for stat in stats if stat.size_diff > 0
+            ][:settings.MEMORY_TOP_SITES]
+            self.snapshot = snapshot
+            self.snapshot_at = time.time()
+            logger.info(
+                'Worker %s: %s',
+                self.id, ', '.join(f"{site['site']} +{site['size_diff'] // 1024} KB" for site in self.growth[:5]),
+            )
+        elif action == 'stop':
+            tracemalloc.stop()
+            self.snapshot = None
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+_worker = None
+
+
+def worker_memory():
+    global _worker
+    if _worker is None or _worker.pid != os.getpid():
+        _worker = WorkerMemory()
+    return _worker
+
+
+def _handle_sigusr2(signum, frame):
+    # Solo se anota: la instantánea se toma al terminar la petición en curso
+    worker = worker_memory()
+    worker.pending_action = 'snapshot' if tracemalloc.is_tracing() else 'start'
+
+
+class MemoryWatermarkMiddleware:
+    """Registra el RSS por vista, aplica las órdenes de rastreo y recicla el worker."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if signal.getsignal(signal.SIGUSR2) in (signal.SIG_DFL, None):
+            try:
+                signal.signal(signal.SIGUSR2, _handle_sigusr2)
+            except ValueError:
+                # Fuera del hilo principal queda solo la orden por caché
+                pass
+
+    def __call__(self, request):
+        before = current_rss()
+        response = self.get_response(request)
+        after = current_rss()
+
+        worker = worker_memory()
+        match = getattr(request, 'resolver_match', None)
+        worker.record(match.url_name if match and match.url_name else UNNAMED_VIEW, before, after)
+
+        if worker.pending_action:
+            action, worker.pending_action = worker.pending_action, None
+            worker.apply(action)
+        if time.monotonic() - worker.published_at >= settings.MEMORY_PUBLISH_SECONDS:
+            try:
+                worker.poll_command()
+                worker.publish()
+            except Exception:
+                # La instrumentación nunca debe tumbar una petición
+                logger.exception('No se pudieron publicar las cifras de memoria')
+
+        limit = settings.MEMORY_RECYCLE_RSS_MB * 1024 * 1024
+        if (
+            limit and after > limit and not worker.recycling
+            and request.META.get('SERVER_SOFTWARE', '').startswith('gunicorn')
+        ):
+            worker.recycling = True
+            try:
+                worker.publish()
+            except Exception:
+                logger.exception('No se pudieron publicar las cifras de memoria')
+            logger.warning(
+                'Worker %s con %d MB de RSS (límite %d MB): se recicla',
+                worker.id, after // (1024 * 1024), settings.MEMORY_RECYCLE_RSS_MB,
+            )
+            # SIGTERM es la parada ordenada de gunicorn: termina de enviar
+            # esta respuesta y el arbiter levanta un worker nuevo
+            os.kill(worker.pid, signal.SIGTERM)
+        return response
@@ -0,0 +1,179 @@
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.templatetags.static import static
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .cache import shared_cache
+from .routers import replica_reads
+
+USER_CACHE_TIMEOUT = 60 * 60
+REPLICA_PIN_COOKIE = 'primary_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def cache_user(user):
+    shared_cache().set(user_cache_key(user.pk), user, getattr(settings, 'USER_CACHE_TIMEOUT', USER_CACHE_TIMEOUT))
+
+
+def invalidate_user(user_id):
+    shared_cache().delete(user_cache_key(user_id))
+
+
+def get_cached_user(request):
+    """
+    Igual que ``auth.get_user`` pero sirviendo el usuario desde la caché.
+
+    Si no hay usuario en caché, el backend ya no lo admite (cuenta
+    desactivada) o el hash de sesión no coincide (cambio de contraseña,
+    claves de respaldo...), se delega en Django para mantener exactamente la
+    misma verificación.
+    """
+    try:
+        user_id = request.session[SESSION_KEY]
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return auth.get_user(request)
+
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+
+    user = shared_cache().get(user_cache_key(user_id))
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache_user(user)
+        return user
+
+    backend = auth.load_backend(backend_path)
+    if hasattr(backend, 'user_can_authenticate') and not backend.user_can_authenticate(user):
+        invalidate_user(user_id)
+        return auth.get_user(request)
+
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(session_hash, user.get_session_auth_hash()):
+        return auth.get_user(request)
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware que evita el SELECT del usuario en cada petición."""
+
+    def process_request(self, request):
+        super().process_request(request)
+
+        def get_user():
+            if not hasattr(request, '_cached_user'):
+                request._cached_user = get_cached_user(request)
+            return request._cached_user
+
+        request.user = SimpleLazyObject(get_user)
+
+
+def add_preload(request, url, as_type, **attributes):
+    """
+    Pide a ``PreloadLinkMiddleware`` que anuncie ``url`` en la cabecera Link.
+
+    Pensado para recursos que la vista conoce antes de renderizar (p. ej. la
+    imagen principal de un proyecto) y que el navegador solo descubriría al
+    parsear el HTML.
+    """
+    links = request.__dict__.setdefault('_preload_links', [])
+    links.append(format_link(url, 'preload', as_type=as_type, **attributes))
+
+
+def format_link(url, rel, as_type=None, **attributes):
+    parts = [f'<{url}>', f'rel={rel}']
+    if as_type:
+        parts.append(f'as={as_type}')
+    for name, value in attributes.items():
+        name = name.replace('_', '')
+        parts.append(name if value is True else f'{name}="{value}"')
+    return '; '.join(parts)
+
+
+@lru_cache(maxsize=1)
+def global_links():
+    """Links comunes a todas las páginas; se calculan una vez por proceso."""
+    links = []
+    origins = list(getattr(settings, 'PRECONNECT_ORIGINS', []))
+    if urlsplit(settings.MEDIA_URL).netloc:
+        media = urlsplit(settings.MEDIA_URL)
+        origins.append(f'{media.scheme}://{media.netloc}')
+    for origin in dict.fromkeys(origins):
+        links.append(format_link(origin, 'preconnect', crossorigin=True))
+
+    for url, as_type in getattr(settings, 'PRELOAD_LINKS', []):
+        if not urlsplit(url).netloc:
+            url = static(url)
+        links.append(format_link(url, 'preload', as_type=as_type))
+    return links
+
+
+class PreloadLinkMiddleware:
+    """
+    Añade cabeceras ``Link: rel=preload/preconnect`` a las respuestas HTML.
+
+    WSGI no permite enviar respuestas 1xx, así que gunicorn no puede emitir
+    ``103 Early Hints`` por sí mismo; los CDN que lo soportan (Cloudflare,
+    Fastly...) generan el 103 a partir de estas cabeceras y, sin CDN, el
+    navegador igualmente empieza a descargar la imagen principal, los CSS/JS
+    y las conexiones a orígenes de fuentes antes de parsear el documento.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method == 'GET'
+            and response.status_code == 200
+            and response.get('Content-Type', '').startswith('text/html')
+        ):
+            links = request.__dict__.get('_preload_links', []) + global_links()
+            existing = response.get('Link')
+            response['Link'] = ', '.join(([existing] if existing else []) + links)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Decide si las lecturas de la petición pueden ir a una réplica.
+
+    Solo las peticiones GET/HEAD fuera de ``REPLICA_PRIMARY_PATHS`` leen de
+    réplicas. Tras una escritura correcta (voto, comentario, edición en el
+    admin) se envía una cookie que durante ``REPLICA_PIN_SECONDS`` fija al
+    cliente al primario, para que vea su propio cambio aunque la réplica
+    vaya con retraso. Las respuestas en streaming se consumen fuera del
+    middleware y por tanto leen del primario.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.primary_paths = tuple(getattr(settings, 'REPLICA_PRIMARY_PATHS', ()))
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        use_replica = (
+            safe
+            and REPLICA_PIN_COOKIE not in request.COOKIES
+            and not request.path.startswith(self.primary_paths)
+        )
+        with replica_reads(use_replica):
+            response = self.get_response(request)
+        if not safe and response.status_code < 400:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax', secure=request.is_secure(),
+            )
+        return response
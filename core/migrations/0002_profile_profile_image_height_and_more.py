@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-19 11:52
+
+import core.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='profile_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='profile_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='profile_image',
+            field=core.fields.StoredDimensionsImageField(blank=True, height_field='profile_image_height', null=True, upload_to='profile/', width_field='profile_image_width'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.23 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_storedblob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['user', '-issue_date'], name='certification_user_issue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['user', '-start_date'], name='experience_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['category', 'name'], name='skill_category_name_idx'),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils.text import slugify
 from django.core.validators import FileExtensionValidator
+from .fields import StoredDimensionsImageField
 
 
 class Skill(models.Model):
@@ -22,6 +23,9 @@ class Skill(models.Model):
     
     class Meta:
         ordering = ['category', 'name']
+        indexes = [
+            models.Index(fields=['category', 'name'], name='skill_category_name_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -41,7 +45,12 @@ class UserSkill(models.Model):
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(blank=True)
-    profile_image = models.ImageField(upload_to='profile/', blank=True, null=True)
+    profile_image = StoredDimensionsImageField(
+        upload_to='profile/', blank=True, null=True,
+        width_field='profile_image_width', height_field='profile_image_height'
+    )
+    profile_image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    profile_image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
     location = models.CharField(max_length=100, blank=True)
     website = models.URLField(blank=True)
     linkedin_url = models.URLField(blank=True)
@@ -75,6 +84,9 @@ class Experience(models.Model):
     
     class Meta:
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['user', '-start_date'], name='experience_user_start_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -97,10 +109,23 @@ class Certification(models.Model):
     
     class Meta:
         ordering = ['-issue_date']
+        indexes = [
+            models.Index(fields=['user', '-issue_date'], name='certification_user_issue_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.issuing_organization}"
 
 
-
-
+class StoredBlob(models.Model):
+    """Objeto media guardado por su hash de contenido (ver core.storage)"""
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.name
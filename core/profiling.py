@@ -0,0 +1,202 @@
+"""
+Perfilado estadístico de peticiones lentas (``SamplingProfilerMiddleware``).
+
+Un temporizador de intervalo (``setitimer``) envía ``SIGALRM`` cada
+``PROFILER_INTERVAL_MS``; el manejador guarda la pila del hilo que atiende la
+petición. No hay trazado por llamada: el coste es un recorrido de pila por
+muestra, independiente de cuánto código se ejecute.
+
+Las muestras se acumulan en memoria y solo se escriben si la petición superó
+``PROFILER_THRESHOLD_MS`` o fue elegida al azar (``PROFILER_SAMPLE_RATE``).
+El archivo usa el formato "collapsed stacks" (``marco;marco;marco N``) que
+leen ``flamegraph.pl``, speedscope o inferno.
+
+Python ejecuta los manejadores de señales al terminar la llamada en C en
+curso, así que una consulta bloqueada produce una sola muestra tardía; por
+eso cada muestra pesa los intervalos transcurridos desde la anterior y el
+tiempo de espera de la base de datos no desaparece del perfil.
+"""
+import logging
+import random
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = '.collapsed'
+PROFILE_NAME_RE = re.compile(r'^[\w.-]+\.collapsed$')
+ROOT_PREFIXES = tuple(sorted({str(Path(path)) + '/' for path in sys.path if path}, key=len, reverse=True))
+
+# El temporizador y el manejador de SIGALRM son del proceso: una sola
+# petición se perfila a la vez, aunque haya varios handlers WSGI
+_profiling = threading.Lock()
+_active_sampler = None
+
+
+def short_filename(filename):
+    """Ruta relativa a la entrada de ``sys.path`` que la contiene."""
+    for prefix in ROOT_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def frame_label(code):
+    # ';' separa marcos en el formato collapsed
+    return f'{code.co_qualname} ({short_filename(code.co_filename)}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class Sampler:
+    """Muestrea la pila de un hilo mientras está activo. Uno por proceso a la vez."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.thread_id = None
+        self.last = 0.0
+
+    def start(self):
+        self.thread_id = threading.get_ident()
+        self.last = time.perf_counter()
+        signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    def sample(self, signum, frame):
+        now = time.perf_counter()
+        weight = max(1, round((now - self.last) / self.interval))
+        self.last = now
+        # El manejador siempre corre en el hilo principal; con workers de
+        # hilos la pila que interesa es la del hilo de la petición
+        if self.thread_id != threading.get_ident():
+            frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None:
+            labels.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        if labels:
+            self.stacks[';'.join(reversed(labels))] += weight
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+def _handle_signal(signum, frame):
+    sampler = _active_sampler
+    if sampler is not None:
+        sampler.sample(signum, frame)
+
+
+def profiles_dir():
+    return Path(settings.PROFILER_DIR)
+
+
+def list_profiles():
+    """Perfiles guardados, del más reciente al más antiguo."""
+    directory = profiles_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in directory.glob(f'*{PROFILE_SUFFIX}'):
+        stat = path.stat()
+        profiles.append({
+            'name': path.name,
+            'size': stat.st_size,
+            'modified': datetime.fromtimestamp(stat.st_mtime).astimezone(),
+        })
+    profiles.sort(key=lambda profile: profile['name'], reverse=True)
+    return profiles
+
+
+def profile_path(name):
+    """Ruta de un perfil por nombre; ``None`` si el nombre no es válido o no existe."""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = profiles_dir() / name
+    return path if path.is_file() else None
+
+
+def save_profile(sampler, request, duration_ms, reason):
+    directory = profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    match = getattr(request, 'resolver_match', None)
+    view = (match.url_name if match and match.url_name else 'sin-nombre').replace('_', '-')
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+    path = directory / f'{stamp}-{view}-{duration_ms:.0f}ms-{reason}{PROFILE_SUFFIX}'
+    path.write_text(sampler.collapsed(), encoding='utf-8')
+
+    # Solo se conservan los PROFILER_MAX_FILES más recientes
+    for old in sorted(directory.glob(f'*{PROFILE_SUFFIX}'), reverse=True)[settings.PROFILER_MAX_FILES:]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+class SamplingProfilerMiddleware:
+    """
+    Perfila las peticiones y guarda las que superan ``PROFILER_THRESHOLD_MS``
+    o caen en la fracción ``PROFILER_SAMPLE_RATE``.
+
+    Se activa con ``PROFILER_ENABLED`` y va primero en ``MIDDLEWARE`` para
+    cubrir también al resto de middlewares. El temporizador es del proceso:
+    con workers de hilos, mientras una petición se perfila las concurrentes
+    se atienden sin perfilar.
+    """
+
+    def __init__(self, get_response):
+        if not hasattr(signal, 'setitimer'):
+            raise MiddlewareNotUsed('setitimer no está disponible en esta plataforma')
+        current = signal.getsignal(signal.SIGALRM)
+        if current is not _handle_signal:
+            if current not in (signal.SIG_DFL, signal.SIG_IGN, None):
+                logger.warning('SIGALRM ya tiene manejador; el perfilador queda desactivado')
+                raise MiddlewareNotUsed
+            try:
+                signal.signal(signal.SIGALRM, _handle_signal)
+            except ValueError:
+                # Solo el hilo principal puede instalar manejadores de señales
+                logger.warning('El perfilador debe cargarse en el hilo principal; queda desactivado')
+                raise MiddlewareNotUsed
+            # Reanudar las llamadas al sistema interrumpidas en vez de devolver EINTR
+            signal.siginterrupt(signal.SIGALRM, False)
+        self.get_response = get_response
+        self.interval = settings.PROFILER_INTERVAL_MS / 1000
+        self.threshold_ms = settings.PROFILER_THRESHOLD_MS
+        self.sample_rate = settings.PROFILER_SAMPLE_RATE
+
+    def __call__(self, request):
+        global _active_sampler
+
+        if not _profiling.acquire(blocking=False):
+            return self.get_response(request)
+        sampler = Sampler(self.interval)
+        selected = random.random() < self.sample_rate
+        started = time.perf_counter()
+        try:
+            _active_sampler = sampler
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+                _active_sampler = None
+        finally:
+            _profiling.release()
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        if sampler.stacks and (duration_ms >= self.threshold_ms or selected):
+            reason = 'lenta' if duration_ms >= self.threshold_ms else 'muestra'
+            try:
+                save_profile(sampler, request, duration_ms, reason)
+            except OSError:
+                logger.exception('No se pudo guardar el perfil de %s', request.path)
+        return response
@@ -0,0 +1,48 @@
+"""
+Páginas públicas como "shell" idéntico para todos los visitantes.
+
+Con ``PUBLIC_SHELL_ENABLED`` las vistas decoradas con :func:`public_shell`
+renderizan la versión anónima de la página: sin sesión, sin token CSRF y
+sin mensajes, de modo que la respuesta no lleva ``Vary: Cookie`` y se marca
+``public, s-maxage`` para que el CDN la comparta entre anónimos y usuarios
+con sesión. En las plantillas ``request.public_shell`` es verdadero: la
+barra de usuario sale en su versión anónima, los mensajes quedan en un
+contenedor vacío y lo que depende del usuario se renderiza oculto con
+``data-requires="authenticated|superuser|anonymous"``.
+
+``static/js/shell.js`` pide después ``/fragments/`` (``core.views.user_fragments``),
+que responde por usuario y sin caché HTTP compartida: barra de navegación,
+mensajes, token CSRF y votos del usuario en los proyectos de la página.
+Como las páginas servidas por el CDN no llegan al servidor, la visita al
+detalle de un proyecto también se registra desde ese endpoint.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+
+
+def is_public_shell(request):
+    return getattr(request, 'public_shell', False)
+
+
+def public_shell(view):
+    """Sirve la vista como shell cacheable cuando el modo está activo."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not settings.PUBLIC_SHELL_ENABLED or request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+
+        request.public_shell = True
+        response = view(request, *args, **kwargs)
+        session = getattr(request, 'session', None)
+        if (
+            response.status_code == 200
+            and not response.cookies
+            and not (session is not None and session.accessed)
+            and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+        ):
+            patch_cache_control(response, public=True, max_age=0, s_maxage=settings.PUBLIC_SHELL_CACHE_SECONDS)
+        return response
+
+    return wrapper
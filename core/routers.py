@@ -0,0 +1,53 @@
+"""
+Enrutado de lecturas a réplicas con "read your writes".
+
+``ReplicaRoutingMiddleware`` marca, con una variable de contexto, las
+peticiones cuyas lecturas pueden ir a una réplica: GET/HEAD de clientes que
+no escribieron hace poco. Fuera de esas peticiones (POST, admin, tareas del
+worker, comandos de gestión) todo se lee y escribe en el primario, así que
+el código que lee justo después de escribir nunca ve datos atrasados.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY_DB = 'default'
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != PRIMARY_DB]
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Permite (o prohíbe) leer de réplicas dentro del bloque."""
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Escrituras y migraciones al primario; lecturas a una réplica si se permite."""
+
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get():
+            replicas = replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario y réplicas tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB
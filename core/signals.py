@@ -0,0 +1,20 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .middleware import cache_user, invalidate_user
+
+
+@receiver(post_save, sender=User)
+def refresh_cached_user(sender, instance, **kwargs):
+    # Write-through: la base de datos ya tiene el cambio, la caché se actualiza.
+    # Un usuario desactivado no se cachea: la próxima petición lo rechaza
+    if instance.is_active:
+        cache_user(instance)
+    else:
+        invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
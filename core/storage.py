@@ -0,0 +1,102 @@
+"""
+Backends de almacenamiento para los archivos media.
+
+Este módulo no importa boto3: el backend de Spaces vive en
+``core.storage_s3`` y solo se carga cuando está configurado.
+"""
+import hashlib
+import posixpath
+import threading
+from functools import lru_cache
+
+from django.core.files.storage import FileSystemStorage
+
+URL_CACHE_SIZE = 4096
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class CachedUrlMixin:
+    """
+    Memoiza ``url()`` cuando las URLs son públicas y estables.
+
+    Con ``AWS_QUERYSTRING_AUTH = False`` la URL de un objeto solo depende de
+    su nombre, así que se calcula una vez por proceso en lugar de pasar por
+    boto3 en cada imagen de cada tarjeta y carrusel.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_url = lru_cache(maxsize=URL_CACHE_SIZE)(super().url)
+
+    def url(self, name, *args, **kwargs):
+        if args or kwargs or getattr(self, 'querystring_auth', False):
+            return super().url(name, *args, **kwargs)
+        return self._cached_url(name)
+
+
+class _AlreadyStored(Exception):
+    pass
+
+
+class ContentAddressedMixin:
+    """
+    Guarda cada archivo bajo el hash SHA-256 de su contenido.
+
+    ``projects/images/captura.png`` se guarda como
+    ``projects/images/3f/3f9a...c1.png``. Si el objeto ya existe no se vuelve
+    a subir, así que las resubidas del mismo archivo comparten un único
+    objeto y una única URL cacheable para siempre. Cada objeto queda
+    registrado en ``StoredBlob`` para que ``manage.py gc_media`` pueda borrar
+    los que ya no referencia ningún modelo.
+    """
+
+    def hash_content(self, content):
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in content.chunks():
+            digest.update(chunk)
+            size += len(chunk)
+        return digest.hexdigest(), size
+
+    def hashed_name(self, name, digest):
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], f'{digest}{extension}')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._writing = threading.local()
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre definitivo lo decide el hash en _save(). Si el backend pide
+        # una alternativa para el objeto que se está escribiendo es porque el
+        # mismo contenido se guardó en paralelo: ese objeto ya sirve.
+        if name == getattr(self._writing, 'name', None):
+            raise _AlreadyStored(name)
+        return name
+
+    def _save(self, name, content):
+        digest, size = self.hash_content(content)
+        name = self.hashed_name(name, digest)
+
+        if not self.exists(name):
+            content.seek(0)
+            self._writing.name = name
+            try:
+                name = super()._save(name, content)
+            except _AlreadyStored:
+                pass
+            finally:
+                self._writing.name = None
+
+        self.record_blob(name, digest, size)
+        return name
+
+    def record_blob(self, name, digest, size):
+        from .models import StoredBlob
+        StoredBlob.objects.get_or_create(name=name, defaults={'sha256': digest, 'size': size})
+
+
+class HashedFileSystemStorage(ContentAddressedMixin, FileSystemStorage):
+    """Almacenamiento local (desarrollo) con nombres por contenido."""
+
@@ -0,0 +1,13 @@
+"""Backend de DigitalOcean Spaces (importa boto3 al cargarse)."""
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from .storage import IMMUTABLE_CACHE_CONTROL, CachedUrlMixin, ContentAddressedMixin
+
+
+class PublicMediaStorage(CachedUrlMixin, ContentAddressedMixin, S3Boto3Storage):
+    """DigitalOcean Spaces con objetos public-read e inmutables."""
+
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        # Un nombre por hash nunca cambia de contenido: caché del CDN sin expiración
+        self.object_parameters = {'CacheControl': IMMUTABLE_CACHE_CONTROL, **self.object_parameters}
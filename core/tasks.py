@@ -0,0 +1,10 @@
+from task_queue.queue import task
+
+from .models import Profile
+
+
+@task(name='core.create_profile')
+def create_profile(user_id):
+    # El registro crea el perfil en la propia petición; la tarea sigue
+    # registrada para las que quedaron encoladas antes de ese cambio
+    Profile.objects.get_or_create(user_id=user_id)
@@ -1,3 +1,79 @@
-from django.test import TestCase
+import io
+import pickle
+import shutil
+import tempfile
 
-# Create your tests here.
+from PIL import Image
+from django.core.cache import caches
+from django.core.files.images import ImageFile
+from django.test import SimpleTestCase, override_settings
+
+from .cache import has_atomic_ops
+from .models import Profile
+
+CACHE_DIR = tempfile.mkdtemp()
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'core.cache.TieredCache',
+        'OPTIONS': {'L1': 'local', 'L2': 'shared', 'L1_TIMEOUT': 5},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'core-tests',
+    },
+})
+class TieredCacheTests(SimpleTestCase):
+    def tearDown(self):
+        caches['default'].clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    def test_file_cache_is_not_atomic(self):
+        self.assertFalse(has_atomic_ops('shared'))
+
+    def test_incr_keeps_key_without_expiry(self):
+        cache = caches['default']
+        cache.set('counter', 1, None)
+        self.assertEqual(cache.incr('counter'), 2)
+        # BaseCache.incr lo reescribiría con el TTL por defecto de 300 s
+        self.assertIsNone(stored_expiry(caches['shared'], 'counter'))
+        self.assertEqual(cache.get('counter'), 2)
+
+    def test_incr_missing_key_raises(self):
+        with self.assertRaises(ValueError):
+            caches['default'].incr('missing')
+
+
+def image_file(width, height):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height)).save(buffer, 'PNG')
+    buffer.seek(0)
+    return ImageFile(buffer, name=f'{width}x{height}.png')
+
+
+class StoredDimensionsImageFieldTests(SimpleTestCase):
+    def test_replacing_the_file_measures_the_new_one(self):
+        # Fila guardada con una imagen de 100x50 a la que se le asigna otra
+        profile = Profile(profile_image='profile/old.png', profile_image_width=100, profile_image_height=50)
+        profile.profile_image = image_file(300, 200)
+        self.assertEqual((profile.profile_image_width, profile.profile_image_height), (300, 200))
+        self.assertEqual((profile.profile_image.width, profile.profile_image.height), (300, 200))
+
+    def test_stored_dimensions_are_used_without_opening_the_file(self):
+        profile = Profile(profile_image='profile/missing.png', profile_image_width=640, profile_image_height=480)
+        self.assertEqual((profile.profile_image.width, profile.profile_image.height), (640, 480))
+
+
+def stored_expiry(cache, key):
+    """Expiración que FileBasedCache guarda al inicio del archivo."""
+    with open(cache._key_to_file(key), 'rb') as fh:
+        return pickle.load(fh)
@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     path('', views.home, name='home'),
     path('about/', views.about, name='about'),
+    path('fragments/', views.user_fragments, name='user_fragments'),
     path('profile/', views.ProfileDetailView.as_view(), name='profile_detail'),
     path('profile/edit/', views.ProfileUpdateView.as_view(), name='profile_update'),
     path('experience/create/', views.experience_create, name='experience_create'),
@@ -12,4 +13,6 @@ urlpatterns = [
     path('certification/create/', views.certification_create, name='certification_create'),
     path('certification/<int:pk>/edit/', views.certification_update, name='certification_update'),
     path('certification/<int:pk>/delete/', views.certification_delete, name='certification_delete'),
+    path('profiling/', views.profiling_list, name='profiling_list'),
+    path('profiling/<str:name>/', views.profiling_download, name='profiling_download'),
 ] 
\ No newline at end of file
@@ -1,23 +1,44 @@
+from urllib.parse import urlsplit
+
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
+from django.core.cache import cache
 from django.views.generic import DetailView, UpdateView
 from django.urls import reverse_lazy
 from django.contrib.auth.models import User
-from django.http import Http404
+from django.http import FileResponse, Http404, JsonResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.views.decorators.cache import never_cache
+from django.conf import settings
 from .models import Profile, Experience, Certification, Skill, UserSkill
 from .forms import ProfileForm, ExperienceForm, CertificationForm
+from .profiling import list_profiles, profile_path
+from .public_shell import is_public_shell, public_shell
+
+# Proyectos por petición a user_fragments
+FRAGMENT_PROJECTS_LIMIT = 100
 
+@public_shell
 def home(request):
     """Vista principal del portafolio"""
-    from portfolio_projects.models import Project, Category
+    from portfolio_projects.models import Project, ProjectCard, Category
+    from portfolio_projects.trending import trending_projects
+    from portfolio_projects.votes import annotate_user_votes
     
+    featured_projects = ProjectCard.objects.filter(is_featured=True)[:6]
     context = {
-        'featured_projects': Project.objects.filter(is_featured=True)[:6],
+        'featured_projects': featured_projects,
+        'trending_projects': trending_projects(settings.TRENDING_HOME_LIMIT),
         'categories': Category.objects.all(),
         'total_projects': Project.objects.count(),
     }
+    # En el shell público los votos del usuario llegan con user_fragments
+    if not is_public_shell(request):
+        context['user_votes'] = annotate_user_votes(request.user, featured_projects)
     return render(request, 'core/home.html', context)
 
 def about(request):
@@ -185,3 +206,59 @@ def certification_delete(request, pk):
         return redirect('about')
     
     return render(request, 'core/certification_confirm_delete.html', {'certification': certification})
+
+@staff_member_required
+def profiling_list(request):
+    """Perfiles de peticiones lentas guardados por core.profiling"""
+    context = {
+        'profiles': list_profiles(),
+        'profiler_enabled': settings.PROFILER_ENABLED,
+        'threshold_ms': settings.PROFILER_THRESHOLD_MS,
+        'sample_rate': settings.PROFILER_SAMPLE_RATE * 100,
+    }
+    return render(request, 'core/profiling.html', context)
+
+@staff_member_required
+def profiling_download(request, name):
+    path = profile_path(name)
+    if path is None:
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name, content_type='text/plain; charset=utf-8')
+
+@never_cache
+def user_fragments(request):
+    """
+    Partes de la página que dependen del usuario, para hidratar el shell
+    público (ver core.public_shell). ``?projects=1,2`` pide los votos del
+    usuario en esos proyectos y ``?view=<id>&referrer=<url>`` registra la
+    visita al detalle de un proyecto.
+    """
+    from analytics.events import record_event
+    from portfolio_projects.votes import user_votes
+    
+    user = request.user
+    role = 'superuser' if user.is_superuser else 'authenticated' if user.is_authenticated else 'anonymous'
+    # La barra de navegación solo depende del rol: una entrada por rol
+    nav = cache.get_or_set(f'fragments:nav:{role}', lambda: render_to_string('_user_nav.html', request=request))
+    
+    stored_messages = messages.get_messages(request)
+    data = {
+        'authenticated': user.is_authenticated,
+        'superuser': user.is_superuser,
+        'nav': nav,
+        # Renderizar los mensajes los consume, igual que en una página normal
+        'messages': render_to_string('_messages.html', {'messages': stored_messages}, request) if stored_messages else '',
+        'csrf_token': get_token(request) if user.is_authenticated else '',
+        'votes': {},
+    }
+    
+    project_ids = [int(value) for value in request.GET.get('projects', '').split(',') if value.isdigit()]
+    if project_ids and user.is_authenticated:
+        data['votes'] = user_votes(user, project_ids[:FRAGMENT_PROJECTS_LIMIT])
+    
+    viewed = request.GET.get('view', '')
+    if viewed.isdigit():
+        referrer = urlsplit(request.GET.get('referrer', ''))
+        record_event('view', int(viewed), referrer=referrer.hostname or 'direct')
+    
+    return JsonResponse(data)
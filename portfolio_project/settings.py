@@ -1,13 +1,15 @@
 from pathlib import Path
 import os
-import dj_database_url
-from dotenv import load_dotenv
-
-load_dotenv()
 
 # --- Rutas base ---
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# En producción las variables llegan por entorno: dotenv solo se importa si hay .env
+if (BASE_DIR / ".env").exists():
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / ".env")
+
 # --- Seguridad / entorno ---
 SECRET_KEY = 'django-insecure-*q(juvh&o%giq7*4rns!+hCopy-Item)n_i-^3yg-5ej7_&1s2rlz4m'
 DEBUG = False
@@ -28,8 +30,8 @@ INSTALLED_APPS = [
     "portfolio_projects",
     "auth_users",
     "core",
-    # Storage S3 compatible
-    "storages",
+    "analytics",
+    "task_queue",
 ]
 
 # --- Middleware ---
@@ -39,9 +41,10 @@ MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.CachedAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.PreloadLinkMiddleware",
 ]
 
 ROOT_URLCONF = "portfolio_project.urls"
@@ -64,6 +67,24 @@ TEMPLATES = [
     },
 ]
 
+# Plantillas públicas (inicio, listado y detalle de proyectos) en Jinja2. Con
+# el interruptor activo se buscan primero en jinja2/ y el resto sigue en
+# templates/. Requiere el paquete Jinja2; ver core.jinja2_env y
+# "manage.py bench_templates".
+USE_JINJA2_TEMPLATES = os.getenv("USE_JINJA2_TEMPLATES", "False") == "True"
+JINJA2_TEMPLATES = {
+    "BACKEND": "django.template.backends.jinja2.Jinja2",
+    "NAME": "jinja2",
+    "DIRS": [BASE_DIR / "jinja2"],
+    "APP_DIRS": False,
+    "OPTIONS": {
+        "environment": "core.jinja2_env.environment",
+        "context_processors": TEMPLATES[0]["OPTIONS"]["context_processors"],
+    },
+}
+if USE_JINJA2_TEMPLATES:
+    TEMPLATES.insert(0, JINJA2_TEMPLATES)
+
 # --- Base de datos ---
 if DEBUG:
     DATABASES = {
@@ -75,11 +96,13 @@ if DEBUG:
 else:
     DATABASE_URL = os.getenv("DATABASE_URL")
     if DATABASE_URL:
+        import dj_database_url
+
         DATABASES = {
             "default": dj_database_url.config(
                 default=DATABASE_URL,
                 conn_max_age=600,
-                ssl_require=True,
+                ssl_require=not DATABASE_URL.startswith("sqlite"),
             )
         }
     else:
@@ -90,6 +113,102 @@ else:
             }
         }
 
+# Réplicas de solo lectura (URLs separadas por comas). Con réplicas, las
+# lecturas de peticiones GET/HEAD van a una réplica y todo lo demás al
+# primario; quien acaba de escribir queda fijado al primario durante
+# REPLICA_PIN_SECONDS (ver core.routers). Para probarlo en local basta una
+# copia de db.sqlite3: DATABASE_REPLICA_URLS=sqlite:///ruta/replica.sqlite3
+DATABASE_REPLICA_URLS = [url for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "15"))
+# Rutas que siempre leen del primario
+REPLICA_PRIMARY_PATHS = ["/admin/"]
+
+if DATABASE_REPLICA_URLS:
+    import dj_database_url
+
+    for number, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+        url = url.strip()
+        DATABASES[f"replica_{number}"] = {
+            **dj_database_url.parse(url, conn_max_age=600, ssl_require=not url.startswith("sqlite")),
+            # En los tests la réplica es la misma base que el primario
+            "TEST": {"MIRROR": "default"},
+        }
+    DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.contrib.sessions.middleware.SessionMiddleware"),
+        "core.middleware.ReplicaRoutingMiddleware",
+    )
+
+# --- Perfilador de peticiones lentas (core.profiling) ---
+# Guarda en PROFILER_DIR la pila muestreada (formato collapsed, para
+# flamegraphs) de las peticiones que tardan más de PROFILER_THRESHOLD_MS y de
+# una fracción PROFILER_SAMPLE_RATE de las demás; se consultan en /profiling/
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "False") == "True"
+PROFILER_DIR = Path(os.getenv("PROFILER_DIR", BASE_DIR / "profiles"))
+PROFILER_THRESHOLD_MS = int(os.getenv("PROFILER_THRESHOLD_MS", "500"))
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0"))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+PROFILER_MAX_FILES = int(os.getenv("PROFILER_MAX_FILES", "200"))
+
+if PROFILER_ENABLED:
+    MIDDLEWARE.insert(0, "core.profiling.SamplingProfilerMiddleware")
+
+# --- Memoria por worker (core.memory) ---
+# RSS máximo y crecimiento por vista, publicados en la caché compartida cada
+# MEMORY_PUBLISH_SECONDS; ver manage.py memory_report. Con
+# MEMORY_RECYCLE_RSS_MB > 0 el worker de gunicorn que lo supera se recicla.
+MEMORY_WATERMARKS_ENABLED = os.getenv("MEMORY_WATERMARKS_ENABLED", "False") == "True"
+MEMORY_PUBLISH_SECONDS = int(os.getenv("MEMORY_PUBLISH_SECONDS", "10"))
+MEMORY_RECYCLE_RSS_MB = int(os.getenv("MEMORY_RECYCLE_RSS_MB", "0"))
+# Sitios de asignación de tracemalloc que publica cada worker
+MEMORY_TOP_SITES = int(os.getenv("MEMORY_TOP_SITES", "15"))
+
+if MEMORY_WATERMARKS_ENABLED:
+    MIDDLEWARE.insert(0, "core.memory.MemoryWatermarkMiddleware")
+
+# --- Caché ---
+# "default" es una caché en dos niveles (core.cache.TieredCache): L1 en memoria
+# del proceso con TTL corto delante de "shared", el nivel compartido entre
+# workers (Redis si hay REDIS_URL; si no, caché en archivos como sustituto local).
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_DIR = os.getenv("CACHE_DIR", str(BASE_DIR / ".cache"))
+
+if REDIS_URL:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_DIR,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": "core.cache.TieredCache",
+        "OPTIONS": {
+            "L1": "local",
+            "L2": "shared",
+            "L1_TIMEOUT": int(os.getenv("CACHE_L1_TIMEOUT", "5")),
+        },
+    },
+    "shared": SHARED_CACHE,
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "portfolio-local",
+    },
+}
+
+# --- Sesiones ---
+# Sesión servida desde caché con escritura directa a la base de datos
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "shared"
+# Los mensajes viajan en cookie para no generar UPDATEs de la sesión
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+USER_CACHE_TIMEOUT = int(os.getenv("USER_CACHE_TIMEOUT", "3600"))
+
 # --- Password validators ---
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -113,6 +232,21 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 # --- Media por defecto (si no hay Spaces) ---
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Los archivos se guardan por hash de contenido (ver core.storage)
+DEFAULT_FILE_STORAGE = "core.storage.HashedFileSystemStorage"
+
+# --- Preload / Early Hints (core.middleware.PreloadLinkMiddleware) ---
+# Recursos de base.html anunciados en la cabecera Link de cada página HTML;
+# las rutas relativas se resuelven con {% static %}
+PRELOAD_LINKS = [
+    ("https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css", "style"),
+    ("https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css", "style"),
+    ("https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap", "style"),
+    ("css/style.css", "style"),
+    ("https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js", "script"),
+    ("js/main.js", "script"),
+]
+PRECONNECT_ORIGINS = ["https://fonts.gstatic.com", "https://cdnjs.cloudflare.com"]
 
 # --- DigitalOcean Spaces ---
 AWS_ACCESS_KEY_ID = os.getenv("DO_SPACES_KEY")
@@ -130,7 +264,10 @@ AWS_QUERYSTRING_AUTH = False
 AWS_S3_FILE_OVERWRITE = False
 
 if all([AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_STORAGE_BUCKET_NAME, AWS_S3_REGION_NAME]):
-    DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+    # Storage S3 compatible: boto3 se importa recién al primer acceso a media
+    # (default_storage es perezoso), nunca en la ruta de almacenamiento local
+    INSTALLED_APPS.append("storages")
+    DEFAULT_FILE_STORAGE = "core.storage_s3.PublicMediaStorage"
     MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/"
 
 # --- HTTPS detrás de proxy (Railway) ---
@@ -138,4 +275,58 @@ SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 SESSION_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SECURE = not DEBUG
 
+# --- Analítica (eventos por lotes en la tabla de staging PendingEvent) ---
+ANALYTICS_ENABLED = os.getenv("ANALYTICS_ENABLED", "True") == "True"
+ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "100"))
+ANALYTICS_FLUSH_INTERVAL = int(os.getenv("ANALYTICS_FLUSH_INTERVAL", "5"))
+
+# Dominio público para las URLs absolutas de sitemap.xml y feed.atom; si está
+# vacío se usa el de cada petición (ver portfolio_projects.feeds)
+SITE_URL = os.getenv("SITE_URL", "")
+
+# Segundos que se cachea el contenido del detalle de un proyecto
+PROJECT_DETAIL_CACHE_TIMEOUT = int(os.getenv("PROJECT_DETAIL_CACHE_TIMEOUT", "300"))
+
+# Inicio, listado y detalle como shell idéntico para todos, cacheable en el
+# CDN durante PUBLIC_SHELL_CACHE_SECONDS; lo propio de cada usuario llega
+# después desde /fragments/ (ver core.public_shell)
+PUBLIC_SHELL_ENABLED = os.getenv("PUBLIC_SHELL_ENABLED", "False") == "True"
+PUBLIC_SHELL_CACHE_SECONDS = int(os.getenv("PUBLIC_SHELL_CACHE_SECONDS", "60"))
+
+# --- Tendencias ---
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "48"))
+TRENDING_HOME_LIMIT = int(os.getenv("TRENDING_HOME_LIMIT", "6"))
+TRENDING_WEIGHTS = {"view": 1.0, "vote": 3.0, "comment": 5.0}
+
+# --- Cola de tareas (manage.py run_worker) ---
+# Con TASKS_EAGER=True las tareas se ejecutan en línea (útil sin worker en desarrollo)
+TASKS_EAGER = os.getenv("TASKS_EAGER", "False") == "True"
+TASKS_RETRY_BASE_SECONDS = 10
+TASKS_RETRY_MAX_SECONDS = 3600
+TASKS_LOCK_TIMEOUT_SECONDS = 600
+# Tarea registrada -> intervalo en segundos
+PERIODIC_TASKS = {
+    "analytics.compact": 60,
+    "portfolio_projects.flush_votes": 60,
+    "portfolio_projects.decay_trending": 3600,
+    "task_queue.purge_finished": 86400,
+}
+
+# --- Rate limiting (token bucket en caché) ---
+RATELIMIT_ENABLE = os.getenv("RATELIMIT_ENABLE", "True") == "True"
+RATELIMIT_USE_FORWARDED_FOR = os.getenv("RATELIMIT_USE_FORWARDED_FOR", "True") == "True"
+RATELIMITS = {
+    "vote": {
+        "user": os.getenv("RATELIMIT_VOTE_USER", "30/m"),
+        "ip": os.getenv("RATELIMIT_VOTE_IP", "120/m"),
+    },
+    "comment": {
+        "user": os.getenv("RATELIMIT_COMMENT_USER", "5/m"),
+        "ip": os.getenv("RATELIMIT_COMMENT_IP", "20/m"),
+    },
+}
+# Segundos durante los cuales los cambios de voto de un usuario se agrupan
+# (solo con Redis/memcached como caché compartida; si no, cada voto se escribe)
+VOTE_COALESCE_WINDOW = int(os.getenv("VOTE_COALESCE_WINDOW", "10"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -19,8 +19,13 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from portfolio_projects import views as project_views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('sitemap.xml', project_views.sitemap, name='sitemap'),
+    path('sitemap-<str:section>.xml', project_views.sitemap_section, name='sitemap_section'),
+    path('feed.atom', project_views.project_feed, name='project_feed'),
     path('', include('core.urls')),
     path('projects/', include('portfolio_projects.urls')),
     path('auth/', include('auth_users.urls')),
@@ -10,9 +10,10 @@ class CategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Technology)
 class TechnologyAdmin(admin.ModelAdmin):
-    list_display = ['name', 'icon']
+    list_display = ['name', 'slug', 'icon']
     search_fields = ['name']
     list_editable = ['icon']
+    prepopulated_fields = {'slug': ('name',)}
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PortfolioProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolio_projects'
+
+    def ready(self):
+        from . import signals  # noqa: F401
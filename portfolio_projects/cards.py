@@ -0,0 +1,65 @@
+"""
+Mantenimiento del modelo de lectura ``ProjectCard``.
+
+Las señales de ``signals.py`` llaman a estas funciones dentro de la
+transacción del cambio: si el guardado se revierte, la tarjeta también.
+"""
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Project, ProjectCard, ProjectImage, Vote
+
+CARD_TECHNOLOGIES = 3
+
+
+def card_values(project):
+    """Campos de la tarjeta de ``project`` calculados desde las tablas normalizadas."""
+    image = project.featured_image.name if project.featured_image else ''
+    if not image:
+        image = (
+            ProjectImage.objects.filter(project=project, is_cover=True)
+            .values_list('image', flat=True)
+            .first()
+        ) or ''
+
+    technologies = list(project.technologies.order_by('name').values_list('name', flat=True))
+    votes = Vote.objects.filter(project=project).aggregate(
+        likes=Count('pk', filter=Q(vote_type='like')),
+        dislikes=Count('pk', filter=Q(vote_type='dislike')),
+    )
+    return {
+        'slug': project.slug,
+        'title': project.title,
+        'description': project.description,
+        'created_at': project.created_at,
+        'is_featured': project.is_featured,
+        'image': image,
+        'categories': list(project.categories.order_by('name').values('name', 'slug')),
+        'technologies': technologies[:CARD_TECHNOLOGIES],
+        'technology_count': len(technologies),
+        'likes': votes['likes'],
+        'dislikes': votes['dislikes'],
+    }
+
+
+def rebuild_cards(project_ids):
+    """Reconstruye las tarjetas de los proyectos indicados."""
+    with transaction.atomic():
+        for project in Project.objects.filter(pk__in=set(project_ids)):
+            ProjectCard.objects.update_or_create(project=project, defaults=card_values(project))
+
+
+def refresh_card_votes(project_id):
+    """Solo recalcula likes/dislikes: un voto no cambia nada más de la tarjeta."""
+    votes = Vote.objects.filter(project_id=project_id).aggregate(
+        likes=Count('pk', filter=Q(vote_type='like')),
+        dislikes=Count('pk', filter=Q(vote_type='dislike')),
+    )
+    if not ProjectCard.objects.filter(pk=project_id).update(**votes):
+        rebuild_cards([project_id])
+
+
+def rebuild_all_cards():
+    ids = list(Project.objects.values_list('pk', flat=True))
+    rebuild_cards(ids)
+    return len(ids)
@@ -0,0 +1,165 @@
+"""
+Exportación masiva de proyectos, votos y comentarios en CSV o NDJSON.
+
+Las filas se recorren con ``.iterator(chunk_size=EXPORT_CHUNK_SIZE)``: el
+cursor del servidor entrega bloques de filas y ningún paso materializa la
+tabla completa, así que la memoria no depende del número de filas. Con
+``since`` solo se exportan filas con ``created_at >= since``; el orden es
+``(created_at, id)`` para que una exportación incremental pueda continuar
+desde el último ``created_at`` recibido (la fila límite se repite, no se
+pierde).
+"""
+import csv
+import json
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Project, Vote, Comment
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def _timestamp(value):
+    return value.isoformat() if value else None
+
+
+def _project_queryset():
+    # prefetch_related con iterator(chunk_size) consulta las relaciones por bloque
+    return Project.objects.only(
+        'id', 'slug', 'title', 'description', 'github_url', 'live_url',
+        'is_featured', 'created_at', 'updated_at',
+    ).prefetch_related('categories', 'technologies')
+
+
+def _project_row(project):
+    return {
+        'id': project.pk,
+        'slug': project.slug,
+        'title': project.title,
+        'description': project.description,
+        'github_url': project.github_url or '',
+        'live_url': project.live_url or '',
+        'categories': '|'.join(category.slug for category in project.categories.all()),
+        'technologies': '|'.join(technology.slug for technology in project.technologies.all()),
+        'is_featured': project.is_featured,
+        'created_at': _timestamp(project.created_at),
+        'updated_at': _timestamp(project.updated_at),
+    }
+
+
+def _vote_queryset():
+    return Vote.objects.select_related('project', 'user').only(
+        'id', 'vote_type', 'created_at', 'project', 'project__slug', 'user', 'user__username',
+    )
+
+
+def _vote_row(vote):
+    return {
+        'id': vote.pk,
+        'project_id': vote.project_id,
+        'project_slug': vote.project.slug,
+        'user_id': vote.user_id,
+        'username': vote.user.username,
+        'vote_type': vote.vote_type,
+        'created_at': _timestamp(vote.created_at),
+    }
+
+
+def _comment_queryset():
+    return Comment.objects.select_related('project', 'user').only(
+        'id', 'content', 'is_approved', 'created_at', 'updated_at',
+        'project', 'project__slug', 'user', 'user__username',
+    )
+
+
+def _comment_row(comment):
+    return {
+        'id': comment.pk,
+        'project_id': comment.project_id,
+        'project_slug': comment.project.slug,
+        'user_id': comment.user_id,
+        'username': comment.user.username,
+        'content': comment.content,
+        'is_approved': comment.is_approved,
+        'created_at': _timestamp(comment.created_at),
+        'updated_at': _timestamp(comment.updated_at),
+    }
+
+
+# conjunto -> (consulta, fila, columnas)
+EXPORTS = {
+    'projects': (_project_queryset, _project_row, (
+        'id', 'slug', 'title', 'description', 'github_url', 'live_url',
+        'categories', 'technologies', 'is_featured', 'created_at', 'updated_at',
+    )),
+    'votes': (_vote_queryset, _vote_row, (
+        'id', 'project_id', 'project_slug', 'user_id', 'username', 'vote_type', 'created_at',
+    )),
+    'comments': (_comment_queryset, _comment_row, (
+        'id', 'project_id', 'project_slug', 'user_id', 'username', 'content',
+        'is_approved', 'created_at', 'updated_at',
+    )),
+}
+
+
+def parse_since(value):
+    """Fecha o fecha y hora ISO 8601; las fechas sin zona usan la zona actual."""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Fecha no válida: {value}')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_rows(dataset, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Genera las filas (diccionarios) de un conjunto sin cargarlo entero."""
+    queryset_factory, to_row, _ = EXPORTS[dataset]
+    queryset = queryset_factory()
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    for instance in queryset.order_by('created_at', 'pk').iterator(chunk_size=chunk_size):
+        yield to_row(instance)
+
+
+class _Echo:
+    """Pseudo-buffer: ``csv.writer`` devuelve la línea en vez de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(dataset, rows):
+    columns = EXPORTS[dataset][2]
+    writer = csv.DictWriter(_Echo(), fieldnames=columns)
+    yield writer.writerow(dict(zip(columns, columns)))
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(dataset, rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def export_lines(dataset, export_format, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Líneas de texto listas para escribir o para un ``StreamingHttpResponse``."""
+    if dataset not in EXPORTS:
+        raise ValueError(f'Conjunto desconocido: {dataset}')
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Formato desconocido: {export_format}')
+    rows = export_rows(dataset, since, chunk_size)
+    if export_format == 'csv':
+        return csv_lines(dataset, rows)
+    return ndjson_lines(dataset, rows)
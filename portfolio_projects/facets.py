@@ -0,0 +1,121 @@
+"""
+Navegación por facetas del listado de proyectos.
+
+Los filtros (categoría, tecnología y búsqueda) se combinan entre sí y cada
+valor de faceta muestra cuántos proyectos obtendría el usuario al elegirlo.
+Los conteos de cada dimensión se calculan con una única consulta agregada
+agrupada y se guardan en caché por combinación de filtros.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils.text import slugify
+
+from core.routers import replica_reads
+from .models import Project, Category, Technology
+
+FACET_CACHE_TIMEOUT = 60 * 15
+FACET_GENERATION_KEY = 'facets:generation'
+
+
+class ProjectFilters:
+    """Filtros normalizados leídos desde el querystring."""
+
+    def __init__(self, category='', technology='', search=''):
+        self.category = (category or '').strip()
+        # Se aceptan tanto slugs como nombres antiguos (?technology=Power BI)
+        self.technology = slugify(technology or '')
+        self.search = (search or '').strip()
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(
+            category=request.GET.get('category'),
+            technology=request.GET.get('technology'),
+            search=request.GET.get('search'),
+        )
+
+    def as_dict(self):
+        return {
+            'category': self.category,
+            'technology': self.technology,
+            'search': self.search,
+        }
+
+    def apply(self, queryset, exclude=None):
+        """Aplica los filtros activos, opcionalmente omitiendo una dimensión."""
+        if self.category and exclude != 'category':
+            queryset = queryset.filter(categories__slug=self.category)
+
+        if self.technology and exclude != 'technology':
+            queryset = queryset.filter(technologies__slug=self.technology)
+
+        if self.search:
+            queryset = queryset.filter(
+                Q(title__icontains=self.search) |
+                Q(description__icontains=self.search) |
+                Q(content__icontains=self.search) |
+                Q(technologies__name__icontains=self.search)
+            ).distinct()
+
+        return queryset
+
+
+def _facet_generation():
+    generation = cache.get(FACET_GENERATION_KEY)
+    if generation is None:
+        # Una generación nueva y no 1: si la clave se pierde (expulsión de
+        # la caché) no vuelven a servirse conteos de una generación vieja
+        generation = time.time_ns()
+        if not cache.add(FACET_GENERATION_KEY, generation, None):
+            generation = cache.get(FACET_GENERATION_KEY, generation)
+    return generation
+
+
+def invalidate_facets():
+    """
+    Invalida todos los conteos cacheados cambiando la generación. Es un
+    ``set`` sin expiración y no un ``incr``, que en la caché en archivos no
+    es atómico y reinicia el TTL; los demás workers la ven al expirar su L1.
+    """
+    cache.set(FACET_GENERATION_KEY, time.time_ns(), None)
+
+
+def _cache_key(filters):
+    raw = '|'.join(f'{key}={value}' for key, value in sorted(filters.as_dict().items()))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'facets:{_facet_generation()}:{digest}'
+
+
+def _count_facet(model, filters, dimension):
+    """
+    Conteo de una dimensión: un solo GROUP BY sobre la tabla de la faceta.
+
+    El conjunto base ignora el filtro de la propia dimensión, de modo que el
+    conteo de cada valor es el número de resultados al seleccionarlo.
+    """
+    matching = filters.apply(Project.objects.all(), exclude=dimension).values('pk')
+    rows = (
+        model.objects
+        .annotate(hits=Count('projects', filter=Q(projects__in=matching)))
+        .values('slug', 'name', 'hits')
+        .order_by('name')
+    )
+    return list(rows)
+
+
+def facet_counts(filters):
+    """Devuelve los conteos por categoría y tecnología para los filtros dados."""
+    key = _cache_key(filters)
+    facets = cache.get(key)
+    if facets is None:
+        # Va a caché: se cuenta en el primario (ver core.cache)
+        with replica_reads(False):
+            facets = {
+                'categories': _count_facet(Category, filters, 'category'),
+                'technologies': _count_facet(Technology, filters, 'technology'),
+            }
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,254 @@
+"""
+sitemap.xml y feed Atom precalculados.
+
+Los documentos se generan fuera de la petición (tarea
+``portfolio_projects.publish_feeds``, encolada cuando cambian proyectos o
+categorías) y se guardan comprimidos con gzip en la caché compartida junto a
+su ETag. Los proyectos se reparten en secciones de ``SITEMAP_PAGE_SIZE``
+URLs ordenadas por id; cada sección tiene una huella calculada con
+``(id, slug, updated_at)`` de sus filas y solo se regenera si cambia.
+Mientras todas las URLs quepan en una sección, ``sitemap.xml`` es un único
+urlset; si no, es un índice que apunta a ``sitemap-<sección>.xml``.
+
+Los documentos se guardan por dominio base: con ``SITE_URL`` hay uno solo;
+sin él se usa el de cada petición y el worker refresca los
+``MAX_BASE_URLS`` dominios pedidos más recientemente, de modo que alternar
+entre dos hosts permitidos no regenera los documentos en cada petición.
+"""
+import gzip
+import hashlib
+import io
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from core.cache import shared_cache
+from core.routers import replica_reads
+from .models import Project, Category
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+SITEMAP_PAGE_SIZE = 5000
+FEED_ITEMS = 20
+DOCUMENT_KEY = 'published:{site}:{name}'
+SECTIONS_KEY = 'published:{site}:sections'
+BASE_URLS_KEY = 'published:base_urls'
+MAX_BASE_URLS = 5
+XML_CONTENT_TYPE = 'application/xml; charset=utf-8'
+ATOM_CONTENT_TYPE = 'application/atom+xml; charset=utf-8'
+
+
+def _fingerprint(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _site(base_url):
+    return hashlib.sha1(base_url.encode('utf-8')).hexdigest()[:12]
+
+
+def _document_key(base_url, name):
+    return DOCUMENT_KEY.format(site=_site(base_url), name=name)
+
+
+def _store(base_url, name, content, content_type, fingerprint, last_modified):
+    shared_cache().set(_document_key(base_url, name), {
+        'body': gzip.compress(content, mtime=0),
+        # Débil: la misma ETag identifica la versión comprimida y la plana
+        'etag': f'W/"{hashlib.sha1(content).hexdigest()}"',
+        'content_type': content_type,
+        'fingerprint': fingerprint,
+        'last_modified': last_modified,
+    }, None)
+
+
+def _stored_fingerprint(base_url, name):
+    document = shared_cache().get(_document_key(base_url, name))
+    return document['fingerprint'] if document else None
+
+
+def _lastmod(value):
+    return timezone.localtime(value).date().isoformat() if value else None
+
+
+def _urlset(entries):
+    output = io.BytesIO()
+    xml = SimplerXMLGenerator(output, 'utf-8')
+    xml.startDocument()
+    xml.startElement('urlset', {'xmlns': SITEMAP_NS})
+    for location, lastmod in entries:
+        xml.startElement('url', {})
+        xml.addQuickElement('loc', location)
+        if lastmod:
+            xml.addQuickElement('lastmod', _lastmod(lastmod))
+        xml.endElement('url')
+    xml.endElement('urlset')
+    xml.endDocument()
+    return output.getvalue()
+
+
+def _sitemap_index(base_url, sections):
+    output = io.BytesIO()
+    xml = SimplerXMLGenerator(output, 'utf-8')
+    xml.startDocument()
+    xml.startElement('sitemapindex', {'xmlns': SITEMAP_NS})
+    for name, lastmod in sections:
+        xml.startElement('sitemap', {})
+        xml.addQuickElement('loc', base_url + reverse('sitemap_section', kwargs={'section': name}))
+        if lastmod:
+            xml.addQuickElement('lastmod', _lastmod(lastmod))
+        xml.endElement('sitemap')
+    xml.endElement('sitemapindex')
+    xml.endDocument()
+    return output.getvalue()
+
+
+def page_entries(base_url):
+    """Páginas fijas y el listado filtrado por cada categoría."""
+    latest = Project.objects.aggregate(latest=Max('updated_at'))['latest']
+    entries = [
+        (base_url + reverse('home'), latest),
+        (base_url + reverse('about'), None),
+        (base_url + reverse('project_list'), latest),
+    ]
+    categories = Category.objects.annotate(latest=Max('projects__updated_at')).values_list('slug', 'latest')
+    for slug, category_latest in categories:
+        query = urlencode({'category': slug})
+        entries.append((f"{base_url}{reverse('project_list')}?{query}", category_latest))
+    return entries
+
+
+def project_chunks():
+    """Filas ``(id, slug, updated_at)`` de todos los proyectos, en secciones."""
+    rows = list(Project.objects.order_by('pk').values_list('pk', 'slug', 'updated_at'))
+    return [rows[start:start + SITEMAP_PAGE_SIZE] for start in range(0, len(rows), SITEMAP_PAGE_SIZE)] or [[]]
+
+
+def _project_entries(base_url, rows):
+    return [(base_url + reverse('project_detail', kwargs={'slug': slug}), updated) for _, slug, updated in rows]
+
+
+def _replace_sections(base_url, names):
+    # Borra las secciones que sobraron porque se eliminaron proyectos
+    key = SECTIONS_KEY.format(site=_site(base_url))
+    for stale in set(shared_cache().get(key) or []) - set(names):
+        shared_cache().delete(_document_key(base_url, stale))
+    shared_cache().set(key, names, None)
+
+
+def publish_sitemaps(base_url):
+    """Regenera las secciones que cambiaron. Devuelve los nombres regenerados."""
+    regenerated = []
+    pages = page_entries(base_url)
+    chunks = project_chunks()
+    now = timezone.now()
+
+    if len(pages) + sum(len(chunk) for chunk in chunks) <= SITEMAP_PAGE_SIZE:
+        fingerprint = _fingerprint(base_url, pages, chunks)
+        if _stored_fingerprint(base_url, 'sitemap') != fingerprint:
+            content = _urlset(pages + _project_entries(base_url, chunks[0]))
+            _store(base_url, 'sitemap', content, XML_CONTENT_TYPE, fingerprint, now)
+            regenerated.append('sitemap')
+        _replace_sections(base_url, [])
+        return regenerated
+
+    sections = [('pages', pages, max((lastmod for _, lastmod in pages if lastmod), default=None))]
+    for number, chunk in enumerate(chunks, start=1):
+        sections.append((f'projects-{number}', chunk, max(updated for _, _, updated in chunk)))
+
+    for name, rows, _ in sections:
+        fingerprint = _fingerprint(base_url, rows)
+        if _stored_fingerprint(base_url, name) != fingerprint:
+            entries = rows if name == 'pages' else _project_entries(base_url, rows)
+            _store(base_url, name, _urlset(entries), XML_CONTENT_TYPE, fingerprint, now)
+            regenerated.append(name)
+
+    _replace_sections(base_url, [name for name, _, _ in sections])
+
+    index = [(name, lastmod) for name, _, lastmod in sections]
+    fingerprint = _fingerprint(base_url, index)
+    if _stored_fingerprint(base_url, 'sitemap') != fingerprint:
+        _store(base_url, 'sitemap', _sitemap_index(base_url, index), XML_CONTENT_TYPE, fingerprint, now)
+        regenerated.append('sitemap')
+    return regenerated
+
+
+def publish_feed(base_url):
+    """Regenera el feed Atom si cambió alguno de los últimos proyectos."""
+    projects = list(
+        Project.objects.order_by('-created_at')
+        .prefetch_related('categories')[:FEED_ITEMS]
+    )
+    fingerprint = _fingerprint(
+        base_url,
+        [(p.pk, p.slug, p.updated_at, [c.name for c in p.categories.all()]) for p in projects],
+    )
+    if _stored_fingerprint(base_url, 'feed') == fingerprint:
+        return []
+
+    feed = Atom1Feed(
+        title='Proyectos - Portafolio de Analista de Datos',
+        link=base_url + reverse('project_list'),
+        description='Últimos proyectos publicados en el portafolio',
+        language=settings.LANGUAGE_CODE,
+        feed_url=base_url + reverse('project_feed'),
+    )
+    for project in projects:
+        link = base_url + project.get_absolute_url()
+        feed.add_item(
+            title=project.title,
+            link=link,
+            description=project.description,
+            unique_id=link,
+            pubdate=project.created_at,
+            updateddate=project.updated_at,
+            categories=[category.name for category in project.categories.all()],
+        )
+    content = feed.writeString('utf-8').encode('utf-8')
+    _store(base_url, 'feed', content, ATOM_CONTENT_TYPE, fingerprint, timezone.now())
+    return ['feed']
+
+
+def _remember_base_url(base_url):
+    """Anota el dominio como el más reciente; devuelve si ya se conocía."""
+    base_urls = shared_cache().get(BASE_URLS_KEY) or []
+    known = base_url in base_urls
+    if not base_urls or base_urls[0] != base_url:
+        base_urls = [base_url] + [url for url in base_urls if url != base_url]
+        shared_cache().set(BASE_URLS_KEY, base_urls[:MAX_BASE_URLS], None)
+    return known
+
+
+def publish_all(base_url=None):
+    """
+    Regenera lo que haya cambiado. Sin ``base_url`` se publica para
+    ``SITE_URL`` o, si no está definido, para los dominios pedidos más
+    recientemente.
+    """
+    if base_url:
+        base_urls = [base_url.rstrip('/')]
+    elif getattr(settings, 'SITE_URL', ''):
+        base_urls = [settings.SITE_URL.rstrip('/')]
+    else:
+        base_urls = shared_cache().get(BASE_URLS_KEY) or []
+
+    regenerated = []
+    for url in base_urls:
+        regenerated += publish_sitemaps(url) + publish_feed(url)
+    return regenerated
+
+
+def get_document(name, base_url):
+    """Documento publicado para ``base_url``; si falta se genera ahora."""
+    base_url = base_url.rstrip('/')
+    known = _remember_base_url(base_url)
+    document = shared_cache().get(_document_key(base_url, name))
+    # Un dominio que salió de la lista pudo quedarse sin refrescar
+    if document is None or not known:
+        with replica_reads(False):
+            publish_all(base_url)
+        document = shared_cache().get(_document_key(base_url, name))
+    return document
@@ -0,0 +1,193 @@
+"""
+Importación masiva de proyectos desde JSON, NDJSON o CSV.
+
+Cada registro admite ``title`` (obligatorio), ``slug``, ``description``,
+``content``, ``github_url``, ``live_url``, ``is_featured`` y las listas
+``categories`` y ``technologies`` (nombres; en CSV separados por ``|``).
+
+Todo ocurre en una transacción y en un número fijo de consultas por lote:
+categorías y tecnologías se resuelven por nombre y las que faltan se crean
+con ``bulk_create``; los slugs únicos se calculan en memoria contra los ya
+existentes; proyectos y ``ProjectCard`` se insertan con ``bulk_create``
+y las filas de las tablas intermedias con ``executemany``. Como nada de esto
+emite señales, al final se invalidan las facetas y se encolan el precalentado
+de cachés y la publicación del sitemap, igual que haría un guardado normal.
+"""
+import csv
+import json
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.utils.text import slugify
+
+from .cards import CARD_TECHNOLOGIES
+from .facets import invalidate_facets
+from .models import Project, ProjectCard, Category, Technology, unique_slug
+from .signals import schedule_cache_warming, schedule_feed_publishing
+
+IMPORT_BATCH_SIZE = 1000
+TRUE_VALUES = ('1', 'true', 'yes', 'si', 'sí', 'x')
+SLUG_MAX_LENGTH = Project._meta.get_field('slug').max_length
+TITLE_MAX_LENGTH = Project._meta.get_field('title').max_length
+
+
+def _names(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split('|')
+    # Sin duplicados y respetando el orden del archivo
+    return list(dict.fromkeys(name.strip() for name in value if name and name.strip()))
+
+
+def _flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in TRUE_VALUES
+
+
+def read_records(path, file_format=None):
+    """Genera los registros del archivo; el formato se deduce de la extensión."""
+    path = Path(path)
+    file_format = file_format or {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}.get(path.suffix, 'json')
+    with open(path, encoding='utf-8', newline='') as handle:
+        if file_format == 'csv':
+            yield from csv.DictReader(handle)
+        elif file_format == 'ndjson':
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            data = json.load(handle)
+            yield from data['projects'] if isinstance(data, dict) else data
+
+
+def _resolve_tags(model, names, batch_size):
+    """``({nombre: id}, creadas)``; crea con slug único las etiquetas que no existen."""
+    existing = {}
+    names = list(names)
+    for start in range(0, len(names), batch_size):
+        existing.update(model.objects.filter(name__in=names[start:start + batch_size]).values_list('name', 'pk'))
+    missing = [name for name in names if name not in existing]
+    if missing:
+        taken = set(model.objects.values_list('slug', flat=True))
+        slug_length = model._meta.get_field('slug').max_length
+        fallback = 'categoria' if model is Category else 'tecnologia'
+        model.objects.bulk_create(
+            [model(name=name, slug=unique_slug(slugify(name), taken, slug_length, fallback)) for name in missing],
+            batch_size=batch_size,
+        )
+        for start in range(0, len(missing), batch_size):
+            existing.update(model.objects.filter(name__in=missing[start:start + batch_size]).values_list('name', 'pk'))
+    return existing, len(missing)
+
+
+def _project_ids(projects, batch_size):
+    """PKs de los proyectos creados, aunque la base no los devuelva en el INSERT."""
+    if all(project.pk for project in projects):
+        return
+    by_slug = {project.slug: project for project in projects}
+    slugs = list(by_slug)
+    for start in range(0, len(slugs), batch_size):
+        for slug, pk in Project.objects.filter(slug__in=slugs[start:start + batch_size]).values_list('slug', 'pk'):
+            by_slug[slug].pk = pk
+
+
+def _insert_links(descriptor, links, batch_size):
+    """
+    Filas ``(project_id, tag_id)`` de una tabla intermedia con ``executemany``:
+    instanciar cientos de miles de modelos ``through`` para ``bulk_create``
+    cuesta más que la propia inserción.
+    """
+    through = descriptor.through._meta
+    field = descriptor.field
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}, {}) VALUES (%s, %s)'.format(
+        quote(through.db_table), quote(field.m2m_column_name()), quote(field.m2m_reverse_name()),
+    )
+    with connection.cursor() as cursor:
+        for start in range(0, len(links), batch_size):
+            cursor.executemany(sql, links[start:start + batch_size])
+
+
+def import_projects(records, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Importa los registros y devuelve un resumen con los proyectos, etiquetas
+    y relaciones creados. Un registro inválido revierte toda la importación.
+    """
+    rows = []
+    category_names, technology_names = {}, {}
+    for number, record in enumerate(records, start=1):
+        title = (record.get('title') or '').strip()
+        if not title:
+            raise ValueError(f'Registro {number}: falta el título')
+        if len(title) > TITLE_MAX_LENGTH:
+            raise ValueError(f'Registro {number}: el título supera {TITLE_MAX_LENGTH} caracteres')
+        categories = _names(record.get('categories'))
+        technologies = _names(record.get('technologies'))
+        category_names.update(dict.fromkeys(categories))
+        technology_names.update(dict.fromkeys(technologies))
+        rows.append((record, title, categories, technologies))
+
+    with transaction.atomic():
+        categories, created_categories = _resolve_tags(Category, category_names, batch_size)
+        technologies, created_technologies = _resolve_tags(Technology, technology_names, batch_size)
+        category_slugs = dict(Category.objects.filter(pk__in=categories.values()).values_list('pk', 'slug'))
+
+        taken = set(Project.objects.values_list('slug', flat=True))
+        projects = [
+            Project(
+                title=title,
+                slug=unique_slug(slugify(record.get('slug') or title), taken, SLUG_MAX_LENGTH, 'proyecto'),
+                description=record.get('description') or '',
+                content=record.get('content') or '',
+                github_url=record.get('github_url') or None,
+                live_url=record.get('live_url') or None,
+                is_featured=_flag(record.get('is_featured')),
+            )
+            for record, title, _, _ in rows
+        ]
+        Project.objects.bulk_create(projects, batch_size=batch_size)
+        _project_ids(projects, batch_size)
+
+        category_links = [
+            (project.pk, categories[name])
+            for project, (_, _, names, _) in zip(projects, rows) for name in names
+        ]
+        technology_links = [
+            (project.pk, technologies[name])
+            for project, (_, _, _, names) in zip(projects, rows) for name in names
+        ]
+        _insert_links(Project.categories, category_links, batch_size)
+        _insert_links(Project.technologies, technology_links, batch_size)
+
+        # Las tarjetas se arman con lo que ya está en memoria (sin imágenes ni votos)
+        ProjectCard.objects.bulk_create([
+            ProjectCard(
+                project_id=project.pk,
+                slug=project.slug,
+                title=project.title,
+                description=project.description,
+                created_at=project.created_at,
+                is_featured=project.is_featured,
+                categories=sorted(
+                    ({'name': name, 'slug': category_slugs[categories[name]]} for name in category_list),
+                    key=lambda category: category['name'],
+                ),
+                technologies=sorted(technology_list)[:CARD_TECHNOLOGIES],
+                technology_count=len(technology_list),
+            )
+            for project, (_, _, category_list, technology_list) in zip(projects, rows)
+        ], batch_size=batch_size)
+
+        invalidate_facets()
+        if projects:
+            schedule_cache_warming()
+            schedule_feed_publishing()
+
+    return {
+        'projects': len(projects),
+        'categories': created_categories,
+        'technologies': created_technologies,
+        'links': len(category_links) + len(technology_links),
+    }
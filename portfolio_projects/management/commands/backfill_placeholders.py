@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from portfolio_projects.models import ProjectImage
+from portfolio_projects.placeholders import update_placeholder
+from portfolio_projects.tasks import image_placeholder
+
+
+class Command(BaseCommand):
+    help = 'Genera los placeholders de las imágenes de proyectos que aún no lo tienen'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenera también los existentes')
+        parser.add_argument(
+            '--enqueue', action='store_true',
+            help='Encola una tarea por imagen para el worker en lugar de procesarlas aquí',
+        )
+
+    def handle(self, *args, **options):
+        queryset = ProjectImage.objects.exclude(image='')
+        if not options['force']:
+            queryset = queryset.filter(placeholder='')
+
+        updated = failed = 0
+        for pk in queryset.values_list('pk', flat=True).iterator():
+            if options['enqueue']:
+                image_placeholder.delay(pk)
+                updated += 1
+                continue
+            try:
+                if update_placeholder(pk, force=options['force']):
+                    updated += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f'ProjectImage #{pk}: {exc}')
+
+        action = 'encoladas' if options['enqueue'] else 'actualizadas'
+        self.stdout.write(self.style.SUCCESS(f'{updated} imágenes {action}, {failed} con error.'))
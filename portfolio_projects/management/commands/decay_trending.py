@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from portfolio_projects import trending
+
+
+class Command(BaseCommand):
+    help = 'Aplica el decaimiento a los puntajes de tendencia o los reconstruye desde la analítica'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recalcula todos los puntajes desde los agregados diarios',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Días de agregados a considerar al reconstruir (por defecto 30)',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            count = trending.rebuild(days=options['days'])
+            self.stdout.write(self.style.SUCCESS(f'{count} proyecto(s) recalculados.'))
+        else:
+            count = trending.decay_all()
+            self.stdout.write(self.style.SUCCESS(f'{count} puntaje(s) actualizados.'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_projects.exports import EXPORTS, EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_lines, parse_since
+
+
+class Command(BaseCommand):
+    help = (
+        'Exporta proyectos, votos o comentarios en CSV o NDJSON recorriendo la '
+        'tabla por bloques, sin cargarla en memoria'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORTS))
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--since', help='Solo filas con created_at >= esta fecha (ISO 8601)')
+        parser.add_argument('--output', '-o', help='Archivo de salida; por defecto la salida estándar')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Filas por bloque del cursor')
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_since(options['since'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        lines = export_lines(options['dataset'], options['export_format'], since, options['chunk_size'])
+        written = 0
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as handle:
+                for line in lines:
+                    handle.write(line)
+                    written += 1
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
+                written += 1
+
+        rows = written - 1 if options['export_format'] == 'csv' else written
+        # El resumen va a stderr para no mezclarse con la exportación en stdout
+        self.stderr.write(self.style.SUCCESS(f"{rows} fila(s) de {options['dataset']} exportadas."))
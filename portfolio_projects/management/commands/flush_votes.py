@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from portfolio_projects.votes import flush_pending_votes
+
+
+class Command(BaseCommand):
+    help = 'Persiste en la base de datos los votos agrupados que siguen pendientes en caché'
+
+    def handle(self, *args, **options):
+        written = flush_pending_votes()
+        self.stdout.write(self.style.SUCCESS(f'{written} voto(s) pendientes persistidos.'))
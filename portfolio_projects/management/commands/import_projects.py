@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_projects.imports import IMPORT_BATCH_SIZE, import_projects, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa proyectos desde JSON, NDJSON o CSV en una transacción: crea las '
+        'categorías y tecnologías que falten e inserta proyectos y relaciones por lotes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Archivo .json, .ndjson/.jsonl o .csv')
+        parser.add_argument(
+            '--format', dest='file_format', choices=('json', 'ndjson', 'csv'),
+            help='Formato del archivo; por defecto se deduce de la extensión',
+        )
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Filas por INSERT')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            summary = import_projects(
+                read_records(options['path'], options['file_format']), batch_size=options['batch_size']
+            )
+        except FileNotFoundError:
+            raise CommandError(f"No existe el archivo {options['path']}")
+        except (ValueError, KeyError) as exc:
+            raise CommandError(f'Importación cancelada: {exc}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['projects']} proyecto(s) importados en {time.monotonic() - started:.1f}s "
+            f"({summary['categories']} categoría(s) y {summary['technologies']} tecnología(s) nuevas, "
+            f"{summary['links']} relaciones)."
+        ))
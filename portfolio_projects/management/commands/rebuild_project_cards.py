@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from portfolio_projects.cards import rebuild_all_cards
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye la tabla ProjectCard desde los proyectos, tags, imágenes y votos'
+
+    def handle(self, *args, **options):
+        count = rebuild_all_cards()
+        self.stdout.write(self.style.SUCCESS(f'{count} tarjetas reconstruidas.'))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.23 on 2026-10-19 12:00
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_technology_slugs(apps, schema_editor):
+    Technology = apps.get_model('portfolio_projects', 'Technology')
+    used = set()
+    for technology in Technology.objects.order_by('pk'):
+        base = slugify(technology.name) or f'tech-{technology.pk}'
+        slug = base
+        suffix = 2
+        while slug in used:
+            slug = f'{base}-{suffix}'
+            suffix += 1
+        used.add(slug)
+        technology.slug = slug
+        technology.save(update_fields=['slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_projects', '0003_remove_project_category_project_categories'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='technology',
+            name='slug',
+            field=models.SlugField(default='', max_length=100),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_technology_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='technology',
+            name='slug',
+            field=models.SlugField(max_length=100, unique=True),
+        ),
+    ]
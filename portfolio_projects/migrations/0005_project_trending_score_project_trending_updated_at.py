@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-19 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_projects', '0004_technology_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='trending_score',
+            field=models.FloatField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='trending_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.23 on 2026-10-19 11:52
+
+import core.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_projects', '0005_project_trending_score_project_trending_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='featured_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='featured_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='featured_image',
+            field=core.fields.StoredDimensionsImageField(blank=True, height_field='featured_image_height', null=True, upload_to='projects/images/', width_field='featured_image_width'),
+        ),
+        migrations.AlterField(
+            model_name='projectimage',
+            name='image',
+            field=core.fields.StoredDimensionsImageField(height_field='height', upload_to='projects/images/', width_field='width'),
+        ),
+    ]
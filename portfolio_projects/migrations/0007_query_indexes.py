@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_projects', '0006_project_featured_image_height_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['project', 'is_approved', '-created_at'], name='comment_project_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at'], name='project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_featured', '-created_at'], name='project_featured_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectimage',
+            index=models.Index(fields=['project', 'order', 'created_at'], name='projectimage_project_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['project', 'vote_type'], name='vote_project_type_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_projects', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectimage',
+            name='placeholder',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.23 on 2026-10-19 16:40
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def populate_project_cards(apps, schema_editor):
+    # Misma lógica que portfolio_projects.cards.card_values, con modelos históricos
+    Project = apps.get_model('portfolio_projects', 'Project')
+    ProjectCard = apps.get_model('portfolio_projects', 'ProjectCard')
+    ProjectImage = apps.get_model('portfolio_projects', 'ProjectImage')
+    Vote = apps.get_model('portfolio_projects', 'Vote')
+
+    for project in Project.objects.all():
+        image = project.featured_image.name if project.featured_image else ''
+        if not image:
+            image = ProjectImage.objects.filter(project=project, is_cover=True).values_list('image', flat=True).first() or ''
+        technologies = list(project.technologies.order_by('name').values_list('name', flat=True))
+        votes = Vote.objects.filter(project=project).aggregate(
+            likes=Count('pk', filter=Q(vote_type='like')),
+            dislikes=Count('pk', filter=Q(vote_type='dislike')),
+        )
+        ProjectCard.objects.update_or_create(project=project, defaults={
+            'slug': project.slug,
+            'title': project.title,
+            'description': project.description,
+            'created_at': project.created_at,
+            'is_featured': project.is_featured,
+            'image': image,
+            'categories': list(project.categories.order_by('name').values('name', 'slug')),
+            'technologies': technologies[:3],
+            'technology_count': len(technologies),
+            'likes': votes['likes'],
+            'dislikes': votes['dislikes'],
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_projects', '0008_projectimage_placeholder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectCard',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='portfolio_projects.project')),
+                ('slug', models.SlugField(max_length=200)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('is_featured', models.BooleanField(default=False)),
+                ('image', models.CharField(blank=True, max_length=255)),
+                ('categories', models.JSONField(default=list)),
+                ('technologies', models.JSONField(default=list)),
+                ('technology_count', models.PositiveIntegerField(default=0)),
+                ('likes', models.PositiveIntegerField(default=0)),
+                ('dislikes', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at'], name='card_created_idx'), models.Index(fields=['is_featured', '-created_at'], name='card_featured_created_idx')],
+            },
+        ),
+        migrations.RunPython(populate_project_cards, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,37 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils.text import slugify
 from django.urls import reverse
+from django.db.models import Count, Q
 import uuid
+from core.fields import StoredDimensionsImageField
+
+
+def unique_slug(base, taken, max_length, fallback):
+    """
+    Primer slug libre entre ``base``, ``base-2``, ``base-3``... que no esté en
+    ``taken`` (se añade al conjunto). Si ``base`` queda vacío (p. ej. "C#"
+    o "++") se parte de ``fallback``.
+    """
+    base = base[:max_length] or fallback
+    slug, number = base, 2
+    while slug in taken:
+        suffix = f'-{number}'
+        slug = base[:max_length - len(suffix)] + suffix
+        number += 1
+    taken.add(slug)
+    return slug
+
+
+def assign_unique_slug(instance, source, fallback):
+    """Asigna a ``instance.slug`` un slug único derivado de ``source``."""
+    max_length = instance._meta.get_field('slug').max_length
+    base = slugify(source)[:max_length] or fallback
+    # Los slugs con sufijo comparten el prefijo salvo el recorte del final
+    taken = set(
+        type(instance)._default_manager.filter(slug__startswith=base[:max_length - 10])
+        .exclude(pk=instance.pk).values_list('slug', flat=True)
+    )
+    instance.slug = unique_slug(base, taken, max_length, fallback)
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -19,11 +49,12 @@ class Category(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
+            assign_unique_slug(self, self.name, 'categoria')
         super().save(*args, **kwargs)
 
 class Technology(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    slug = models.SlugField(max_length=100, unique=True)
     icon = models.CharField(max_length=50, blank=True)  # Para iconos de FontAwesome
     
     class Meta:
@@ -32,13 +63,23 @@ class Technology(models.Model):
     
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            assign_unique_slug(self, self.name, 'tecnologia')
+        super().save(*args, **kwargs)
 
 class Project(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True)
     description = models.TextField()
     content = models.TextField(help_text="Contenido completo del proyecto")
-    featured_image = models.ImageField(upload_to='projects/images/', blank=True, null=True)
+    featured_image = StoredDimensionsImageField(
+        upload_to='projects/images/', blank=True, null=True,
+        width_field='featured_image_width', height_field='featured_image_height'
+    )
+    featured_image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
     github_url = models.URLField(blank=True, null=True)
     live_url = models.URLField(blank=True, null=True)
     categories = models.ManyToManyField(Category, related_name='projects')
@@ -47,9 +88,15 @@ class Project(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_featured = models.BooleanField(default=False)
     views = models.PositiveIntegerField(default=0)
+    trending_score = models.FloatField(default=0, db_index=True, editable=False)
+    trending_updated_at = models.DateTimeField(blank=True, null=True, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='project_created_idx'),
+            models.Index(fields=['is_featured', '-created_at'], name='project_featured_created_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -67,10 +114,21 @@ class Project(models.Model):
     
     def get_dislikes_count(self):
         return self.votes.filter(vote_type='dislike').count()
+    
+    def get_vote_counts(self):
+        """Likes y dislikes en una sola consulta agregada"""
+        return self.votes.aggregate(
+            likes=Count('pk', filter=Q(vote_type='like')),
+            dislikes=Count('pk', filter=Q(vote_type='dislike')),
+        )
 
 class ProjectImage(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='images')
-    image = models.ImageField(upload_to='projects/images/')
+    image = StoredDimensionsImageField(upload_to='projects/images/', width_field='width', height_field='height')
+    width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    # Miniatura WebP en data URI que se muestra mientras carga la imagen real
+    placeholder = models.TextField(blank=True, editable=False)
     title = models.CharField(max_length=200, blank=True)
     description = models.TextField(blank=True)
     order = models.PositiveIntegerField(default=0)
@@ -79,9 +137,18 @@ class ProjectImage(models.Model):
     
     class Meta:
         ordering = ['order', 'created_at']
+        indexes = [
+            models.Index(fields=['project', 'order', 'created_at'], name='projectimage_project_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title or 'Imagen'} - {self.project.title}"
+    
+    def save(self, *args, **kwargs):
+        # Un archivo nuevo invalida el placeholder; se regenera en segundo plano
+        if self.image and not self.image._committed:
+            self.placeholder = ''
+        super().save(*args, **kwargs)
 
 class ProjectFile(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='files')
@@ -103,6 +170,9 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'is_approved', '-created_at'], name='comment_project_approved_idx'),
+        ]
     
     def __str__(self):
         return f'Comment by {self.user.username} on {self.project.title}'
@@ -120,6 +190,60 @@ class Vote(models.Model):
     
     class Meta:
         unique_together = ['project', 'user']
+        indexes = [
+            models.Index(fields=['project', 'vote_type'], name='vote_project_type_idx'),
+        ]
     
     def __str__(self):
         return f'{self.user.username} {self.vote_type}d {self.project.title}'
+
+class ProjectCard(models.Model):
+    """
+    Modelo de lectura desnormalizado con todo lo que muestra una tarjeta.
+
+    Se reconstruye en la misma transacción que el cambio que lo afecta (ver
+    ``portfolio_projects.cards``), así las grillas se sirven desde una sola
+    tabla sin consultar categorías, tecnologías, votos ni imágenes.
+    """
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    slug = models.SlugField(max_length=200)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    created_at = models.DateTimeField()
+    is_featured = models.BooleanField(default=False)
+    # Nombre en el storage (portada o imagen marcada como portada); la URL se
+    # calcula al renderizar para seguir cambios de MEDIA_URL
+    image = models.CharField(max_length=255, blank=True)
+    # [{"name": ..., "slug": ...}]
+    categories = models.JSONField(default=list)
+    # Nombres de las tres primeras tecnologías
+    technologies = models.JSONField(default=list)
+    technology_count = models.PositiveIntegerField(default=0)
+    likes = models.PositiveIntegerField(default=0)
+    dislikes = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='card_created_idx'),
+            models.Index(fields=['is_featured', '-created_at'], name='card_featured_created_idx'),
+        ]
+    
+    def __str__(self):
+        return self.title
+    
+    @property
+    def id(self):
+        return self.project_id
+    
+    @property
+    def image_url(self):
+        from django.core.files.storage import default_storage
+        return default_storage.url(self.image) if self.image else ''
+    
+    @property
+    def extra_technologies(self):
+        return max(self.technology_count - len(self.technologies), 0)
+    
+    def get_absolute_url(self):
+        return reverse('project_detail', kwargs={'slug': self.slug})
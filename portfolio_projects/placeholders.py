@@ -0,0 +1,48 @@
+"""
+Placeholders de baja calidad (LQIP) para las imágenes de la galería.
+
+Cada ``ProjectImage`` guarda una miniatura WebP de pocos píxeles como data
+URI (unos cientos de bytes). La página de detalle la muestra desenfocada en
+cada slide del carrusel y la imagen real se pide solo cuando el slide entra
+en pantalla.
+"""
+import base64
+import io
+
+from django.core.cache import cache
+
+from .models import ProjectImage
+
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+
+def make_placeholder(field_file, size=PLACEHOLDER_SIZE, quality=PLACEHOLDER_QUALITY):
+    """Devuelve la miniatura WebP de ``field_file`` como ``data:image/webp;base64,...``."""
+    from PIL import Image
+
+    with field_file.open('rb') as fh:
+        with Image.open(fh) as image:
+            # draft() permite a JPEG decodificar directamente a baja resolución
+            image.draft('RGB', (size * 4, size * 4))
+            thumbnail = image.convert('RGB')
+            thumbnail.thumbnail((size, size))
+
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, 'WEBP', quality=quality, method=6)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def update_placeholder(image_id, force=False):
+    """Calcula y guarda el placeholder de una imagen. Devuelve True si lo escribió."""
+    from .views import project_detail_cache_key
+
+    image = ProjectImage.objects.filter(pk=image_id).first()
+    if image is None or not image.image or (image.placeholder and not force):
+        return False
+
+    placeholder = make_placeholder(image.image)
+    # update() evita save(): no dispara de nuevo la señal que encola esta tarea
+    ProjectImage.objects.filter(pk=image.pk, image=image.image.name).update(placeholder=placeholder)
+    cache.delete(project_detail_cache_key(image.project_id))
+    return True
@@ -0,0 +1,97 @@
+"""
+Limitador de peticiones tipo token bucket respaldado por la caché de Django.
+
+Cada ámbito (``vote``, ``comment``...) define en ``settings.RATELIMITS`` una
+tasa por usuario y otra por IP con el formato ``"<peticiones>/<periodo>"``
+donde el periodo es ``s``, ``m``, ``h`` o ``d``. El estado de cada bucket es
+una tupla ``(tokens, timestamp)`` guardada en caché; la lectura y escritura no
+son atómicas, así que bajo mucha concurrencia el límite es aproximado.
+"""
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+
+from core.cache import shared_cache
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Convierte ``"30/m"`` en ``(capacidad, tokens_por_segundo)``."""
+    if not rate:
+        return None
+    count, _, period = rate.partition('/')
+    seconds = PERIODS[period.strip()[-1]] * int(period.strip()[:-1] or 1)
+    count = int(count)
+    return count, count / seconds
+
+
+def client_ip(request):
+    """IP del cliente; detrás del proxy se usa la última entrada de X-Forwarded-For."""
+    if getattr(settings, 'RATELIMIT_USE_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        hops = [hop.strip() for hop in forwarded.split(',') if hop.strip()]
+        if hops:
+            return hops[-1]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def consume(key, rate, now=None):
+    """
+    Intenta consumir un token del bucket ``key``.
+
+    Devuelve ``0`` si se permitió la petición o los segundos a esperar hasta
+    que haya un token disponible.
+    """
+    capacity, refill = rate
+    now = time.time() if now is None else now
+    tokens, stamp = shared_cache().get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - stamp) * refill)
+
+    if tokens >= 1:
+        wait = 0
+        tokens -= 1
+    else:
+        wait = math.ceil((1 - tokens) / refill)
+
+    # El bucket se vacía solo: basta con guardarlo el tiempo que tarda en llenarse
+    shared_cache().set(key, (tokens, now), math.ceil(capacity / refill) + 1)
+    return wait
+
+
+def too_many_requests(request, retry_after):
+    message = 'Demasiadas solicitudes. Intenta nuevamente en unos segundos.'
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest' or \
+            'application/json' in request.headers.get('accept', ''):
+        response = JsonResponse({'error': message, 'retry_after': retry_after}, status=429)
+    else:
+        response = HttpResponse(message, status=429, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def ratelimit(scope, methods=('POST',)):
+    """Decorador que aplica los límites de ``settings.RATELIMITS[scope]``."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            limits = getattr(settings, 'RATELIMITS', {}).get(scope, {})
+            if request.method in methods and getattr(settings, 'RATELIMIT_ENABLE', True):
+                buckets = []
+                if request.user.is_authenticated:
+                    buckets.append((f'rl:{scope}:user:{request.user.pk}', parse_rate(limits.get('user'))))
+                buckets.append((f'rl:{scope}:ip:{client_ip(request)}', parse_rate(limits.get('ip'))))
+
+                for key, rate in buckets:
+                    if rate is None:
+                        continue
+                    wait = consume(key, rate)
+                    if wait:
+                        return too_many_requests(request, wait)
+
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
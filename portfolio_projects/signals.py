@@ -0,0 +1,182 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from .cards import rebuild_cards, refresh_card_votes
+from .facets import invalidate_facets
+from .models import Project, Category, Technology, ProjectImage, ProjectFile, Comment, Vote
+
+WARM_CACHES_DEBOUNCE = 30
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Technology)
+@receiver(post_delete, sender=Technology)
+def invalidate_project_facets(sender, **kwargs):
+    invalidate_facets()
+    if not kwargs.get('raw'):
+        schedule_cache_warming()
+        schedule_feed_publishing()
+
+
+@receiver(m2m_changed, sender=Project.categories.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def invalidate_project_facets_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._detail_project_ids = list(instance.projects.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_facets()
+        schedule_cache_warming()
+        schedule_feed_publishing()
+        if not reverse:
+            invalidate_project_details([instance.pk])
+        elif action == 'post_clear':
+            invalidate_project_details(getattr(instance, '_detail_project_ids', []))
+        else:
+            invalidate_project_details(pk_set)
+
+
+def invalidate_project_details(project_ids):
+    """
+    Borra el detalle cacheado de los proyectos, ahora y otra vez al confirmar
+    la transacción: en el admin ``post_save`` llega antes de ``save_related``
+    y una petición intermedia podría volver a cachear las etiquetas viejas.
+    """
+    from .views import project_detail_cache_key
+    keys = [project_detail_cache_key(project_id) for project_id in project_ids]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_detail(sender, instance, **kwargs):
+    invalidate_project_details([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Technology)
+def invalidate_project_detail_for_tag(sender, instance, created=False, raw=False, **kwargs):
+    # El detalle muestra el nombre de cada categoría y tecnología
+    if not created and not raw:
+        invalidate_project_details(instance.projects.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Technology)
+def invalidate_project_detail_after_tag_delete(sender, instance, **kwargs):
+    invalidate_project_details(getattr(instance, '_card_project_ids', []))
+
+
+@receiver(post_save, sender=ProjectImage)
+@receiver(post_delete, sender=ProjectImage)
+@receiver(post_save, sender=ProjectFile)
+@receiver(post_delete, sender=ProjectFile)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Vote)
+@receiver(post_delete, sender=Vote)
+def invalidate_project_detail_related(sender, instance, **kwargs):
+    from .views import project_detail_cache_key
+    cache.delete(project_detail_cache_key(instance.project_id))
+
+
+@receiver(post_save, sender=ProjectImage)
+def schedule_image_placeholder(sender, instance, raw=False, **kwargs):
+    if raw or instance.placeholder or not instance.image:
+        return
+    image_id = instance.pk
+
+    def enqueue():
+        from .tasks import image_placeholder
+        image_placeholder.delay(image_id)
+
+    transaction.on_commit(enqueue)
+
+
+# --- ProjectCard: se reconstruye dentro de la transacción del cambio ---
+
+@receiver(post_save, sender=Project)
+def rebuild_project_card(sender, instance, raw=False, **kwargs):
+    if not raw:
+        rebuild_cards([instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.categories.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def rebuild_project_cards_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # Tras el clear ya no se sabe qué proyectos estaban relacionados
+        instance._card_project_ids = list(instance.projects.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        rebuild_cards(pk_set if reverse else [instance.pk])
+    elif action == 'post_clear':
+        rebuild_cards(getattr(instance, '_card_project_ids', []) if reverse else [instance.pk])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Technology)
+def rebuild_project_cards_for_tag(sender, instance, created=False, raw=False, **kwargs):
+    # Un tag nuevo aún no tiene proyectos; uno renombrado cambia sus tarjetas
+    if not created and not raw:
+        rebuild_cards(instance.projects.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Technology)
+def remember_tag_projects(sender, instance, **kwargs):
+    instance._card_project_ids = list(instance.projects.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Technology)
+def rebuild_project_cards_after_tag_delete(sender, instance, **kwargs):
+    rebuild_cards(getattr(instance, '_card_project_ids', []))
+
+
+def _deleting_project(origin):
+    # Al borrar un proyecto sus imágenes y votos se borran en cascada: no
+    # hay que recrear la tarjeta que también se está borrando
+    return isinstance(origin, Project) or (isinstance(origin, QuerySet) and origin.model is Project)
+
+
+@receiver(post_save, sender=ProjectImage)
+@receiver(post_delete, sender=ProjectImage)
+def rebuild_project_card_image(sender, instance, raw=False, origin=None, **kwargs):
+    if not raw and not _deleting_project(origin):
+        rebuild_cards([instance.project_id])
+
+
+@receiver(post_save, sender=Vote)
+@receiver(post_delete, sender=Vote)
+def refresh_project_card_votes(sender, instance, raw=False, origin=None, **kwargs):
+    if not raw and not _deleting_project(origin):
+        refresh_card_votes(instance.project_id)
+
+
+def schedule_cache_warming():
+    transaction.on_commit(_enqueue_cache_warming)
+
+
+def _enqueue_cache_warming():
+    from .tasks import warm_caches
+    # Un guardado en el admin dispara varias señales; basta con una tarea
+    if cache.add('tasks:warm_caches:pending', True, WARM_CACHES_DEBOUNCE):
+        warm_caches.delay()
+
+
+def schedule_feed_publishing():
+    transaction.on_commit(_enqueue_feed_publishing)
+
+
+def _enqueue_feed_publishing():
+    from .tasks import PUBLISH_FEEDS_PENDING_KEY, publish_feeds
+    # Se agrupan los cambios de la ventana: la tarea corre al cerrarse
+    if cache.add(PUBLISH_FEEDS_PENDING_KEY, True, WARM_CACHES_DEBOUNCE):
+        publish_feeds.enqueue(countdown=WARM_CACHES_DEBOUNCE)
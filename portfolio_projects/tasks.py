@@ -0,0 +1,45 @@
+from django.core.cache import cache
+
+from task_queue.queue import task
+
+from . import trending
+from .feeds import publish_all
+from .facets import ProjectFilters, facet_counts
+from .models import Category, Technology
+from .placeholders import update_placeholder
+from .votes import flush_pending_votes
+
+PUBLISH_FEEDS_PENDING_KEY = 'tasks:publish_feeds:pending'
+
+
+@task(name='portfolio_projects.flush_votes')
+def flush_votes():
+    flush_pending_votes()
+
+
+@task(name='portfolio_projects.decay_trending')
+def decay_trending():
+    trending.decay_all()
+
+
+@task(name='portfolio_projects.warm_caches', max_attempts=2, priority=5)
+def warm_caches():
+    """Precalcula las facetas del listado sin filtros y de cada categoría/tecnología."""
+    facet_counts(ProjectFilters())
+    for slug in Category.objects.values_list('slug', flat=True):
+        facet_counts(ProjectFilters(category=slug))
+    for slug in Technology.objects.values_list('slug', flat=True):
+        facet_counts(ProjectFilters(technology=slug))
+
+
+@task(name='portfolio_projects.image_placeholder', max_attempts=3)
+def image_placeholder(image_id):
+    update_placeholder(image_id)
+
+
+@task(name='portfolio_projects.publish_feeds', max_attempts=3)
+def publish_feeds():
+    """Regenera las secciones del sitemap y el feed que hayan cambiado."""
+    # Se libera antes de publicar para que un cambio durante la tarea encole otra
+    cache.delete(PUBLISH_FEEDS_PENDING_KEY)
+    publish_all()
@@ -1,3 +1,140 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from . import votes
+from .models import Category, Project, Technology, Vote
+from .views import accepts_gzip, get_project_detail_data
+
+# Caché en memoria para no depender de Redis ni del directorio .cache
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.TieredCache',
+        'OPTIONS': {'L1': 'local', 'L2': 'shared', 'L1_TIMEOUT': 5},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portfolio-projects-tests-shared',
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portfolio-projects-tests-local',
+    },
+}
+
+
+@override_settings(CACHES=TEST_CACHES, TASKS_EAGER=False, ANALYTICS_ENABLED=False)
+class CachedTestCase(TestCase):
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+
+
+class TagSlugTests(TestCase):
+    def test_names_with_the_same_slug_get_suffixes(self):
+        first = Technology.objects.create(name='C++')
+        second = Technology.objects.create(name='C#')
+        self.assertEqual((first.slug, second.slug), ('c', 'c-2'))
+
+    def test_name_without_slug_characters_uses_fallback(self):
+        self.assertEqual(Technology.objects.create(name='++').slug, 'tecnologia')
+        self.assertEqual(Technology.objects.create(name='#').slug, 'tecnologia-2')
+        self.assertEqual(Category.objects.create(name='¿?').slug, 'categoria')
+
+    def test_existing_slug_is_kept_on_save(self):
+        technology = Technology.objects.create(name='Python')
+        technology.name = 'Python 3'
+        technology.save()
+        self.assertEqual(technology.slug, 'python')
+
+
+class ProjectDetailCacheTests(CachedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(title='Ventas', slug='ventas', description='d', content='c')
+        self.category = Category.objects.create(name='BI', slug='bi')
+        self.technology = Technology.objects.create(name='Python')
+
+    def names(self, key):
+        return [tag.name for tag in get_project_detail_data(self.project)[key]]
+
+    def test_m2m_change_invalidates_detail(self):
+        self.assertEqual(self.names('categories'), [])
+        self.project.categories.add(self.category)
+        self.assertEqual(self.names('categories'), ['BI'])
+        self.category.projects.clear()
+        self.assertEqual(self.names('categories'), [])
+
+    def test_tag_rename_and_delete_invalidate_detail(self):
+        self.project.technologies.add(self.technology)
+        self.assertEqual(self.names('technologies'), ['Python'])
+        self.technology.name = 'Python 3'
+        self.technology.save()
+        self.assertEqual(self.names('technologies'), ['Python 3'])
+        self.technology.delete()
+        self.assertEqual(self.names('technologies'), [])
+
+
+@override_settings(VOTE_COALESCE_WINDOW=10)
+class VoteCoalescingTests(CachedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(title='Ventas', slug='ventas', description='d', content='c')
+        self.users = [User.objects.create_user(f'user{i}', password='pw') for i in range(3)]
+
+    def stored(self, user):
+        return Vote.objects.filter(project=self.project, user=user).values_list('vote_type', flat=True).first()
+
+    def test_without_atomic_cache_every_toggle_is_written(self):
+        # LocMemCache, como la caché en archivos, no es atómica entre procesos
+        user = self.users[0]
+        for vote_type, expected in [('like', 'like'), ('dislike', 'dislike'), ('dislike', None)]:
+            result = votes.toggle_vote(user, self.project, vote_type)
+            self.assertEqual(result[0], expected)
+            self.assertEqual(self.stored(user), expected)
+        self.assertEqual(votes.flush_pending_votes(), 0)
+
+    @mock.patch('portfolio_projects.votes.has_atomic_ops', return_value=True)
+    def test_toggles_inside_window_are_flushed_once(self, _):
+        for user in self.users:
+            votes.toggle_vote(user, self.project, 'like')
+            votes.toggle_vote(user, self.project, 'dislike')
+            self.assertEqual(self.stored(user), 'like')
+            self.assertEqual(votes.current_vote(user, self.project.pk), 'dislike')
+
+        self.assertEqual(votes.flush_pending_votes(), len(self.users))
+        for user in self.users:
+            self.assertEqual(self.stored(user), 'dislike')
+        self.assertEqual(votes.flush_pending_votes(), 0)
+
+    @mock.patch('portfolio_projects.votes.has_atomic_ops', return_value=True)
+    def test_flush_skips_pair_locked_by_a_toggle(self, _):
+        user = self.users[0]
+        votes.toggle_vote(user, self.project, 'like')
+        votes.toggle_vote(user, self.project, 'dislike')
+        votes._acquire_pair(self.project.pk, user.pk, wait=False)
+        self.assertEqual(votes.flush_pending_votes(), 0)
+        votes._release_pair(self.project.pk, user.pk)
+        self.assertEqual(votes.flush_pending_votes(), 1)
+        self.assertEqual(self.stored(user), 'dislike')
+
+
+class PublishedDocumentTests(CachedTestCase):
+    def test_accept_encoding_quality_values(self):
+        self.assertTrue(accepts_gzip('gzip, br'))
+        self.assertTrue(accepts_gzip('br;q=1.0, gzip;q=0.5'))
+        self.assertTrue(accepts_gzip('*'))
+        self.assertFalse(accepts_gzip(''))
+        self.assertFalse(accepts_gzip('gzip;q=0'))
+        self.assertFalse(accepts_gzip('gzip; q=0.0, *'))
+        self.assertFalse(accepts_gzip('br, *;q=0'))
+
+    def test_refused_gzip_gets_plain_body(self):
+        Project.objects.create(title='Ventas', slug='ventas', description='d', content='c')
+        response = self.client.get('/sitemap.xml', HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertIn(b'/projects/ventas/', response.content)
+        response = self.client.get('/sitemap.xml', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
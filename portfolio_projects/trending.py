@@ -0,0 +1,118 @@
+"""
+Puntaje de tendencia con decaimiento exponencial.
+
+Cada actividad suma puntos (vistas, likes menos dislikes, comentarios) que
+pierden la mitad de su peso cada ``TRENDING_HALF_LIFE_HOURS`` horas. El
+puntaje se guarda ya decaído en ``Project.trending_score`` junto con el
+instante al que corresponde (``trending_updated_at``); la compactación de
+analítica lo actualiza de forma incremental y ``manage.py decay_trending``
+lleva todos los puntajes al instante actual para que el top N sea comparable.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Project
+
+DEFAULT_WEIGHTS = {'view': 1.0, 'vote': 3.0, 'comment': 5.0}
+
+
+def weights():
+    return {**DEFAULT_WEIGHTS, **getattr(settings, 'TRENDING_WEIGHTS', {})}
+
+
+def half_life_seconds():
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 48) * 3600
+
+
+def decay(elapsed_seconds):
+    return 0.5 ** (max(elapsed_seconds, 0) / half_life_seconds())
+
+
+def event_points(event):
+    """Puntos de un evento del log de analítica, sin decaimiento."""
+    w = weights()
+    if event['type'] == 'view':
+        return w['view']
+    if event['type'] == 'vote':
+        return w['vote'] * (event.get('likes', 0) - event.get('dislikes', 0))
+    if event['type'] == 'comment':
+        return w['comment']
+    return 0.0
+
+
+def decayed_points(event, now):
+    """Puntos del evento llevados al instante ``now`` (timestamp)."""
+    return event_points(event) * decay(now - event['ts'])
+
+
+@transaction.atomic
+def add_points(points_by_project, now=None):
+    """Suma puntos (ya decaídos a ``now``) a los puntajes almacenados."""
+    now = now or timezone.now()
+    projects = Project.objects.select_for_update().filter(pk__in=list(points_by_project))
+    for project in projects:
+        score = project.trending_score
+        if project.trending_updated_at:
+            score *= decay((now - project.trending_updated_at).total_seconds())
+        project.trending_score = score + points_by_project[project.pk]
+        project.trending_updated_at = now
+    Project.objects.bulk_update(projects, ['trending_score', 'trending_updated_at'])
+    return len(projects)
+
+
+@transaction.atomic
+def decay_all(now=None):
+    """Lleva todos los puntajes al instante actual."""
+    now = now or timezone.now()
+    projects = list(
+        Project.objects.select_for_update()
+        .filter(trending_score__gt=0)
+        .only('pk', 'trending_score', 'trending_updated_at')
+    )
+    for project in projects:
+        if project.trending_updated_at:
+            project.trending_score *= decay((now - project.trending_updated_at).total_seconds())
+        # Los puntajes residuales se llevan a cero para sacarlos del top N
+        if project.trending_score < 0.01:
+            project.trending_score = 0.0
+        project.trending_updated_at = now
+    Project.objects.bulk_update(projects, ['trending_score', 'trending_updated_at'])
+    return len(projects)
+
+
+@transaction.atomic
+def rebuild(days=30, now=None):
+    """Recalcula todos los puntajes desde los agregados diarios de analítica."""
+    from analytics.models import ProjectDailyStat
+
+    now = now or timezone.now()
+    w = weights()
+    since = timezone.localdate(now) - timedelta(days=days)
+    scores = {}
+    rows = (
+        ProjectDailyStat.objects.filter(date__gte=since)
+        .values('project_id', 'date')
+        .annotate(v=Sum('views'), l=Sum('likes'), d=Sum('dislikes'), c=Sum('comments'))
+    )
+    for row in rows:
+        # Se asume la actividad del día concentrada al mediodía
+        moment = timezone.make_aware(datetime.combine(row['date'], time(12)))
+        points = row['v'] * w['view'] + (row['l'] - row['d']) * w['vote'] + row['c'] * w['comment']
+        scores[row['project_id']] = scores.get(row['project_id'], 0.0) + \
+            points * decay((now - moment).total_seconds())
+
+    projects = list(Project.objects.only('pk', 'trending_score', 'trending_updated_at'))
+    for project in projects:
+        project.trending_score = max(scores.get(project.pk, 0.0), 0.0)
+        project.trending_updated_at = now
+    Project.objects.bulk_update(projects, ['trending_score', 'trending_updated_at'], batch_size=500)
+    return len(projects)
+
+
+def trending_projects(limit=6):
+    """Top N por puntaje: una consulta que recorre el índice de trending_score."""
+    return Project.objects.filter(trending_score__gt=0).order_by('-trending_score')[:limit]
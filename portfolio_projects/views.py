@@ -1,15 +1,38 @@
+import gzip
+import re
+
 from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseNotModified, JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.cache import parse_etags
+from django.utils.http import http_date
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q
+from django.template.loader import render_to_string
 from django.core.paginator import Paginator
-from .models import Project, Category, Comment, Vote, Technology, ProjectImage
+from django.core.cache import cache
+from django.conf import settings
+from core.cache import get_or_compute
+from core.middleware import add_preload
+from core.public_shell import is_public_shell, public_shell
+from .models import Project, ProjectCard, Category, Comment, Vote, Technology, ProjectImage
 from .forms import ProjectForm, CommentForm, ProjectImageForm
+from analytics.events import record_event, referrer_host
+from .facets import ProjectFilters, facet_counts
+from .exports import EXPORTS, EXPORT_FORMATS, export_lines, parse_since
+from .feeds import get_document
+from .ratelimit import ratelimit
+from .votes import annotate_user_votes, current_vote, toggle_vote
 
+@method_decorator(public_shell, name='dispatch')
 class ProjectListView(ListView):
     model = Project
     template_name = 'portfolio_projects/project_list.html'
@@ -17,37 +40,63 @@ class ProjectListView(ListView):
     paginate_by = 9
     
     def get_queryset(self):
-        queryset = Project.objects.all()
-        
-        # Filtro por categoría
-        category_slug = self.request.GET.get('category')
-        if category_slug:
-            queryset = queryset.filter(categories__slug=category_slug)
-        
-        # Filtro por tecnología
-        technology = self.request.GET.get('technology')
-        if technology:
-            queryset = queryset.filter(technologies__name__icontains=technology)
-        
-        # Búsqueda por palabra clave
-        search_query = self.request.GET.get('search')
-        if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(content__icontains=search_query) |
-                Q(technologies__name__icontains=search_query)
-            ).distinct()
-        
-        return queryset
+        self.filters = ProjectFilters.from_request(self.request)
+        # Las tarjetas salen de ProjectCard; los filtros solo aportan los ids
+        if any(self.filters.as_dict().values()):
+            matching = self.filters.apply(Project.objects.all()).values('pk')
+            return ProjectCard.objects.filter(project__in=matching)
+        return ProjectCard.objects.all()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
-        context['technologies'] = Technology.objects.all()
-        context['featured_projects'] = Project.objects.filter(is_featured=True)[:3]
+        facets = facet_counts(self.filters)
+        context['categories'] = facets['categories']
+        context['technologies'] = facets['technologies']
+        context['filters'] = self.filters
+        context['featured_projects'] = ProjectCard.objects.filter(is_featured=True)[:3]
+        # Estado de voto del usuario para toda la página en una sola consulta
+        # (en el shell público llega con core.views.user_fragments)
+        if not is_public_shell(self.request):
+            context['user_votes'] = annotate_user_votes(self.request.user, context['projects'])
         return context
 
+def project_detail_cache_key(project_id):
+    return f'project_detail:{project_id}'
+
+
+def get_project_detail_data(project):
+    """
+    Contenido del detalle que no depende del usuario, cacheado con
+    protección contra estampidas (ver core.cache.get_or_compute).
+    """
+    def compute():
+        categories = list(project.categories.all())
+        related = []
+        if categories:
+            related = list(
+                Project.objects.filter(categories=categories[0]).exclude(pk=project.pk)[:3]
+            )
+        return {
+            'categories': categories,
+            'technologies': list(project.technologies.all()),
+            'images': list(project.images.all()),
+            'files': list(project.files.all()),
+            'comments': list(project.comments.filter(is_approved=True).select_related('user')),
+            'vote_counts': project.get_vote_counts(),
+            'related_projects': related,
+        }
+    
+    return get_or_compute(
+        cache,
+        project_detail_cache_key(project.pk),
+        compute,
+        timeout=settings.PROJECT_DETAIL_CACHE_TIMEOUT,
+    )
+
+# Imágenes por página del endpoint de galería (project_gallery)
+GALLERY_PAGE_SIZE = 12
+
+@method_decorator(public_shell, name='dispatch')
 class ProjectDetailView(DetailView):
     model = Project
     template_name = 'portfolio_projects/project_detail.html'
@@ -55,20 +104,26 @@ class ProjectDetailView(DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        project = self.get_object()
+        project = self.object
         
-        # Incrementar vistas
-        project.views += 1
-        project.save()
+        # Registrar la vista en el log de analítica; el contador se
+        # actualiza al compactar (manage.py compact_analytics). El shell
+        # público puede servirse desde el CDN: ahí la registra user_fragments
+        if not is_public_shell(self.request):
+            record_event('view', project.pk, referrer=referrer_host(self.request))
         
-        # Obtener comentarios aprobados
-        context['comments'] = project.comments.filter(is_approved=True)
+        context.update(get_project_detail_data(project))
         context['comment_form'] = CommentForm()
+        context['gallery_page_size'] = GALLERY_PAGE_SIZE
         
-        # Verificar si el usuario actual ha votado
-        if self.request.user.is_authenticated:
-            user_vote = project.votes.filter(user=self.request.user).first()
-            context['user_vote'] = user_vote.vote_type if user_vote else None
+        # La imagen principal del carrusel se anuncia antes de enviar el HTML
+        hero = project.featured_image or (context['images'][0].image if context['images'] else None)
+        if hero:
+            add_preload(self.request, hero.url, 'image', fetchpriority='high')
+        
+        # Verificar si el usuario actual ha votado (incluye votos pendientes)
+        if not is_public_shell(self.request) and self.request.user.is_authenticated:
+            context['user_vote'] = current_vote(self.request.user, project.pk)
         
         return context
 
@@ -110,8 +165,15 @@ class ProjectDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 @login_required
+@ratelimit('comment')
 def add_comment(request, project_id):
-    project = get_object_or_404(Project, id=project_id)
+    """
+    Con ``X-Requested-With`` (formulario enviado por fetch) responde JSON con
+    el fragmento HTML del comentario nuevo, sin pasar por el detalle; sin
+    JavaScript se mantiene la redirección al detalle.
+    """
+    project = get_object_or_404(Project.objects.only('pk', 'slug'), id=project_id)
+    ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
     
     if request.method == 'POST':
         form = CommentForm(request.POST)
@@ -120,46 +182,71 @@ def add_comment(request, project_id):
             comment.project = project
             comment.user = request.user
             comment.save()
+            record_event('comment', project.pk)
+            if ajax:
+                html = ''
+                if comment.is_approved:
+                    html = render_to_string('portfolio_projects/_comment.html', {'comment': comment}, request)
+                return JsonResponse({'id': comment.pk, 'approved': comment.is_approved, 'html': html}, status=201)
             messages.success(request, 'Comentario agregado exitosamente.')
+        elif ajax:
+            return JsonResponse({'errors': form.errors}, status=400)
         else:
             messages.error(request, 'Error al agregar el comentario.')
+    elif ajax:
+        return JsonResponse({'error': 'Invalid request'}, status=405)
     
     return redirect('project_detail', slug=project.slug)
 
 @login_required
+@ratelimit('vote')
 def vote_project(request, project_id):
     if request.method == 'POST':
         project = get_object_or_404(Project, id=project_id)
         vote_type = request.POST.get('vote_type')
         
         if vote_type in ['like', 'dislike']:
-            vote, created = Vote.objects.get_or_create(
-                project=project,
-                user=request.user,
-                defaults={'vote_type': vote_type}
-            )
-            
-            if not created:
-                if vote.vote_type == vote_type:
-                    # Si ya votó igual, eliminar el voto
-                    vote.delete()
-                    vote_type = None
-                else:
-                    # Cambiar el tipo de voto
-                    vote.vote_type = vote_type
-                    vote.save()
+            # Los cambios repetidos dentro de la ventana se agrupan en una escritura
+            user_vote, likes, dislikes = toggle_vote(request.user, project, vote_type)
             
             return JsonResponse({
-                'likes': project.get_likes_count(),
-                'dislikes': project.get_dislikes_count(),
-                'user_vote': vote_type
+                'likes': likes,
+                'dislikes': dislikes,
+                'user_vote': user_vote
             })
     
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
+def project_gallery(request, slug):
+    """Página JSON de imágenes de la galería, que el carrusel pide a medida que avanza."""
+    project = get_object_or_404(Project.objects.only('pk'), slug=slug)
+    paginator = Paginator(project.images.all(), GALLERY_PAGE_SIZE)
+    page = paginator.get_page(request.GET.get('page'))
+    offset = page.start_index() - 1 if paginator.count else 0
+    
+    return JsonResponse({
+        'page': page.number,
+        'num_pages': paginator.num_pages,
+        'count': paginator.count,
+        'next': page.next_page_number() if page.has_next() else None,
+        'images': [
+            {
+                'index': offset + position,
+                'id': image.pk,
+                'url': image.image.url,
+                'width': image.width,
+                'height': image.height,
+                'title': image.title,
+                'description': image.description,
+                'placeholder': image.placeholder,
+            }
+            for position, image in enumerate(page.object_list)
+        ],
+    })
+
 def category_projects(request, slug):
     category = get_object_or_404(Category, slug=slug)
-    projects = Project.objects.filter(categories=category)
+    projects = ProjectCard.objects.filter(project__categories=category)
     
     paginator = Paginator(projects, 9)
     page_number = request.GET.get('page')
@@ -242,3 +329,101 @@ def project_image_delete(request, slug, image_id):
         'image': image,
     }
     return render(request, 'portfolio_projects/project_image_confirm_delete.html', context)
+
+SECTION_RE = re.compile(r'^(pages|projects-\d+)$')
+
+
+def accepts_gzip(accept_encoding):
+    """
+    Si ``Accept-Encoding`` admite gzip, respetando los valores q: ``gzip;q=0``
+    lo rechaza y ``*`` cubre gzip cuando no aparece de forma explícita.
+    """
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    if 'gzip' in qualities:
+        return qualities['gzip'] > 0
+    return qualities.get('*', 0) > 0
+
+
+def etag_matches(etag, if_none_match):
+    """Comparación débil de ``If-None-Match`` (RFC 9110 §13.1.2)."""
+    opaque = etag.removeprefix('W/')
+    return any(
+        candidate == '*' or candidate.removeprefix('W/') == opaque
+        for candidate in parse_etags(if_none_match)
+    )
+
+
+def published_document(request, name):
+    """Sirve un documento precalculado de ``feeds`` con ETag y gzip."""
+    base_url = settings.SITE_URL or f'{request.scheme}://{request.get_host()}'
+    document = get_document(name, base_url)
+    if document is None:
+        raise Http404
+    
+    headers = {
+        'ETag': document['etag'],
+        'Last-Modified': http_date(document['last_modified'].timestamp()),
+        'Cache-Control': 'public, max-age=3600',
+        'Vary': 'Accept-Encoding',
+    }
+    if etag_matches(document['etag'], request.headers.get('If-None-Match', '')):
+        return HttpResponseNotModified(headers=headers)
+    
+    if accepts_gzip(request.headers.get('Accept-Encoding', '')):
+        response = HttpResponse(document['body'], content_type=document['content_type'], headers=headers)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        body = gzip.decompress(document['body'])
+        response = HttpResponse(body, content_type=document['content_type'], headers=headers)
+    return response
+
+def sitemap(request):
+    return published_document(request, 'sitemap')
+
+def sitemap_section(request, section):
+    if not SECTION_RE.match(section):
+        raise Http404
+    return published_document(request, section)
+
+def project_feed(request):
+    return published_document(request, 'feed')
+
+
+@staff_member_required
+def export_data(request, dataset):
+    """
+    Descarga en streaming de ``projects``, ``votes`` o ``comments``.
+    ``?format=csv|ndjson`` y ``?since=<fecha ISO>`` para exportaciones incrementales.
+    """
+    if dataset not in EXPORTS:
+        raise Http404
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('Formato no soportado')
+    try:
+        since = parse_since(request.GET.get('since'))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    
+    filename = f"{dataset}-{timezone.localdate():%Y%m%d}.{export_format}"
+    response = StreamingHttpResponse(
+        export_lines(dataset, export_format, since),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'private, no-store'
+    return response
@@ -0,0 +1,263 @@
+"""
+Votos con escritura agrupada (coalescing).
+
+El primer cambio de voto de un usuario sobre un proyecto se escribe de
+inmediato y abre una ventana de ``settings.VOTE_COALESCE_WINDOW`` segundos.
+Los cambios siguientes dentro de la ventana solo actualizan el estado
+pendiente en caché; el estado final se persiste con una sola escritura en
+el siguiente voto fuera de la ventana o al ejecutar ``flush_pending_votes``.
+
+La agrupación depende de que ``add`` e ``incr`` de la caché compartida sean
+atómicos entre procesos, así que solo se activa con Redis o memcached
+(``core.cache.has_atomic_ops``): cada par proyecto/usuario pendiente se
+anota en un índice por minuto con ``add`` e ``incr`` (sin leer y reescribir
+un conjunto), y ``toggle_vote`` y ``flush_pending_votes`` se excluyen por par
+con un candado ``add``, de modo que un voto no puede llegar entre la lectura
+y el borrado del pendiente. Con la caché en archivos dos votos podrían
+ocupar la misma entrada del índice y uno se perdería, por eso ahí cada voto
+se escribe directamente en la base de datos.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from analytics.events import record_event
+from core.cache import has_atomic_ops, shared_cache
+from .models import Vote
+
+PENDING_TIMEOUT = 60 * 60 * 24
+PENDING_BUCKET_SECONDS = 60
+# Minutos que se vuelven a revisar por si una anotación llegó tarde
+BUCKET_MARGIN = 2
+FLUSH_LOCK_KEY = 'vote:flush:lock'
+FLUSH_LOCK_TIMEOUT = 5 * 60
+FLUSH_CURSOR_KEY = 'vote:flush:cursor'
+PAIR_LOCK_TIMEOUT = 5
+PAIR_LOCK_POLL_INTERVAL = 0.01
+
+
+def _pending_key(project_id, user_id):
+    return f'vote:pending:{project_id}:{user_id}'
+
+
+def _window_key(project_id, user_id):
+    return f'vote:window:{project_id}:{user_id}'
+
+
+def _pair_lock_key(project_id, user_id):
+    return f'vote:lock:{project_id}:{user_id}'
+
+
+def _bucket_count_key(bucket):
+    return f'vote:pending:bucket:{bucket}'
+
+
+def _bucket_slot_key(bucket, slot):
+    return f'vote:pending:bucket:{bucket}:{slot}'
+
+
+def _current_bucket():
+    return int(time.time() // PENDING_BUCKET_SECONDS)
+
+
+def _add_to_index(project_id, user_id):
+    """Anota el par en el índice del minuto actual, una vez por minuto."""
+    cache = shared_cache()
+    bucket = _current_bucket()
+    if not cache.add(f'vote:pending:listed:{bucket}:{project_id}:{user_id}', True, PENDING_TIMEOUT):
+        return
+    cache.add(_bucket_count_key(bucket), 0, PENDING_TIMEOUT)
+    slot = cache.incr(_bucket_count_key(bucket))
+    cache.set(_bucket_slot_key(bucket, slot), (project_id, user_id), PENDING_TIMEOUT)
+
+
+def _acquire_pair(project_id, user_id, wait):
+    """Candado del par proyecto/usuario; ``wait`` espera a que se libere."""
+    cache = shared_cache()
+    key = _pair_lock_key(project_id, user_id)
+    deadline = time.monotonic() + PAIR_LOCK_TIMEOUT
+    while not cache.add(key, True, PAIR_LOCK_TIMEOUT):
+        if not wait or time.monotonic() >= deadline:
+            return False
+        time.sleep(PAIR_LOCK_POLL_INTERVAL)
+    return True
+
+
+def _release_pair(project_id, user_id):
+    shared_cache().delete(_pair_lock_key(project_id, user_id))
+
+
+def _persisted_vote(project_id, user_id):
+    return (
+        Vote.objects.filter(project_id=project_id, user_id=user_id)
+        .values_list('vote_type', flat=True)
+        .first()
+    )
+
+
+def _write_vote(project_id, user_id, vote_type):
+    with transaction.atomic():
+        if vote_type is None:
+            Vote.objects.filter(project_id=project_id, user_id=user_id).delete()
+        else:
+            Vote.objects.update_or_create(
+                project_id=project_id,
+                user_id=user_id,
+                defaults={'vote_type': vote_type},
+            )
+
+
+def _delta(old, new):
+    """Variación de (likes, dislikes) al pasar del voto ``old`` a ``new``."""
+    likes = (new == 'like') - (old == 'like')
+    dislikes = (new == 'dislike') - (old == 'dislike')
+    return likes, dislikes
+
+
+def current_vote(user, project_id):
+    """Voto vigente del usuario, incluyendo cambios aún no persistidos."""
+    if not user.is_authenticated:
+        return None
+    pending = shared_cache().get(_pending_key(project_id, user.pk))
+    if pending is not None:
+        return pending['state']
+    return _persisted_vote(project_id, user.pk)
+
+
+def user_votes(user, project_ids):
+    """
+    ``{project_id: vote_type}`` del usuario para varios proyectos a la vez:
+    una consulta ``IN`` y una lectura ``get_many`` de los votos pendientes.
+    """
+    project_ids = list(project_ids)
+    if not user.is_authenticated or not project_ids:
+        return {}
+    votes = dict(
+        Vote.objects.filter(user_id=user.pk, project_id__in=project_ids)
+        .values_list('project_id', 'vote_type')
+    )
+    pending = shared_cache().get_many([_pending_key(project_id, user.pk) for project_id in project_ids])
+    for project_id in project_ids:
+        state = pending.get(_pending_key(project_id, user.pk))
+        if state is None:
+            continue
+        if state['state'] is None:
+            votes.pop(project_id, None)
+        else:
+            votes[project_id] = state['state']
+    return votes
+
+
+def annotate_user_votes(user, projects):
+    """
+    Agrega ``user_vote`` a cada proyecto (o ``ProjectCard``) de ``projects``
+    y devuelve el mapa de :func:`user_votes`. Si ``projects`` es un queryset
+    se evalúa aquí y la plantilla reutiliza esas mismas instancias.
+    """
+    votes = user_votes(user, [project.pk for project in projects])
+    for project in projects:
+        project.user_vote = votes.get(project.pk)
+    return votes
+
+
+def coalesce_window():
+    """Segundos de la ventana de agrupación; 0 si la caché no la soporta."""
+    if not has_atomic_ops('shared'):
+        return 0
+    return getattr(settings, 'VOTE_COALESCE_WINDOW', 0)
+
+
+def toggle_vote(user, project, vote_type):
+    """
+    Aplica un voto con semántica de alternancia y devuelve
+    ``(voto_resultante, likes, dislikes)``.
+    """
+    window = coalesce_window()
+    if window <= 0:
+        return _toggle_vote(user, project, vote_type, window)
+    # Si el candado no se libera (un worker caído lo retiene) expira solo;
+    # pasado ese plazo se sigue sin él
+    locked = _acquire_pair(project.pk, user.pk, wait=True)
+    try:
+        return _toggle_vote(user, project, vote_type, window)
+    finally:
+        if locked:
+            _release_pair(project.pk, user.pk)
+
+
+def _toggle_vote(user, project, vote_type, window):
+    pending_key = _pending_key(project.pk, user.pk)
+    pending = shared_cache().get(pending_key)
+    if pending is not None:
+        persisted, current = pending['persisted'], pending['state']
+    else:
+        persisted = current = _persisted_vote(project.pk, user.pk)
+
+    new_state = None if current == vote_type else vote_type
+    likes_delta, dislikes_delta = _delta(current, new_state)
+    record_event('vote', project.pk, likes=likes_delta, dislikes=dislikes_delta)
+
+    if window <= 0 or shared_cache().add(_window_key(project.pk, user.pk), True, window):
+        if new_state != persisted:
+            _write_vote(project.pk, user.pk, new_state)
+        shared_cache().delete(pending_key)
+        counts = project.get_vote_counts()
+        return new_state, counts['likes'], counts['dislikes']
+
+    shared_cache().set(pending_key, {'persisted': persisted, 'state': new_state}, PENDING_TIMEOUT)
+    _add_to_index(project.pk, user.pk)
+
+    counts = project.get_vote_counts()
+    likes, dislikes = _delta(persisted, new_state)
+    return new_state, counts['likes'] + likes, counts['dislikes'] + dislikes
+
+
+def flush_pending_votes():
+    """
+    Persiste todos los votos pendientes. Devuelve cuántos se escribieron.
+
+    Recorre los minutos del índice desde el último revisado por completo; un
+    par cuyo candado está ocupado se deja para la siguiente pasada.
+    """
+    cache = shared_cache()
+    if not cache.add(FLUSH_LOCK_KEY, True, FLUSH_LOCK_TIMEOUT):
+        return 0
+    try:
+        current = _current_bucket()
+        cursor = cache.get(FLUSH_CURSOR_KEY)
+        first = current - PENDING_TIMEOUT // PENDING_BUCKET_SECONDS
+        if cursor is not None:
+            first = max(first, cursor + 1)
+        buckets = range(first, current + 1)
+        counts = cache.get_many([_bucket_count_key(bucket) for bucket in buckets])
+        slots = [
+            _bucket_slot_key(bucket, slot)
+            for bucket in buckets
+            for slot in range(1, counts.get(_bucket_count_key(bucket), 0) + 1)
+        ]
+        pairs = set(cache.get_many(slots).values())
+
+        written = 0
+        complete = True
+        for project_id, user_id in pairs:
+            if not _acquire_pair(project_id, user_id, wait=False):
+                complete = False
+                continue
+            try:
+                pending_key = _pending_key(project_id, user_id)
+                pending = cache.get(pending_key)
+                if pending is None:
+                    continue
+                if pending['state'] != pending['persisted']:
+                    _write_vote(project_id, user_id, pending['state'])
+                    written += 1
+                cache.delete(pending_key)
+            finally:
+                _release_pair(project_id, user_id)
+
+        if complete:
+            cache.set(FLUSH_CURSOR_KEY, current - BUCKET_MARGIN, PENDING_TIMEOUT)
+        return written
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
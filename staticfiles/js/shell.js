@@ -0,0 +1,93 @@
+// Hidratación del shell público (ver core/public_shell.py)
+//
+// La página llega igual para todos los visitantes; aquí se piden a
+// /fragments/ las partes propias del usuario: barra de navegación,
+// mensajes, token CSRF y sus votos en los proyectos de la página.
+
+(function() {
+    const fragmentsUrl = document.body.dataset.fragmentsUrl;
+    if (!fragmentsUrl) {
+        return;
+    }
+
+    const params = new URLSearchParams();
+    const projectIds = new Set(
+        Array.from(document.querySelectorAll('[data-project-id]'), element => element.dataset.projectId)
+    );
+    if (projectIds.size) {
+        params.set('projects', Array.from(projectIds).join(','));
+    }
+    const viewed = document.querySelector('[data-view-project]');
+    if (viewed) {
+        params.set('view', viewed.dataset.viewProject);
+        params.set('referrer', document.referrer);
+    }
+
+    fetch(`${fragmentsUrl}?${params}`, {
+        credentials: 'same-origin',
+        headers: {'X-Requested-With': 'XMLHttpRequest'}
+    })
+    .then(response => response.json())
+    .then(hydrate)
+    .catch(error => {
+        console.error('Error:', error);
+    });
+
+    function hydrate(data) {
+        // Barra de navegación según el usuario
+        const nav = document.getElementById('main-nav');
+        if (nav) {
+            nav.querySelectorAll('[data-user-nav]').forEach(item => item.remove());
+            nav.insertAdjacentHTML('beforeend', data.nav);
+        }
+
+        // Mensajes pendientes (se consumen al pedirlos)
+        const messages = document.getElementById('user-messages');
+        if (messages && data.messages.trim()) {
+            messages.innerHTML = data.messages;
+            messages.hidden = false;
+        }
+
+        // Bloques que dependen del usuario
+        const roles = {
+            anonymous: !data.authenticated,
+            authenticated: data.authenticated,
+            superuser: data.superuser
+        };
+        document.querySelectorAll('[data-requires]').forEach(element => {
+            if (roles[element.dataset.requires]) {
+                element.hidden = false;
+            } else {
+                element.remove();
+            }
+        });
+
+        // Token CSRF para los formularios y los votos por fetch
+        if (data.csrf_token) {
+            document.querySelectorAll('form[method="post"]').forEach(form => {
+                if (!form.querySelector('[name=csrfmiddlewaretoken]')) {
+                    form.insertAdjacentHTML('afterbegin', '<input type="hidden" name="csrfmiddlewaretoken">');
+                }
+            });
+            if (!document.querySelector('[name=csrfmiddlewaretoken]')) {
+                document.body.insertAdjacentHTML('beforeend', '<input type="hidden" name="csrfmiddlewaretoken">');
+            }
+            document.querySelectorAll('[name=csrfmiddlewaretoken]').forEach(input => {
+                input.value = data.csrf_token;
+            });
+        }
+
+        // Votos del usuario en las tarjetas
+        Object.entries(data.votes).forEach(([projectId, voteType]) => {
+            const projectCard = document.querySelector(`[data-project-id="${projectId}"]`);
+            if (projectCard) {
+                const likeBtn = projectCard.querySelector('.btn-outline-primary');
+                const dislikeBtn = projectCard.querySelector('.btn-outline-secondary');
+                likeBtn.classList.toggle('active', voteType === 'like');
+                dislikeBtn.classList.toggle('active', voteType === 'dislike');
+                likeBtn.setAttribute('aria-pressed', voteType === 'like');
+                dislikeBtn.setAttribute('aria-pressed', voteType === 'dislike');
+            }
+        });
+    }
+})();
@@ -0,0 +1,22 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'priority', 'attempts', 'max_attempts', 'run_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    date_hierarchy = 'created_at'
+    readonly_fields = ['locked_by', 'locked_at', 'created_at', 'finished_at', 'last_error']
+    actions = ['retry_now']
+    
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=Task.STATUS_RUNNING).update(
+            status=Task.STATUS_QUEUED,
+            run_at=timezone.now(),
+            attempts=0,
+        )
+        self.message_user(request, f'{updated} tarea(s) reencoladas.')
+    retry_now.short_description = 'Reintentar ahora'
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TaskQueueConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'task_queue'
+    verbose_name = 'Cola de tareas'
+
+    def ready(self):
+        # Registra las tareas declaradas en el módulo tasks.py de cada app
+        autodiscover_modules('tasks')
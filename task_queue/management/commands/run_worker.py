@@ -0,0 +1,72 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from task_queue.queue import claim, enqueue, execute, registry, requeue_stale, worker_id
+
+STALE_CHECK_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta el worker de la cola de tareas en segundo plano'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sleep', type=float, default=1.0, help='Segundos de espera cuando la cola está vacía')
+        parser.add_argument('--burst', action='store_true', help='Termina cuando no quedan tareas pendientes')
+        parser.add_argument('--max-tasks', type=int, default=0, help='Termina tras ejecutar N tareas (0 = sin límite)')
+        parser.add_argument('--no-periodic', action='store_true', help='No encola las tareas periódicas')
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(f'Worker {worker_id()} iniciado ({len(registry)} tareas registradas).')
+        executed = 0
+        last_stale_check = 0
+
+        while not self.stopping:
+            close_old_connections()
+
+            if time.monotonic() - last_stale_check > STALE_CHECK_INTERVAL:
+                requeued, failed = requeue_stale()
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'{requeued} tarea(s) bloqueadas devueltas a la cola.'))
+                if failed:
+                    self.stdout.write(self.style.ERROR(f'{failed} tarea(s) bloqueadas marcadas como fallidas.'))
+                last_stale_check = time.monotonic()
+
+            if not options['no_periodic']:
+                self.schedule_periodic()
+
+            task_obj = claim()
+            if task_obj is None:
+                if options['burst']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            started = time.perf_counter()
+            ok = execute(task_obj)
+            elapsed = (time.perf_counter() - started) * 1000
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f'{task_obj.name} #{task_obj.pk} {"ok" if ok else "error"} ({elapsed:.0f} ms)'))
+
+            executed += 1
+            if options['max_tasks'] and executed >= options['max_tasks']:
+                break
+
+        self.stdout.write('Worker detenido.')
+
+    def schedule_periodic(self):
+        """Encola las tareas periódicas; cache.add evita duplicados entre workers."""
+        for name, interval in getattr(settings, 'PERIODIC_TASKS', {}).items():
+            if name in registry and cache.add(f'tasks:periodic:{name}', True, interval):
+                enqueue(name)
+
+    def _stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUSES = [
+        (STATUS_QUEUED, 'En cola'),
+        (STATUS_RUNNING, 'En ejecución'),
+        (STATUS_DONE, 'Completada'),
+        (STATUS_FAILED, 'Fallida'),
+    ]
+    
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=STATUS_QUEUED)
+    priority = models.SmallIntegerField(default=0, help_text="Menor número = mayor prioridad")
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    last_error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['priority', 'run_at']
+        indexes = [
+            models.Index(fields=['status', 'priority', 'run_at'], name='task_queue_claim_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
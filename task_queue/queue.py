@@ -0,0 +1,178 @@
+"""
+Cola de tareas en la base de datos del proyecto.
+
+Las funciones se registran con ``@task`` y se encolan con ``func.delay(...)``
+o ``enqueue('nombre', ...)``; ``manage.py run_worker`` las ejecuta. En
+PostgreSQL cada worker toma tareas con ``SELECT ... FOR UPDATE SKIP LOCKED``;
+en SQLite (sin SKIP LOCKED) se usa un UPDATE condicional sobre el estado
+como reclamo optimista. Los argumentos deben ser serializables en JSON.
+"""
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(func=None, *, name=None, max_attempts=5, priority=0):
+    """Registra una función como tarea y le agrega ``delay`` y ``enqueue``."""
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registry[task_name] = func
+
+        @wraps(func)
+        def delay(*args, **kwargs):
+            return enqueue(task_name, *args, max_attempts=max_attempts, priority=priority, **kwargs)
+
+        def enqueue_with(*args, countdown=0, run_at=None, **kwargs):
+            return enqueue(
+                task_name, *args,
+                countdown=countdown, run_at=run_at,
+                max_attempts=max_attempts, priority=priority, **kwargs
+            )
+
+        func.task_name = task_name
+        func.delay = delay
+        func.enqueue = enqueue_with
+        return func
+
+    return decorator(func) if func is not None else decorator
+
+
+def enqueue(name, *args, countdown=0, run_at=None, max_attempts=5, priority=0, **kwargs):
+    """Inserta una tarea en la cola, o la ejecuta en línea si TASKS_EAGER está activo."""
+    if getattr(settings, 'TASKS_EAGER', False):
+        registry[name](*args, **kwargs)
+        return None
+
+    run_at = run_at or timezone.now() + timedelta(seconds=countdown)
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs,
+        run_at=run_at,
+        max_attempts=max_attempts,
+        priority=priority,
+    )
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _due_tasks(now):
+    return Task.objects.filter(status=Task.STATUS_QUEUED, run_at__lte=now).order_by('priority', 'run_at')
+
+
+def claim(now=None):
+    """Reserva la siguiente tarea pendiente para este worker, o devuelve None."""
+    now = now or timezone.now()
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            task_obj = _due_tasks(now).select_for_update(skip_locked=True).first()
+            if task_obj is None:
+                return None
+            task_obj.status = Task.STATUS_RUNNING
+            task_obj.attempts += 1
+            task_obj.locked_by = worker_id()
+            task_obj.locked_at = now
+            task_obj.save(update_fields=['status', 'attempts', 'locked_by', 'locked_at'])
+            return task_obj
+
+    # SQLite: si otro worker tomó la tarea, el UPDATE no afecta filas y se reintenta
+    for candidate_id in _due_tasks(now).values_list('pk', flat=True)[:10]:
+        claimed = Task.objects.filter(pk=candidate_id, status=Task.STATUS_QUEUED).update(
+            status=Task.STATUS_RUNNING,
+            locked_by=worker_id(),
+            locked_at=now,
+        )
+        if claimed:
+            task_obj = Task.objects.get(pk=candidate_id)
+            task_obj.attempts += 1
+            task_obj.save(update_fields=['attempts'])
+            return task_obj
+    return None
+
+
+def backoff_seconds(attempts):
+    """Espera exponencial con jitter: base * 2^(intentos-1), con tope."""
+    base = getattr(settings, 'TASKS_RETRY_BASE_SECONDS', 10)
+    cap = getattr(settings, 'TASKS_RETRY_MAX_SECONDS', 3600)
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def execute(task_obj):
+    """Ejecuta una tarea reservada y registra el resultado o el reintento."""
+    func = registry.get(task_obj.name)
+    try:
+        if func is None:
+            raise LookupError(f'Tarea no registrada: {task_obj.name}')
+        func(*task_obj.args, **task_obj.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('La tarea %s (#%s) falló', task_obj.name, task_obj.pk)
+        task_obj.last_error = error
+        task_obj.locked_by = ''
+        task_obj.locked_at = None
+        if task_obj.attempts < task_obj.max_attempts:
+            task_obj.status = Task.STATUS_QUEUED
+            task_obj.run_at = timezone.now() + timedelta(seconds=backoff_seconds(task_obj.attempts))
+        else:
+            task_obj.status = Task.STATUS_FAILED
+            task_obj.finished_at = timezone.now()
+        task_obj.save(update_fields=['last_error', 'locked_by', 'locked_at', 'status', 'run_at', 'finished_at'])
+        return False
+
+    task_obj.status = Task.STATUS_DONE
+    task_obj.finished_at = timezone.now()
+    task_obj.save(update_fields=['status', 'finished_at'])
+    return True
+
+
+def requeue_stale(now=None):
+    """
+    Devuelve a la cola las tareas de workers que murieron a mitad de ejecución.
+
+    El reclamo ya contó ese intento, así que una tarea que tumba al worker
+    (memoria agotada, fallo en una extensión C) se marca fallida al agotar
+    ``max_attempts`` en lugar de volver a la cola para siempre. Devuelve
+    ``(reencoladas, fallidas)``.
+    """
+    now = now or timezone.now()
+    timeout = getattr(settings, 'TASKS_LOCK_TIMEOUT_SECONDS', 600)
+    stale = Task.objects.filter(
+        status=Task.STATUS_RUNNING,
+        locked_at__lt=now - timedelta(seconds=timeout),
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.STATUS_FAILED,
+        locked_by='',
+        locked_at=None,
+        finished_at=now,
+        last_error=f'El worker no terminó la tarea en {timeout} s (¿proceso caído?)',
+    )
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Task.STATUS_QUEUED, locked_by='', locked_at=None, run_at=now,
+    )
+    return requeued, failed
+
+
+def purge_finished(days=7):
+    limit = timezone.now() - timedelta(days=days)
+    deleted, _ = Task.objects.filter(status=Task.STATUS_DONE, finished_at__lt=limit).delete()
+    return deleted
@@ -0,0 +1,6 @@
+from .queue import purge_finished, task
+
+
+@task(name='task_queue.purge_finished')
+def purge_finished_tasks(days=7):
+    purge_finished(days)